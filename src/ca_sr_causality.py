@@ -3,129 +3,124 @@
 # No dense NxN matrix; we apply S by neighbor shifts. No PDE/morphology libs.
 # Writes NPZ [T+1,H,W] and JSON with PASS/FAIL.
 
-import argparse, json, numpy as np, time, sys
-
-try:
-    import torch
-    TORCH = True
-except Exception:
-    TORCH = False
-
-def pretty(obj): return json.dumps(obj, indent=2, sort_keys=True)
-
-def l1_lightcone_mask(H, W, T):
-    yy, xx = np.mgrid[0:H, 0:W]
-    cx, cy = W//2, H//2
-    d1 = np.abs(xx-cx)+np.abs(yy-cy)
-    return np.stack([(d1<=t) for t in range(T+1)], axis=0)
-
-def causality_metrics(front, ideal):
-    assert front.shape == ideal.shape
-    T1, H, W = front.shape
-    arrived, viols = [], []
-    for t in range(T1):
-        inside  = ideal[t]
-        outside = ~inside
-        active  = front[t].astype(bool)
-        ni = int(inside.sum()); no = int(outside.sum())
-        arrived.append( float((active & inside).sum())  / max(1, ni) )
-        viols.append(   float((active & outside).sum()) / max(1, no) )
-    return float(np.mean(arrived)), float(np.mean(viols))
-
-# ------- implicit S application (4-neighbor, no wrap) -------
-def apply_S_numpy(v):  # v: [H,W] bool
-    H, W = v.shape
-    y = np.zeros_like(v, dtype=bool)
-    # up
-    y[0:H-1, :] |= v[1:H, :]
-    # down
-    y[1:H,   :] |= v[0:H-1, :]
-    # left
-    y[:, 0:W-1] |= v[:, 1:W]
-    # right
-    y[:, 1:W  ] |= v[:, 0:W-1]
-    return y
-
-def apply_S_torch(v):  # v: [H,W] bool tensor
-    H, W = v.shape
-    y = torch.zeros_like(v, dtype=torch.bool)
-    y[0:H-1, :] = y[0:H-1, :] | v[1:H, :]
-    y[1:H,   :] = y[1:H,   :] | v[0:H-1, :]
-    y[:, 0:W-1] = y[:, 0:W-1] | v[:, 1:W]
-    y[:, 1:W  ] = y[:, 1:W  ] | v[:, 0:W-1]
-    return y
-
-def run_generate(H, W, T, seed, out_npz, out_json, cpu_only=False):
+import argparse, os, shutil, numpy as np
+import sr_perf
+from sr_core import checkpoint as ckpt, parity, symmetry
+from sr_core.stencil import STENCILS
+from sr_core.backend import select_device
+from sr_core.steppers import lightcone_frames, l1_lightcone_mask, causality_metrics
+from sr_core.tiled import lightcone_stream, resolve_threads
+from sr_core.ooc import lightcone_ooc
+from sr_core.emit import emit
+
+def run_checkpointed(H, W, T, seed, threads, keep_frames, path, every=0, resume=False, extend_from=None):
+    """
+    Streamed light cone with periodic checkpoints to `path` (always at the final tick). Starts from
+    extend_from (a finished shorter run) or, with resume, from `path` if it exists; frames, when kept,
+    go to an append-only log next to the checkpoint. Returns (arrived, viols, front or None, start tick).
+    """
+    src = extend_from or (path if resume and os.path.exists(path) else None)
+    state, n_frames = None, 0
+    if src:
+        meta, arr = ckpt.load(src)
+        ckpt.check(meta, "causality_lightcone", H=H, W=W, seed=seed)
+        if meta["t"] > T: raise ValueError(f"checkpoint is at tick {meta['t']} > T={T}")
+        if keep_frames and not meta["frames"]: raise ValueError("checkpoint has no frames log (run it with --out-npz)")
+        state = {"t": meta["t"], "v": ckpt.unpack(arr["v"], W), "acc": ckpt.unpack(arr["acc"], W),
+                 "arrived": arr["arrived"].tolist(), "viols": arr["viols"].tolist()}
+        n_frames = meta["t"] + 1 if keep_frames else 0
+        if keep_frames and src != path: shutil.copyfile(src + ".frames", path + ".frames")
+    log = ckpt.FramesLog(path + ".frames", H, W, n_frames) if keep_frames else None
+
+    def on_tick(t, v, acc, arrived, viols):
+        if t == T or (every and t % every == 0):
+            if log is not None: log.flush()
+            with sr_perf.stage("checkpoint"):
+                ckpt.save(path, {"kind": "causality_lightcone", "H": H, "W": W, "seed": seed, "t": t,
+                                 "frames": keep_frames},
+                          v=ckpt.pack(v), acc=ckpt.pack(acc),
+                          arrived=np.asarray(arrived, dtype=np.float64), viols=np.asarray(viols, dtype=np.float64))
+
+    try:
+        arrived, viols, _, _ = lightcone_stream(H, W, T, threads, state=state, frames_log=log, on_tick=on_tick)
+        front = log.read() if log is not None else None
+    finally:
+        if log is not None: log.close()
+    return arrived, viols, front, (state["t"] if state else 0)
+
+def run_generate(H, W, T, seed, out_npz, out_json, cpu_only=False, threads=1, out_of_core=None, tile_mb=64,
+                 checkpoint=None, checkpoint_every=0, resume=False, extend_from=None, use_parity=False,
+                 sym_mode="auto"):
     np.random.seed(seed)
-    cx, cy = W//2, H//2
-
-    use_torch = (TORCH and (not cpu_only))
-    device = None
-    if use_torch:
-        if torch.cuda.is_available():
-            device = torch.device("cuda")
-        elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
-            device = torch.device("mps")
-        else:
-            device = torch.device("cpu")
-
-    # init v0 (single origin)
-    if use_torch:
-        v = torch.zeros((H,W), dtype=torch.bool, device=device)
-        v[cy, cx] = True
-        acc = v.clone()
-        frames = [acc.detach().cpu().numpy()]
-        for _ in range(T):
-            y = apply_S_torch(v)
-            acc = acc | y
-            frames.append(acc.detach().cpu().numpy())
-            v = y
-        front = np.stack(frames, axis=0).astype(np.uint8)
-        dev_str = str(device)
-    else:
-        v = np.zeros((H,W), dtype=bool)
-        v[cy, cx] = True
-        acc = v.copy()
-        frames = [acc.copy()]
-        for _ in range(T):
-            y = apply_S_numpy(v)
-            acc = np.logical_or(acc, y)
-            frames.append(acc.copy())
-            v = y
-        front = np.stack(frames, axis=0).astype(np.uint8)
+    if extend_from and not checkpoint: checkpoint = extend_from  # extend in place
+    device = select_device(cpu_only) if not (out_of_core or checkpoint or use_parity) else None
+    threads = resolve_threads(threads) if device is None and not (out_of_core or use_parity) else 1
+    quad = symmetry.resolve(sym_mode, H, W, [STENCILS["axial"]], eligible=not (out_of_core or checkpoint or use_parity)
+                            and device is None and threads == 1)
+    if quad: device, threads = None, 1
+    start = None
+    if quad:
+        # centred run on an odd grid: one mirrored quadrant stepped, metrics counted with multiplicities
+        arrived, viols, _, front = symmetry.lightcone(H, W, T, keep_frames=bool(out_npz))
+        dev_str = "numpy"
+    elif use_parity:
+        # checkerboard layout: one half-size class stepped per tick, metrics streamed (frames only for the NPZ)
+        arrived, viols, _, front = parity.lightcone(H, W, T, keep_frames=bool(out_npz))
         dev_str = "numpy"
+    elif checkpoint:
+        arrived, viols, front, start = run_checkpointed(H, W, T, seed, threads, bool(out_npz), checkpoint,
+                                                        checkpoint_every, resume, extend_from)
+        dev_str = "numpy"
+    elif out_of_core:
+        # memory-mapped packed tiles; the [T+1,H,W] frame stack is never built, so no NPZ
+        arrived, viols = lightcone_ooc(H, W, T, out_of_core, tile_mb=tile_mb)
+        front, out_npz, dev_str = None, None, "numpy"
+    elif threads > 1:
+        # row-stripe tiles on a thread pool, metrics streamed per tick (frames kept only for the NPZ)
+        arrived, viols, _, front = lightcone_stream(H, W, T, threads, keep_frames=bool(out_npz))
+        dev_str = "numpy"
+    else:
+        # single origin at the centre
+        front, dev_str = lightcone_frames(H, W, T, device=device)
 
-    ideal = l1_lightcone_mask(H, W, T)
-    arrived, viols = causality_metrics(front.astype(bool), ideal)
+        with sr_perf.stage("ideal_mask"):
+            ideal = l1_lightcone_mask(H, W, T)
+        with sr_perf.stage("metrics", cells=(T+1)*H*W):
+            arrived, viols = causality_metrics(front.astype(bool), ideal)
     PASS = (viols <= 0.0 + 1e-15) and (arrived >= 1.0 - 1e-15)
 
     if out_npz:
-        np.savez_compressed(out_npz, front=front)
+        with sr_perf.stage("save_npz"):
+            np.savez_compressed(out_npz, front=front)
 
     result = {
         "H": H, "W": W, "T": T, "seed": seed,
         "device": dev_str,
+        "threads": threads,
+        "out_of_core": out_of_core,
+        "layout": "parity" if use_parity else "full",
+        "symmetry": "quadrant" if quad else "full",
+        "checkpoint": checkpoint,
+        "resumed_from_tick": start,
         "arrived_fraction": arrived,
         "violations_fraction": viols,
         "PASS": PASS,
         "notes": "Implicit 4-neighbor trace (poset t→t+1), no dense S, no wrap."
     }
-    if out_json:
-        with open(out_json, "w") as f: json.dump(result, f, indent=2)
-    print(pretty(result))
+    return emit(result, sort_keys=True, out_json=out_json)
 
 def run_test(front_path, out_json, strict=True):
-    dat = np.load(front_path)
-    if "front" not in dat: raise ValueError("NPZ missing 'front'")
-    front = dat["front"].astype(bool)
+    with sr_perf.stage("load_npz"):
+        dat = np.load(front_path)
+        if "front" not in dat: raise ValueError("NPZ missing 'front'")
+        front = dat["front"].astype(bool)
     T1, H, W = front.shape
     ideal = l1_lightcone_mask(H, W, T1-1)
-    arrived, viols = causality_metrics(front, ideal)
+    with sr_perf.stage("metrics", cells=T1*H*W):
+        arrived, viols = causality_metrics(front, ideal)
     PASS = (viols <= (0.0 if strict else 1e-12)) and (arrived >= (1.0 - (0.0 if strict else 1e-12)))
     res = {"H":H,"W":W,"T":T1-1,"arrived_fraction":arrived,"violations_fraction":viols,"PASS":PASS}
-    if out_json:
-        with open(out_json,"w") as f: json.dump(res, f, indent=2)
-    print(pretty(res))
+    return emit(res, sort_keys=True, out_json=out_json)
 
 def main():
     ap = argparse.ArgumentParser(description="CA Experiences → Light-cone via implicit trace operator")
@@ -139,15 +134,50 @@ def main():
     g.add_argument("--out-npz", type=str, default="front.npz")
     g.add_argument("--out-json", type=str, default="causality_from_ca.json")
     g.add_argument("--cpu-only", action="store_true")
+    g.add_argument("--threads", type=int, default=1, help="row-stripe tiles on a thread pool (0 = all CPUs; numpy path)")
+    g.add_argument("--out-of-core", type=str, default=None, metavar="DIR",
+                   help="keep v/y/acc as memory-mapped bit-packed files in DIR (bounded RSS; no NPZ)")
+    g.add_argument("--tile-mb", type=float, default=64, help="working-set budget per out-of-core tile")
+    g.add_argument("--checkpoint", type=str, default=None, metavar="PATH",
+                   help="write stepper state to PATH (.npz) at the end and every --checkpoint-every ticks")
+    g.add_argument("--checkpoint-every", type=int, default=0)
+    g.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    g.add_argument("--extend-from", type=str, default=None, metavar="PATH",
+                   help="continue a finished run's checkpoint to a larger --T (bit-identical to a fresh run)")
+    g.add_argument("--parity", action="store_true",
+                   help="checkerboard layout: store and step only the active parity class (numpy, single thread)")
+    g.add_argument("--symmetry", type=str, default="auto", choices=symmetry.MODES,
+                   help="quadrant = step one quadrant with mirror boundaries (odd H, W); auto = quadrant on the "
+                        "single-thread in-memory numpy path when the grid allows it; full = whole grid")
+    sr_perf.add_argument(g)
 
     t = sub.add_parser("test")
     t.add_argument("--front", type=str, required=True)
     t.add_argument("--out-json", type=str, default="causality_check.json")
     t.add_argument("--non-strict", action="store_true")
+    sr_perf.add_argument(t)
 
     args = ap.parse_args()
+    sr_perf.init(args.profile)
     if args.cmd=="generate":
-        run_generate(args.H,args.W,args.T,args.seed,args.out_npz,args.out_json,cpu_only=args.cpu_only)
+        if (args.resume or args.checkpoint_every) and not args.checkpoint:
+            ap.error("--resume/--checkpoint-every need --checkpoint")
+        if args.out_of_core and (args.checkpoint or args.extend_from):
+            ap.error("--out-of-core does not support checkpoints")
+        if args.parity and (args.out_of_core or args.checkpoint or args.extend_from or args.threads != 1):
+            ap.error("--parity is its own single-threaded in-memory path (no --out-of-core/--checkpoint/--threads)")
+        if args.symmetry == "quadrant":
+            if args.parity or args.out_of_core or args.checkpoint or args.extend_from or args.threads != 1:
+                ap.error("--symmetry quadrant is a single-threaded in-memory path (no --parity/--out-of-core/--checkpoint/--threads)")
+            try:
+                symmetry.resolve("quadrant", args.H, args.W, [STENCILS["axial"]])
+            except ValueError as e:
+                ap.error(str(e))
+        run_generate(args.H,args.W,args.T,args.seed,args.out_npz,args.out_json,cpu_only=args.cpu_only,
+                     threads=args.threads, out_of_core=args.out_of_core, tile_mb=args.tile_mb,
+                     checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                     resume=args.resume, extend_from=args.extend_from, use_parity=args.parity,
+                     sym_mode=args.symmetry)
     else:
         run_test(args.front,args.out_json,strict=(not args.non_strict))
 
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# Grid-free causal set: Poisson sprinkling into a Minkowski Alexandrov interval (1+1, 2+1, 3+1).
+# Causal matrix from a time-sorted sweep in row blocks × column chunks (O(n²) pair tests, O(block·chunk) memory;
+# bit-packed rows optional). Links = transitive reduction: each row first drops every candidate in the future of one
+# cover element near its apex, then walks the few that remain in time order against its current link frontier, so
+# no candidate is ever tested against all the others. Everything persists to memory-mapped .npy files.
+
+import argparse, json, math, os, shutil, tempfile, numpy as np
+import sr_perf
+from sr_core.emit import emit
+
+def interval_volume(d, T):
+    """Volume of the Alexandrov interval between (0,0) and (T,0) in d spacetime dims."""
+    k = d - 1  # spatial dims
+    ball = math.pi**(k/2) / math.gamma(k/2 + 1)  # unit k-ball volume
+    # two cones of height T/2 glued at the waist: 2 * ball * (T/2)^d / d
+    return 2.0 * ball * (T/2.0)**d / d
+
+def sprinkle(d, T, n_mean, seed, fixed_n=False, batch=1<<16):
+    """Poisson-sample points (t, x_1..x_{d-1}) inside I(p,q); returns time-sorted array [n,d]."""
+    rng = np.random.default_rng(seed)
+    n = int(n_mean) if fixed_n else int(rng.poisson(n_mean))
+    out = np.empty((n, d), dtype=np.float64)
+    got = 0
+    while got < n:
+        t = rng.uniform(0.0, T, size=batch)
+        x = rng.uniform(-T/2.0, T/2.0, size=(batch, d-1))
+        r = np.sqrt((x*x).sum(axis=1))
+        keep = (r <= t) & (r <= T - t)
+        m = min(int(keep.sum()), n - got)
+        out[got:got+m, 0]  = t[keep][:m]
+        out[got:got+m, 1:] = x[keep][:m]
+        got += m
+    return out[np.argsort(out[:, 0], kind="stable")]
+
+def separation(a, b):
+    """(dt, |dx|²) as [len(a), len(b)] arrays for b_j − a_i; one spatial axis at a time, no [.., .., d] temporary."""
+    dt = b[None, :, 0] - a[:, None, 0]
+    dx2 = np.zeros_like(dt)
+    for k in range(1, a.shape[1]):
+        dx2 += (b[None, :, k] - a[:, None, k])**2
+    return dt, dx2
+
+def precedes(a, b):
+    """Boolean [len(a), len(b)]: a_i ≺ b_j (strictly timelike or null future)."""
+    dt, dx2 = separation(a, b)
+    return (dt > 0) & (dt*dt >= dx2)
+
+def _frontier(pts, cand, links, head=64, piece=1<<22):
+    """
+    Extend one element's links with the time-sorted future candidates `cand`. k is a link iff no j with i≺j≺k, and
+    such a j can be taken minimal, i.e. a link earlier in time. Candidates are first filtered by the links already
+    found; then the earliest `head` survivors are checked among themselves, the uncovered ones become links, and only
+    those new links filter the rest — the cost follows candidates × frontier, never candidates².
+    """
+    if cand.size and links.size:
+        keep = np.ones(cand.size, dtype=bool)
+        step = max(1, piece // links.size)
+        for s in range(0, cand.size, step):
+            keep[s:s+step] = ~precedes(pts[links], pts[cand[s:s+step]]).any(axis=0)
+        cand = cand[keep]
+    found = [links]
+    while cand.size:
+        h = cand[:head]
+        new = h[~precedes(pts[h], pts[h]).any(axis=0)]  # upper-triangular in time order
+        found.append(new)
+        cand = cand[head:]
+        if cand.size: cand = cand[~precedes(pts[new], pts[cand]).any(axis=0)]
+    return np.concatenate(found) if len(found) > 1 else links
+
+def build_causet(pts, out_dir, block=256, chunk=1<<15, relations=False):
+    """Sweep time-sorted elements; write degree counts, CSR links and (optionally) packed relations."""
+    n = pts.shape[0]
+    os.makedirs(out_dir, exist_ok=True)
+    mm = lambda name, shape, dtype: np.lib.format.open_memmap(os.path.join(out_dir, name), mode="w+", dtype=dtype, shape=shape)
+    out_deg = mm("out_degree.npy", (n,), np.int64)
+    in_deg  = mm("in_degree.npy",  (n,), np.int64)
+    indptr  = mm("link_indptr.npy", (n+1,), np.int64)
+    rel = mm("relations.npy", (n, (n+7)//8), np.uint8) if relations else None
+    in_deg[:] = 0; indptr[0] = 0
+    raw_path = os.path.join(out_dir, "link_indices.i32.tmp")
+    n_links = 0
+    with open(raw_path, "wb") as raw:
+        for r0 in range(0, n, block):
+            r1 = min(n, r0 + block)
+            rows = np.arange(r1 - r0)
+            row_links = [np.empty(0, dtype=np.int64) for _ in rows]
+            deg = np.zeros(r1 - r0, dtype=np.int64)
+            cover = np.full(r1 - r0, -1, dtype=np.int64)  # per row: a future element near the apex axis
+            reach = np.full(r1 - r0, np.inf)
+            c_start = (r0 // 8) * 8  # keep packed writes byte-aligned
+            for c0 in range(c_start, n, chunk):
+                c1 = min(n, c0 + chunk)
+                dt, dx2 = separation(pts[r0:r1], pts[c0:c1])
+                R = (dt > 0) & (dt*dt >= dx2)
+                deg += R.sum(axis=1)
+                in_deg[c0:c1] += R.sum(axis=0)
+                if rel is not None:
+                    rel[r0:r1, c0//8:(c1+7)//8] = np.packbits(R, axis=1)
+                # dt + |dx| is the larger null-coordinate offset: the smaller it is, the more of the row's future
+                # the cover's own future contains. Anything in the cover's future is not a link (transitivity).
+                score = np.where(R, dt + np.sqrt(dx2), np.inf)
+                best = score.argmin(axis=1)
+                better = score[rows, best] < reach
+                reach[better] = score[rows[better], best[better]]
+                cover[better] = c0 + best[better]
+                has = cover >= 0
+                rest = R.copy()
+                rest[has] &= ~precedes(pts[cover[has]], pts[c0:c1])
+                for i in np.flatnonzero(rest.any(axis=1)):
+                    row_links[i] = _frontier(pts, c0 + np.flatnonzero(rest[i]), row_links[i])
+            out_deg[r0:r1] = deg
+            for i, lk in enumerate(row_links):
+                raw.write(lk.astype("<i4").tobytes())
+                n_links += lk.size
+                indptr[r0 + i + 1] = n_links
+    idx = mm("link_indices.npy", (n_links,), np.int32)
+    if n_links:
+        src = np.memmap(raw_path, dtype="<i4", mode="r", shape=(n_links,))
+        for s in range(0, n_links, 1<<22):
+            idx[s:s+(1<<22)] = src[s:s+(1<<22)]
+        del src
+    os.remove(raw_path)
+    for a in (out_deg, in_deg, indptr, idx) + ((rel,) if rel is not None else ()):
+        a.flush()
+    return int(out_deg.sum()), n_links
+
+def check_links(pts, indptr, indices, sample, seed, rows=256):
+    """Brute-force oracle on `sample` random elements: their links must be exactly the minimal elements of their
+    future (dense over that future only). Returns the number of elements whose stored links differ."""
+    n = pts.shape[0]
+    bad = 0
+    for i in np.random.default_rng(seed).choice(n, size=min(sample, n), replace=False):
+        fut = np.flatnonzero(precedes(pts[i:i+1], pts)[0])
+        covered = np.zeros(fut.size, dtype=bool)
+        for s in range(0, fut.size, rows):
+            covered |= precedes(pts[fut[s:s+rows]], pts[fut]).any(axis=0)
+        bad += not np.array_equal(np.sort(indices[indptr[i]:indptr[i+1]]), fut[~covered])
+    return bad
+
+def load_causet(out_dir):
+    """Open a persisted causal set read-only (memory-mapped)."""
+    with open(os.path.join(out_dir, "meta.json")) as f: meta = json.load(f)
+    names = ["points", "out_degree", "in_degree", "link_indptr", "link_indices"] + (["relations"] if meta.get("relations") else [])
+    arrs = {k: np.load(os.path.join(out_dir, k + ".npy"), mmap_mode="r") for k in names}
+    return meta, arrs
+
+def ordering_fraction_mm(d):
+    """Myrheim–Meyer expected ordering fraction R / C(n,2) for an Alexandrov interval in d dims."""
+    return math.gamma(d+1) * math.gamma(d/2) / (2.0 * math.gamma(3*d/2))
+
+def mm_dimension(r, lo=1.0, hi=10.0):
+    """Invert the (monotone decreasing) Myrheim–Meyer relation r(d) by bisection."""
+    if not (0.0 < r < 1.0): return float("nan")
+    for _ in range(80):
+        mid = 0.5*(lo + hi)
+        if ordering_fraction_mm(mid) > r: lo = mid
+        else: hi = mid
+    return 0.5*(lo + hi)
+
+def run(a, out_dir):
+    with sr_perf.stage("sprinkle"):
+        pts = sprinkle(a.d, a.T, a.n, a.seed, fixed_n=a.fixed_n)
+    n = pts.shape[0]
+    os.makedirs(out_dir, exist_ok=True)
+    P = np.lib.format.open_memmap(os.path.join(out_dir, "points.npy"), mode="w+", dtype=np.float64, shape=pts.shape)
+    P[:] = pts; P.flush()
+    with sr_perf.stage("sweep", pairs=n*(n-1)//2):
+        R, L = build_causet(pts, out_dir, block=a.block, chunk=a.chunk, relations=a.relations)
+
+    pairs = n*(n-1)/2.0
+    r = R/pairs if pairs > 0 else float("nan")
+    d_hat = mm_dimension(r)
+    meta = {"d": a.d, "T": a.T, "n": n, "seed": a.seed, "relations": bool(a.relations),
+            "n_relations": R, "n_links": L, "order": "time-sorted"}
+    with open(os.path.join(out_dir, "meta.json"), "w") as f: json.dump(meta, f, indent=2)
+
+    out = {
+      "d": a.d, "T": a.T, "n_mean": a.n, "n": n, "seed": a.seed,
+      "density": n / interval_volume(a.d, a.T),
+      "n_relations": R, "n_links": L,
+      "links_per_element": L/max(1, n),
+      "ordering_fraction": r,
+      "ordering_fraction_target": ordering_fraction_mm(a.d),
+      "mm_dimension_hat": d_hat,
+      "abs_err_dim": abs(d_hat - a.d),
+      "tol_dim": a.tol_dim,
+      "PASS_mm_dimension": abs(d_hat - a.d) <= a.tol_dim,
+      "out_dir": a.out_dir or None,
+      "notes": "Continuum Minkowski sprinkling; causal matrix from time-sorted sweep; links = transitive reduction; memmapped .npy outputs."
+    }
+    if a.check_links > 0:
+        with sr_perf.stage("check_links", elements=a.check_links):
+            _, arrs = load_causet(out_dir)
+            bad = check_links(pts, arrs["link_indptr"], arrs["link_indices"], a.check_links, a.seed)
+        out.update(links_checked=min(a.check_links, n), links_mismatched=bad, PASS_links_exact=bad == 0)
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Grid-free causal set: sprinkle into an Alexandrov interval, sparse causal matrix + links.")
+    ap.add_argument("--d", type=int, default=2, choices=[2,3,4], help="spacetime dimension (1+1, 2+1, 3+1)")
+    ap.add_argument("--T", type=float, default=1.0, help="interval height (proper time between tips)")
+    ap.add_argument("--n", type=float, default=5000, help="expected number of elements (Poisson mean)")
+    ap.add_argument("--fixed-n", action="store_true", help="use exactly n elements instead of a Poisson draw")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out-dir", type=str, default="causet_out", help="output directory ('' = temporary, removed after)")
+    ap.add_argument("--relations", action="store_true", help="also persist bit-packed causal matrix (n*n/8 bytes)")
+    ap.add_argument("--block", type=int, default=256, help="rows per sweep block")
+    ap.add_argument("--chunk", type=int, default=1<<15, help="columns per sweep chunk (multiple of 8)")
+    ap.add_argument("--tol_dim", type=float, default=0.15)
+    ap.add_argument("--check-links", type=int, default=0, metavar="K",
+                    help="verify the links of K random elements against a brute-force transitive reduction")
+    sr_perf.add_argument(ap)
+    a = ap.parse_args()
+    sr_perf.init(a.profile)
+    if a.chunk % 8: ap.error("--chunk must be a multiple of 8")
+    out_dir = a.out_dir or tempfile.mkdtemp(prefix="causet_")
+    try:
+        out = run(a, out_dir)
+    finally:
+        if not a.out_dir: shutil.rmtree(out_dir, ignore_errors=True)
+    emit(out)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-import argparse, json, math, numpy as np
+import argparse, math, numpy as np
+import sr_perf
+from sr_core import cache, stats
+from sr_core.emit import emit
 
 def step_probs_3d(cx,cy,cz):
     ax,ay,az = abs(cx),abs(cy),abs(cz)
@@ -9,8 +12,8 @@ def step_probs_3d(cx,cy,cz):
     Z = ax+ay+az if (ax+ay+az)>0 else 1.0
     return (wxp/Z, wxn/Z, wyp/Z, wyn/Z, wzp/Z, wzn/Z)
 
-def run(H,W,D,T,N,seed):
-    rng = np.random.default_rng(seed)
+def walk(H,W,D,T,N,rng):
+    """Endpoint offsets [N,3] from the start after T ticks, drawing from rng."""
     cx,cy,cz = H//2, W//2, D//2
     X = np.zeros((N,3), dtype=np.int32); X[:,0]=cx; X[:,1]=cy; X[:,2]=cz
     for _ in range(T):
@@ -28,15 +31,41 @@ def run(H,W,D,T,N,seed):
         delta = np.array([[1,0,0],[-1,0,0],[0,1,0],[0,-1,0],[0,0,1],[0,0,-1]], dtype=np.int32)
         X = np.clip(X + delta[sel], [0,0,0], [H-1,W-1,D-1])
 
-    # center positions and compute covariance
-    pos = X - np.array([[cx,cy,cz]], dtype=np.int32)
-    cov = (pos.T @ pos) / float(N)
-    # eigenvalues
+    # center positions
+    return X - np.array([[cx,cy,cz]], dtype=np.int32)
+
+def score_from_cov(cov):
     lam, _ = np.linalg.eigh(cov)
     lam = np.sort(lam)  # ascending
-    score = float((lam[-1]-lam[0]) / max(1e-9, lam[-1]+lam[0]))
+    return lam, float((lam[-1]-lam[0]) / max(1e-9, lam[-1]+lam[0]))
+
+def moment_sums(pos):
+    """Sufficient statistics [n, Σ pos_i pos_j (3×3, flattened)] of a batch of endpoint offsets."""
+    p = pos.astype(np.float64)
+    return np.concatenate([[len(p)], (p.T @ p).ravel()])
+
+def cov_from_sums(m):
+    return m[1:].reshape(3, 3) / m[0]
+
+def run(H,W,D,T,N,seed):
+    rng = np.random.default_rng(seed)
+    pos = walk(H,W,D,T,N,rng)
+    cov = (pos.T @ pos) / float(N)
+    lam, score = score_from_cov(cov)
     return cov, lam, score
 
+def run_sequential(H,W,D,T,N,seed,tol,batch=1000,confidence=0.95,min_batches=8):
+    """Batches of agents until the anisotropy CI clears tol (or N agents are spent)."""
+    rng = np.random.default_rng(seed)
+    def run_batch(n):
+        with sr_perf.stage("walk", ticks=T, agent_ticks=n*T):
+            return moment_sums(walk(H,W,D,T,n,rng))
+    sums, seq = stats.sequential(run_batch, lambda m: score_from_cov(cov_from_sums(m))[1],
+                                 tol, N, batch, confidence, min_batches)
+    cov = cov_from_sums(sums)
+    lam, score = score_from_cov(cov)
+    return cov, lam, score, seq
+
 def main():
     ap=argparse.ArgumentParser(description="3D isotropy via covariance eigenvalues (6-neighbor rounding).")
     ap.add_argument("--H", type=int, default=201)
@@ -46,10 +75,27 @@ def main():
     ap.add_argument("--N", type=int, default=60000)
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--tol", type=float, default=0.04)
+    ap.add_argument("--sequential", action="store_true",
+                    help="run agents in batches (N = budget) and stop once the anisotropy CI clears --tol")
+    ap.add_argument("--batch", type=int, default=1000, help="agents per batch with --sequential")
+    ap.add_argument("--confidence", type=float, default=0.95, help="two-sided CI level with --sequential")
+    ap.add_argument("--min-batches", type=int, default=8, help="batches before the first stopping check")
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     a=ap.parse_args()
-    cov, lam, score = run(a.H,a.W,a.D,a.T,a.N,a.seed)
+    sr_perf.init(a.profile)
+    if cache.replay(__file__, vars(a)): return
+    seq = None
+    if a.sequential:
+        try:
+            cov, lam, score, seq = run_sequential(a.H,a.W,a.D,a.T,a.N,a.seed,a.tol,a.batch,a.confidence,a.min_batches)
+        except ValueError as e:
+            ap.error(str(e))
+    else:
+        with sr_perf.stage("walk", ticks=a.T, agent_ticks=a.N*a.T):
+            cov, lam, score = run(a.H,a.W,a.D,a.T,a.N,a.seed)
     out = {
-      "H":a.H,"W":a.W,"D":a.D,"T":a.T,"N_agents":a.N,"seed":a.seed,
+      "H":a.H,"W":a.W,"D":a.D,"T":a.T,"N_agents":seq["agents_used"] if seq else a.N,"seed":a.seed,
       "cov":{"Sxx":float(cov[0,0]),"Syy":float(cov[1,1]),"Szz":float(cov[2,2]),
              "Sxy":float(cov[0,1]),"Sxz":float(cov[0,2]),"Syz":float(cov[1,2])},
       "eigvals":{"lambda_min":float(lam[0]),"lambda_mid":float(lam[1]),"lambda_max":float(lam[2])},
@@ -58,7 +104,8 @@ def main():
       "PASS_isotropy_3d": (score <= a.tol),
       "notes":"One-step/tick; per-tick random 3D direction; 6-neighbor stochastic rounding; strict t->t+1."
     }
-    print(json.dumps(out, indent=2))
+    if seq: out["sequential"] = seq
+    emit(out)
 
 if __name__=="__main__":
     main()
@@ -2,79 +2,83 @@
 # CA/MM poset isotropy audit: one-step/tick reachability with optional staggered/random neighborhoods.
 # Outputs JSON with angular radius stats and an isotropy score (RMS fractional deviation).
 
-import argparse, json, math, numpy as np
-try:
-    import torch
-    TORCH=True
-except:
-    TORCH=False
-
-def evolve_front(H,W,T,schedule,seed=7,device=None):
-    """Return final boolean front mask after <=T ticks (union over time)."""
+import argparse, math, os, sys, numpy as np
+import sr_perf
+from sr_core import cache, minkowski, snapshots, stencil, symmetry
+from sr_core import checkpoint as ckpt
+from sr_core.backend import select_device, device_str
+from sr_core.emit import emit
+from sr_core.tiled import TiledStepper, resolve_threads
+
+def evolve_front(H,W,T,schedule,seed=7,device=None,packed=False,threads=1,state=None,on_tick=None):
+    """Return final boolean front mask after <=T ticks (union over time).
+    schedule: any sr_core.stencil schedule spec (axial|staggered|random, a stencil, cycle:/random:/@file).
+    state {"t", "v", "acc", "rng"} continues a checkpointed run (numpy paths; v/acc bool);
+    on_tick(t, v, acc, rng) sees bool v/acc after every tick."""
     cx, cy = H//2, W//2
-    if TORCH and device is not None:
-        v = torch.zeros((H,W), dtype=torch.bool, device=device); v[cx,cy]=True
-        acc = v.clone()
-        rng = None
-        import numpy as np
-        rng = np.random.default_rng(seed)
+    rng = np.random.default_rng(seed) if state is None else state["rng"]
+    sched = schedule if isinstance(schedule, stencil.Schedule) else stencil.Schedule(schedule)
+    backend = "torch" if device is not None else ("packed" if packed else "numpy")
+    kernels = stencil.compile_schedule(sched, H, W, backend)
+    as_bool = (lambda x: stencil.unpack(x, W)) if packed else (lambda x: x)
+
+    # ping-pong buffers: v (current), nxt (scratch), acc (union); no per-tick allocation
+    v = stencil.zeros(H, W, backend, device); nxt = stencil.zeros(H, W, backend, device)
+    if state is not None:
+        t0 = int(state["t"])
+        v[...] = stencil.pack(state["v"]) if packed else state["v"]
+        acc = stencil.pack(state["acc"]) if packed else state["acc"].copy()
     else:
-        v = np.zeros((H,W), dtype=bool); v[cx,cy]=True
-        acc = v.copy()
-        rng = np.random.default_rng(seed)
-
-    def step_axial(x):
-        if TORCH and device is not None:
-            up    = torch.zeros_like(x); up[:-1,:]   |= x[1: ,:]
-            down  = torch.zeros_like(x); down[1: ,:] |= x[:-1,:]
-            left  = torch.zeros_like(x); left[:,1: ] |= x[:, :-1]
-            right = torch.zeros_like(x); right[:,:-1]|= x[:, 1: ]
-            return up|down|left|right
-        else:
-            y = np.zeros_like(x)
-            y[:-1,:]  |= x[1: ,:]
-            y[1: ,:]  |= x[:-1,:]
-            y[:,1: ]  |= x[:, :-1]
-            y[:,:-1]  |= x[:, 1: ]
-            return y
-
-    def step_diag(x):
-        if TORCH and device is not None:
-            y = torch.zeros_like(x)
-            y[1:, 1:]   |= x[:-1,:-1]
-            y[1:, :-1]  |= x[:-1,1:]
-            y[:-1, 1:]  |= x[1: ,:-1]
-            y[:-1, :-1] |= x[1: , 1:]
-            return y
-        else:
-            y = np.zeros_like(x)
-            y[1:, 1:]   |= x[:-1,:-1]
-            y[1:, :-1]  |= x[:-1,1:]
-            y[:-1, 1:]  |= x[1: ,:-1]
-            y[:-1, :-1] |= x[1: , 1:]
-            return y
-
-    def step_random(x):
-        # choose axial vs diagonal per tick, unbiased
-        #return step_diag(x) if (rng.random() < 0.5) else step_axial(x)
-        return step_diag(x) if (rng.random() < 0.5) else step_axial(x)
-
-    for t in range(T):
-        if schedule == "axial":
-            v_next = step_axial(v)
-        elif schedule == "staggered":
-            v_next = step_axial(v) if (t % 2 == 0) else step_diag(v)
-        elif schedule == "random":
-            v_next = step_random(v)
-        else:
-            raise ValueError("schedule must be axial|staggered|random")
-        v = v_next
-        acc = acc | v
+        t0 = 0
+        if packed: v[cx, cy // 64] = np.uint64(1) << np.uint64(cy % 64)
+        else: v[cx, cy] = True
+        acc = v.clone() if device is not None else v.copy()
+    threads = resolve_threads(threads) if device is None else 1
+    if threads > 1:
+        def tile(r0, r1, y):
+            np.bitwise_or(acc[r0:r1], y[r0:r1], out=acc[r0:r1])
+        with TiledStepper(kernels, v, threads) as st:
+            for t, k in enumerate(sched.ticks(T, rng, t0), t0 + 1):
+                st.step(k, tile)
+                if on_tick is not None: on_tick(t, as_bool(st.v), as_bool(acc), rng)
+    else:
+        for t, k in enumerate(sched.ticks(T, rng, t0), t0 + 1):
+            kernels[k].apply(v, nxt)
+            v, nxt = nxt, v
+            acc |= v
+            if on_tick is not None: on_tick(t, as_bool(v), as_bool(acc), rng)
 
-    if TORCH and device is not None:
+    if device is not None:
         return acc.detach().cpu().numpy()
-    else:
-        return acc
+    if packed:
+        return stencil.unpack(acc, W)
+    return acc
+
+def evolve_checkpointed(H, W, T, sched, seed, path, every=0, resume=False, extend_from=None, on_tick=None, **kw):
+    """evolve_front with checkpoints to `path` (every `every` ticks and at T); returns (mask, start tick).
+    on_tick(t, v, acc, rng) also runs after every tick stepped here (not for ticks restored from the checkpoint)."""
+    src = extend_from or (path if resume and os.path.exists(path) else None)
+    state = None
+    if src:
+        meta, arr = ckpt.load(src)
+        ckpt.check(meta, "isotropy_audit", H=H, W=W, seed=seed, schedule=sched.spec)
+        if meta["t"] > T: raise ValueError(f"checkpoint is at tick {meta['t']} > T={T}")
+        state = {"t": meta["t"], "v": ckpt.unpack(arr["v"], W), "acc": ckpt.unpack(arr["acc"], W),
+                 "rng": ckpt.restore_rng(meta["rng"])}
+
+    def save(t, v, acc, rng):
+        with sr_perf.stage("checkpoint"):
+            ckpt.save(path, {"kind": "isotropy_audit", "H": H, "W": W, "seed": seed, "schedule": sched.spec,
+                             "t": t, "rng": ckpt.rng_state(rng)}, v=ckpt.pack(v), acc=ckpt.pack(acc))
+
+    def tick(t, v, acc, rng):
+        if on_tick is not None: on_tick(t, v, acc, rng)
+        if t == T or (every and t % every == 0): save(t, v, acc, rng)
+
+    mask = evolve_front(H, W, T, sched, seed=seed, state=state, on_tick=tick, **kw)
+    t0 = state["t"] if state else 0
+    if t0 == T: save(T, state["v"], mask, state["rng"])  # nothing stepped: still leave a checkpoint at `path`
+    return mask, t0
 
 def sample_radii(mask, num_angles=360):
     H,W = mask.shape
@@ -102,39 +106,160 @@ def sample_radii(mask, num_angles=360):
         radii.append(r)
     return np.array(radii, dtype=float)
 
+def radius_stats(radii):
+    mean_r = float(np.mean(radii))
+    std_r  = float(np.std(radii))
+    rms_frac = float(np.sqrt(np.mean(((radii-mean_r)/max(mean_r,1e-9))**2)))
+    return mean_r, std_r, rms_frac
+
+def snapshot_row(t, radii):
+    mean_r, std_r, rms_frac = radius_stats(radii)
+    return {"T": t, "mean_radius": mean_r, "std_radius": std_r,
+            "isotropy_score_rms_fraction": rms_frac, "PASS_isotropy": rms_frac <= 0.05}
+
+def oracle_radii(sched, T, seed=7, num_angles=360):
+    """Boundary radius of the T-tick Minkowski-sum hull at the audit's ray angles (no lattice)."""
+    normals, h = minkowski.polygon(sched, T, seed)
+    thetas = 2*math.pi*np.arange(num_angles)/num_angles
+    return minkowski.radial(normals, h, thetas)
+
 def main():
     ap = argparse.ArgumentParser(description="CA/MM isotropy audit for one-step/tick fronts.")
     ap.add_argument("--H", type=int, default=601)
     ap.add_argument("--W", type=int, default=601)
     ap.add_argument("--T", type=int, default=300)
-    ap.add_argument("--schedule", type=str, default="staggered", choices=["axial","staggered","random"])
+    ap.add_argument("--schedule", type=str, default="staggered",
+                    help="axial|staggered|random, a stencil (axial, diag, moore, knight, hex, or 'd0:d1;...'), "
+                         "cycle:s1,s2,..., random:s1=w1,s2=w2,..., or @file (one stencil per line)")
+    ap.add_argument("--packed", action="store_true", help="bit-packed uint64 rows on the numpy path")
+    ap.add_argument("--threads", type=int, default=1, help="row-stripe tiles on a thread pool (0 = all CPUs; numpy path)")
+    ap.add_argument("--symmetry", type=str, default="auto", choices=symmetry.MODES,
+                    help="quadrant = step one quadrant with mirror boundaries (odd H, W; schedules closed under axis "
+                         "reflections, e.g. not hex); auto = quadrant on the plain single-thread numpy path when "
+                         "the run allows it; full = whole grid")
+    ap.add_argument("--verify-serial", action="store_true",
+                    help="rerun single-threaded (same packing) and report PASS_threads_bit_identical (with --threads)")
     ap.add_argument("--angles", type=int, default=360)
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--cpu-only", action="store_true")
+    ap.add_argument("--mode", type=str, default="simulate", choices=["simulate","oracle","check"],
+                    help="simulate the lattice; oracle = analytic Minkowski-sum hull (no lattice, any T); "
+                         "check = both, plus an exact lattice-region comparison (small sizes)")
+    ap.add_argument("--checkpoint", type=str, default=None, metavar="PATH",
+                    help="write stepper state (fronts, tick, RNG) to PATH at the end and every --checkpoint-every ticks")
+    ap.add_argument("--checkpoint-every", type=int, default=0)
+    ap.add_argument("--resume", action="store_true", help="continue from --checkpoint if it exists")
+    ap.add_argument("--extend-from", type=str, default=None, metavar="PATH",
+                    help="continue a finished run's checkpoint to a larger --T (bit-identical to a fresh run)")
+    snapshots.add_argument(ap)
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     args = ap.parse_args()
+    sr_perf.init(args.profile)
+    try:
+        snaps = snapshots.parse(args.snapshots, args.T)
+    except ValueError as e:
+        ap.error(str(e))
+    if (args.resume or args.checkpoint_every) and not args.checkpoint:
+        ap.error("--resume/--checkpoint-every need --checkpoint")
+    if args.extend_from and not args.checkpoint: args.checkpoint = args.extend_from  # extend in place
+    if args.checkpoint and args.mode == "oracle":
+        ap.error("--mode oracle does not step the lattice; nothing to checkpoint")
+    if args.symmetry == "quadrant" and (args.checkpoint or args.packed or args.threads != 1):
+        ap.error("--symmetry quadrant is a single-threaded unpacked path (no --checkpoint/--packed/--threads)")
+    if args.verify_serial and (args.checkpoint or args.threads == 1 or args.mode == "oracle"):
+        ap.error("--verify-serial compares a --threads run against a serial one (no --checkpoint, not --mode oracle)")
+    if not args.checkpoint and cache.replay(__file__, vars(args)): return
 
-    use_torch = TORCH and (not args.cpu_only)
-    device = None
-    if use_torch:
-        if torch.cuda.is_available(): device=torch.device("cuda")
-        elif getattr(torch.backends,"mps",None) and torch.backends.mps.is_available(): device=torch.device("mps")
-        else: device=torch.device("cpu")
+    device = select_device(args.cpu_only) if not args.checkpoint else None
+    try:
+        sched = stencil.Schedule(args.schedule)
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    try:
+        quad = symmetry.resolve(args.symmetry, args.H, args.W, sched.stencils,
+                                eligible=device is None and not (args.checkpoint or args.packed)
+                                and resolve_threads(args.threads) == 1)
+    except ValueError as e:
+        ap.error(str(e))
+    if quad: device = None
 
-    mask = evolve_front(args.H, args.W, args.T, args.schedule, seed=args.seed, device=device)
-    radii = sample_radii(mask, num_angles=args.angles)
+    if args.mode == "oracle":
+        with sr_perf.stage("oracle", ticks=args.T):
+            mean_r, std_r, rms_frac = radius_stats(oracle_radii(sched, args.T, args.seed, args.angles))
+        out = {
+            "T": args.T, "schedule": args.schedule, "angles": args.angles, "mode": "oracle",
+            "mean_radius": mean_r, "std_radius": std_r,
+            "isotropy_score_rms_fraction": rms_frac,
+            "PASS_isotropy": rms_frac <= 0.05
+        }
+        if snaps:
+            with sr_perf.stage("oracle_snapshots", ticks=len(snaps)):
+                out["snapshots"] = [snapshot_row(t, oracle_radii(sched, t, args.seed, args.angles)) for t in snaps]
+        emit(out); return
 
-    mean_r = float(np.mean(radii))
-    std_r  = float(np.std(radii))
-    rms_frac = float(np.sqrt(np.mean(((radii-mean_r)/max(mean_r,1e-9))**2)))
+    rows, want = [], set(snaps)
+    def on_tick(t, v, acc, rng):
+        if t in want:
+            if hasattr(acc, "detach"): acc = acc.detach().cpu().numpy()  # torch device
+            rows.append(snapshot_row(t, sample_radii(acc, num_angles=args.angles)))
+    cells = args.T*(args.H - args.H//2)*(args.W - args.W//2) if quad else args.T*args.H*args.W
+    with sr_perf.stage("evolve_front", ticks=args.T, cells=cells):
+        kw = dict(packed=args.packed and device is None, threads=args.threads, on_tick=on_tick if snaps else None)
+        start = None
+        if quad:
+            # centred run, mirror-symmetric schedule: step one quadrant; radii are marched on its unfolded view
+            q = symmetry.evolve(args.H, args.W, args.T, sched, np.random.default_rng(args.seed),
+                                on_tick=(lambda t, q: on_tick(t, None, q.view(), None)) if snaps else None)
+            mask = q.view()
+        elif args.checkpoint:
+            try:
+                mask, start = evolve_checkpointed(args.H, args.W, args.T, sched, args.seed, args.checkpoint,
+                                                  args.checkpoint_every, args.resume, args.extend_from, **kw)
+            except (OSError, ValueError) as e:
+                ap.error(str(e))
+        else:
+            switch = sys.getswitchinterval()
+            if args.verify_serial: sys.setswitchinterval(1e-6)  # interleave stripe threads finely so races surface
+            try:
+                mask = evolve_front(args.H, args.W, args.T, sched, seed=args.seed, device=device, **kw)
+            finally:
+                sys.setswitchinterval(switch)
+    with sr_perf.stage("sample_radii", rays=args.angles):
+        radii = sample_radii(mask, num_angles=args.angles)
+    mean_r, std_r, rms_frac = radius_stats(radii)
 
     out = {
         "H": args.H, "W": args.W, "T": args.T, "schedule": args.schedule,
-        "angles": args.angles, "device": (str(device) if use_torch else "numpy"),
+        "angles": args.angles, "device": device_str(device),
+        "symmetry": "quadrant" if quad else "full",
         "mean_radius": mean_r, "std_radius": std_r,
         "isotropy_score_rms_fraction": rms_frac,
+        "resumed_from_tick": start,
         "PASS_isotropy": rms_frac <= 0.05  # target: ≤5% anisotropy
     }
-    print(json.dumps(out, indent=2))
+    if snaps: out["snapshots"] = rows
+    if args.verify_serial:
+        with sr_perf.stage("verify_serial", ticks=args.T, cells=args.T*args.H*args.W):
+            ref = evolve_front(args.H, args.W, args.T, sched, seed=args.seed, device=device,
+                               packed=args.packed and device is None, threads=1)
+        out["PASS_threads_bit_identical"] = bool(np.array_equal(ref, mask))
+    if args.mode == "check":
+        # oracle vs simulation: exact lattice region site-by-site, then hull radii vs ray-marched radii
+        with sr_perf.stage("oracle_check", cells=args.T*args.H*args.W):
+            ii, jj = np.mgrid[0:args.H, 0:args.W]
+            pts = np.stack([ii.ravel() - args.H//2, jj.ravel() - args.W//2], axis=1)
+            exact = minkowski.lattice_region(sched, args.T, pts, args.seed).reshape(args.H, args.W)
+            o_mean, _, o_rms = radius_stats(oracle_radii(sched, args.T, args.seed, args.angles))
+        mism = int((exact != (q.unfold() if quad else mask)).sum())
+        out.update({
+            "oracle_mean_radius": o_mean,
+            "oracle_isotropy_score": o_rms,
+            "oracle_score_abs_diff": abs(o_rms - rms_frac),
+            "oracle_lattice_mismatch_sites": mism,
+            "PASS_oracle_lattice_exact": mism == 0,
+        })
+    emit(out)
 
 if __name__ == "__main__":
     main()
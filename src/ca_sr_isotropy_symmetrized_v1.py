@@ -3,14 +3,12 @@
 # One-step/tick; strict t->t+1; 4-neighbor hops with stochastic axial rounding.
 # GPU optional (CUDA/MPS). Isotropy score = |λ1-λ2|/(λ1+λ2) from endpoint covariance.
 
-import argparse, json, math
+import argparse, math
 import numpy as np
-
-try:
-    import torch
-    TORCH = True
-except Exception:
-    TORCH = False
+import sr_perf
+from sr_core import cache, sampling, snapshots, stats, walkers
+from sr_core.backend import get_torch, select_device
+from sr_core.emit import emit
 
 def isotropy_score_from_cov(Sxx, Syy, Sxy):
     tr  = Sxx + Syy
@@ -21,111 +19,59 @@ def isotropy_score_from_cov(Sxx, Syy, Sxy):
     ani = 0.0 if (lam1 + lam2) == 0 else abs(lam1 - lam2) / (lam1 + lam2)
     return lam1, lam2, ani
 
-def run_torch(H, W, T, N, seed, device, tol=0.03):
-    torch.manual_seed(seed)
-    pi = math.pi
-
-    # positions (int on device)
-    xs = torch.full((N,), H // 2, dtype=torch.int32, device=device)
-    ys = torch.full((N,), W // 2, dtype=torch.int32, device=device)
-
-    for _ in range(T):
-        # random micro-frame direction per agent
-        thetas = torch.rand(N, device=device) * (2.0 * pi)
-        c = torch.cos(thetas)
-        s = torch.sin(thetas)
-
-        # positive axial weights → probabilities
-        wxp = torch.clamp(c, min=0.0)
-        wxn = torch.clamp(-c, min=0.0)
-        wyp = torch.clamp(s, min=0.0)
-        wyn = torch.clamp(-s, min=0.0)
-        Z = wxp + wxn + wyp + wyn
-        Z = torch.clamp(Z, min=1e-12)
-
-        pR = wxp / Z
-        pL = wxn / Z
-        pU = wyp / Z
-        pD = wyn / Z
-
-        # categorical sample via uniform + cumulative probs
-        r = torch.rand(N, device=device)
-        cum1 = pR
-        cum2 = cum1 + pL
-        cum3 = cum2 + pU
-        # indices: 0=R,1=L,2=U,3=D
-        idx = torch.where(r < cum1, torch.zeros_like(r, dtype=torch.int64),
-              torch.where(r < cum2, torch.ones_like(r, dtype=torch.int64),
-              torch.where(r < cum3, torch.full_like(r, 2, dtype=torch.int64),
-                          torch.full_like(r, 3, dtype=torch.int64))))
-
-        # map indices → (dx,dy)
-        # 0:R(+1,0), 1:L(-1,0), 2:U(0,+1), 3:D(0,-1)
-        dx = torch.gather(torch.tensor([1,-1,0,0], device=device, dtype=torch.int32), 0, idx)
-        dy = torch.gather(torch.tensor([0,0,1,-1], device=device, dtype=torch.int32), 0, idx)
-
-        xs = torch.clamp(xs + dx, 0, H - 1)
-        ys = torch.clamp(ys + dy, 0, W - 1)
-
-    # covariance on device (float64 for stability)
-    X = (xs.to(torch.float64) - (H // 2))
-    Y = (ys.to(torch.float64) - (W // 2))
-    Xc = X - X.mean()
-    Yc = Y - Y.mean()
-    Sxx = (Xc * Xc).mean().item()
-    Syy = (Yc * Yc).mean().item()
-    Sxy = (Xc * Yc).mean().item()
-
-    lam1, lam2, ani = isotropy_score_from_cov(Sxx, Syy, Sxy)
-    out = {
-        "H": H, "W": W, "T": T, "N_agents": N, "seed": seed,
-        "device": str(device),
-        "cov": {"Sxx": Sxx, "Syy": Syy, "Sxy": Sxy},
-        "eigvals": {"lambda_max": lam1, "lambda_min": lam2},
-        "isotropy_score_cov_anisotropy": ani,
-        "PASS_isotropy": ani <= tol,
-        "tol": tol,
-        "notes": "One-step/tick; per-tick random direction; stochastic axial rounding; strict t->t+1."
-    }
-    print(json.dumps(out, indent=2))
-
-def run_numpy(H, W, T, N, seed, tol=0.03):
-    rng = np.random.default_rng(seed)
-    xs = np.full((N,), H // 2, dtype=np.int32)
-    ys = np.full((N,), W // 2, dtype=np.int32)
-
-    for _ in range(T):
-        thetas = rng.uniform(0.0, 2.0 * math.pi, size=N)
-        c = np.cos(thetas)
-        s = np.sin(thetas)
-        wxp = np.clip(c, 0.0, None)
-        wxn = np.clip(-c,0.0, None)
-        wyp = np.clip(s, 0.0, None)
-        wyn = np.clip(-s,0.0, None)
-        Z = wxp + wxn + wyp + wyn
-        Z[Z == 0.0] = 1e-12
-        pR = wxp / Z; pL = wxn / Z; pU = wyp / Z; pD = wyn / Z
-        r = rng.random(N)
-        # indices 0..3 same mapping as torch version
-        idx = np.where(r < pR, 0,
-              np.where(r < pR + pL, 1,
-              np.where(r < pR + pL + pU, 2, 3)))
-        dx = np.take(np.array([1,-1,0,0], dtype=np.int32), idx)
-        dy = np.take(np.array([0,0,1,-1], dtype=np.int32), idx)
-        xs = np.clip(xs + dx, 0, H - 1)
-        ys = np.clip(ys + dy, 0, W - 1)
+def walk_torch(H, W, T, N, device, sampler=None, on_tick=None):
+    """Endpoints (xs, ys) of N agents after T ticks (torch RNG seeded by the caller, or a numpy DirectionSampler).
+    on_tick(t, xs, ys) sees the live positions after every tick."""
+    k = walkers.TorchWalkKernel(N, H, W, device)
+    for t in range(T):
+        k.draw(sampler, t)
+        k.tick()
+        if on_tick is not None: on_tick(t + 1, k.xs, k.ys)
+    return k.xs, k.ys
+
+def walk_numpy(H, W, T, N, rng, sampler=None, dtype=np.float64, on_tick=None):
+    """Endpoints (xs, ys) of N agents after T ticks; directions from sampler (default: iid draws from rng).
+    float64 reproduces the legacy walk bit-for-bit; float32 halves the direction-path traffic."""
+    sampler = sampler or sampling.DirectionSampler("iid", N, rng)
+    k = walkers.WalkKernel(N, H, W, dtype=dtype)
+    for t in range(T):
+        k.draw(sampler, t)
+        k.tick()
+        if on_tick is not None: on_tick(t + 1, k.xs, k.ys)
+    return k.xs, k.ys
+
+def moment_sums(H, W, xs, ys):
+    """Sufficient statistics [n, Σx, Σy, Σxx, Σyy, Σxy] of endpoint offsets from the start (float64)."""
+    X = xs.astype(np.float64) - (H // 2)
+    Y = ys.astype(np.float64) - (W // 2)
+    return np.array([len(X), X.sum(), Y.sum(), (X*X).sum(), (Y*Y).sum(), (X*Y).sum()])
 
+def endpoint_cov(H, W, xs, ys):
+    """Population covariance (Sxx, Syy, Sxy) of endpoint offsets from the start."""
     X = xs.astype(np.float64) - (H // 2)
     Y = ys.astype(np.float64) - (W // 2)
     Xc = X - X.mean(); Yc = Y - Y.mean()
-    Sxx = float((Xc * Xc).mean())
-    Syy = float((Yc * Yc).mean())
-    Sxy = float((Xc * Yc).mean())
+    return float((Xc * Xc).mean()), float((Yc * Yc).mean()), float((Xc * Yc).mean())
+
+def cov_from_sums(m):
+    n, sx, sy, sxx, syy, sxy = m
+    mx, my = sx / n, sy / n
+    return sxx / n - mx*mx, syy / n - my*my, sxy / n - mx*my
+
+def anisotropy_from_sums(m):
+    return isotropy_score_from_cov(*cov_from_sums(m))[2]
+
+def anisotropy_components(m):
+    """((Sxx−Syy)/tr, 2Sxy/tr): their norm is |λ1−λ2|/(λ1+λ2), and unlike it they are unbiased near isotropy."""
+    Sxx, Syy, Sxy = cov_from_sums(m)
+    tr = Sxx + Syy
+    return np.zeros(2) if tr == 0 else np.array([(Sxx - Syy) / tr, 2.0 * Sxy / tr])
 
+def result(H, W, T, N, seed, device, Sxx, Syy, Sxy, tol):
     lam1, lam2, ani = isotropy_score_from_cov(Sxx, Syy, Sxy)
-    out = {
+    return {
         "H": H, "W": W, "T": T, "N_agents": N, "seed": seed,
-        "device": "numpy",
+        "device": device,
         "cov": {"Sxx": Sxx, "Syy": Syy, "Sxy": Sxy},
         "eigvals": {"lambda_max": lam1, "lambda_min": lam2},
         "isotropy_score_cov_anisotropy": ani,
@@ -133,29 +79,156 @@ def run_numpy(H, W, T, N, seed, tol=0.03):
         "tol": tol,
         "notes": "One-step/tick; per-tick random direction; stochastic axial rounding; strict t->t+1."
     }
-    print(json.dumps(out, indent=2))
+
+def block_se(H, W, xs, ys, spans):
+    """Jackknife standard error of the anisotropy over independent agent blocks."""
+    if len(spans) < 2: return None
+    return stats.jackknife(anisotropy_from_sums, [moment_sums(H, W, xs[a:b], ys[a:b]) for a, b in spans])[1]
+
+def se_fields(se):
+    """{"isotropy_score_se": se}; an exact 0 (every block/batch gave the same score, as antithetic D4 orbits do on
+    a symmetric grid) is no error estimate, so it is reported as None with a note instead."""
+    if se is None or se > 0: return {"isotropy_score_se": se}
+    return {"isotropy_score_se": None,
+            "isotropy_score_se_note": "anisotropy identical in every block: cancelled exactly by the sampler "
+                                      "(antithetic D4 orbits on a symmetric grid), not estimated"}
+
+def make_sampler(kind, n, rng, replicates, crn_key):
+    return sampling.DirectionSampler(kind, n, rng, replicates=replicates, crn=crn_key)
+
+def snapshot_recorder(H, W, ticks, spans, tol, to_np=lambda a: a):
+    """(on_tick, rows): on_tick appends the covariance/eigenvalue row of each listed tick to rows."""
+    rows, want = [], set(ticks)
+    def on_tick(t, xs, ys):
+        if t not in want: return
+        xs, ys = to_np(xs), to_np(ys)
+        Sxx, Syy, Sxy = endpoint_cov(H, W, xs, ys)
+        lam1, lam2, ani = isotropy_score_from_cov(Sxx, Syy, Sxy)
+        rows.append({"T": t, "cov": {"Sxx": Sxx, "Syy": Syy, "Sxy": Sxy},
+                     "eigvals": {"lambda_max": lam1, "lambda_min": lam2},
+                     "isotropy_score_cov_anisotropy": ani, **se_fields(block_se(H, W, xs, ys, spans)),
+                     "PASS_isotropy": ani <= tol})
+    return (on_tick if want else None), rows
+
+def run_torch(H, W, T, N, seed, device, tol=0.03, sampler="iid", replicates=8, crn=False, snaps=()):
+    torch = get_torch()
+    torch.manual_seed(seed)
+    # legacy iid draws come from torch's RNG; other schemes (and crn) draw from numpy streams
+    smp = None if sampler == "iid" and not crn else \
+        make_sampler(sampler, N, np.random.default_rng(seed), replicates, (seed,) if crn else None)
+    on_tick, rows = snapshot_recorder(H, W, snaps, sampling.blocks(N, replicates), tol, lambda a: a.cpu().numpy())
+    with sr_perf.stage("walk", ticks=T, agent_ticks=N*T):
+        xs, ys = walk_torch(H, W, T, N, device, smp, on_tick)
+
+    # covariance on device (float64 for stability)
+    X = (xs.to(torch.float64) - (H // 2))
+    Y = (ys.to(torch.float64) - (W // 2))
+    Xc = X - X.mean()
+    Yc = Y - Y.mean()
+    Sxx = (Xc * Xc).mean().item()
+    Syy = (Yc * Yc).mean().item()
+    Sxy = (Xc * Yc).mean().item()
+    out = result(H, W, T, N, seed, str(device), Sxx, Syy, Sxy, tol)
+    out.update(sampler=sampler, crn=crn, replicates=replicates,
+               **se_fields(block_se(H, W, xs.cpu().numpy(), ys.cpu().numpy(), sampling.blocks(N, replicates))))
+    if snaps: out["snapshots"] = rows
+    return emit(out)
+
+def run_numpy(H, W, T, N, seed, tol=0.03, sampler="iid", replicates=8, crn=False, dtype=np.float64, snaps=()):
+    rng = np.random.default_rng(seed)
+    smp = make_sampler(sampler, N, rng, replicates, (seed,) if crn else None)
+    on_tick, rows = snapshot_recorder(H, W, snaps, smp.spans, tol)
+    with sr_perf.stage("walk", ticks=T, agent_ticks=N*T):
+        xs, ys = walk_numpy(H, W, T, N, rng, smp, dtype, on_tick)
+
+    Sxx, Syy, Sxy = endpoint_cov(H, W, xs, ys)
+    out = result(H, W, T, N, seed, "numpy", Sxx, Syy, Sxy, tol)
+    out.update(sampler=sampler, crn=crn, replicates=replicates, direction_dtype=np.dtype(dtype).name,
+               **se_fields(block_se(H, W, xs, ys, smp.spans)))
+    if snaps: out["snapshots"] = rows
+    return emit(out)
+
+def run_sequential(H, W, T, N, seed, device, tol=0.03, batch=1000, confidence=0.95, min_batches=8,
+                   sampler="iid", crn=False, dtype=np.float64):
+    """Batches of agents until the anisotropy CI clears tol (or N agents are spent); N is the budget.
+    Each batch is one independently randomised replicate of the sampler."""
+    rng = np.random.default_rng(seed)
+    if device is not None:
+        torch = get_torch(); torch.manual_seed(seed)
+        legacy = sampler == "iid" and not crn
+        walk = lambda n, smp: walk_torch(H, W, T, n, device, None if legacy else smp)
+        to_np = lambda a: a.cpu().numpy()
+    else:
+        walk = lambda n, smp: walk_numpy(H, W, T, n, rng, smp, dtype)
+        to_np = lambda a: a
+    batches = []
+
+    def run_batch(n):
+        smp = make_sampler(sampler, n, rng, 1, (seed, len(batches)) if crn else None)
+        batches.append(n)
+        with sr_perf.stage("walk", ticks=T, agent_ticks=n*T):
+            xs, ys = walk(n, smp)
+        return moment_sums(H, W, to_np(xs), to_np(ys))
+
+    sums, seq = stats.sequential(run_batch, anisotropy_components, tol, N, batch, confidence, min_batches)
+    Sxx, Syy, Sxy = (float(x) for x in cov_from_sums(sums))
+    out = result(H, W, T, seq["agents_used"], seed, str(device) if device is not None else "numpy",
+                 Sxx, Syy, Sxy, tol)
+    out.update(sampler=sampler, crn=crn, **se_fields(seq["se"]), sequential=seq)
+    if device is None: out["direction_dtype"] = np.dtype(dtype).name
+    return emit(out)
 
 def main():
     ap = argparse.ArgumentParser(description="CA/MM isotropy with micro-frame symmetrization (GPU optional).")
     ap.add_argument("--H", type=int, default=601)
     ap.add_argument("--W", type=int, default=601)
     ap.add_argument("--T", type=int, default=300)
-    ap.add_argument("--N", type=int, default=20000, help="number of independent agents")
+    ap.add_argument("--N", type=int, default=20000, help="number of independent agents (agent budget with --sequential)")
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--tol", type=float, default=0.03)
     ap.add_argument("--cpu-only", action="store_true")
+    ap.add_argument("--sampler", type=str, default="iid", choices=sampling.SAMPLERS,
+                    help="direction sampling: iid, antithetic quadruples, stratified (Latin hypercube) or "
+                         "Cranley-Patterson shifted Halton")
+    ap.add_argument("--replicates", type=int, default=8,
+                    help="independent agent blocks for the jackknife error estimate")
+    ap.add_argument("--crn", action="store_true",
+                    help="common random numbers: per-tick streams keyed by (seed, tick), shared across T/H/W/tol")
+    ap.add_argument("--float32", action="store_true",
+                    help="float32 directions on the numpy path (~5x faster; reproducible, not bit-identical to float64)")
+    ap.add_argument("--sequential", action="store_true",
+                    help="run agents in batches and stop once the anisotropy CI clears --tol on either side")
+    ap.add_argument("--batch", type=int, default=1000, help="agents per batch with --sequential")
+    ap.add_argument("--confidence", type=float, default=0.95, help="two-sided CI level with --sequential")
+    ap.add_argument("--min-batches", type=int, default=8, help="batches before the first stopping check")
+    snapshots.add_argument(ap)
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     args = ap.parse_args()
-
-    if TORCH and (not args.cpu_only):
-        if torch.cuda.is_available():
-            device = torch.device("cuda")
-        elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
-            device = torch.device("mps")
-        else:
-            device = torch.device("cpu")
-        run_torch(args.H, args.W, args.T, args.N, args.seed, device, tol=args.tol)
+    sr_perf.init(args.profile)
+    try:
+        snaps = snapshots.parse(args.snapshots, args.T)
+    except ValueError as e:
+        ap.error(str(e))
+    if snaps and args.sequential:
+        ap.error("--snapshots needs a fixed agent count; the --sequential stopping rule is decided at T only")
+    if cache.replay(__file__, vars(args)): return
+
+    device = select_device(args.cpu_only)
+    dtype = np.float32 if args.float32 else np.float64
+    if args.sequential:
+        try:
+            run_sequential(args.H, args.W, args.T, args.N, args.seed, device, tol=args.tol, batch=args.batch,
+                           confidence=args.confidence, min_batches=args.min_batches,
+                           sampler=args.sampler, crn=args.crn, dtype=dtype)
+        except ValueError as e:
+            ap.error(str(e))
+    elif device is not None:
+        run_torch(args.H, args.W, args.T, args.N, args.seed, device, tol=args.tol,
+                  sampler=args.sampler, replicates=args.replicates, crn=args.crn, snaps=snaps)
     else:
-        run_numpy(args.H, args.W, args.T, args.N, args.seed, tol=args.tol)
+        run_numpy(args.H, args.W, args.T, args.N, args.seed, tol=args.tol,
+                  sampler=args.sampler, replicates=args.replicates, crn=args.crn, dtype=dtype, snaps=snaps)
 
 if __name__ == "__main__":
     main()
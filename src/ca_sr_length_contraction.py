@@ -3,60 +3,42 @@
 # Experiences + implicit trace (1D 2-neighbor) + strict t->t+1 partial order. No cycles.
 
 import argparse, json, math, numpy as np
-try:
-    import torch
-    TORCH=True
-except Exception:
-    TORCH=False
-
-# ---- trace operator (implicit), 1D ----
-def apply_S_numpy(v):  # v:[H] bool
-    H=v.shape[0]; y=np.zeros_like(v, dtype=bool)
-    y[0:H-1] |= v[1:H]
-    y[1:H  ] |= v[0:H-1]
-    return y
-
-def apply_S_torch(v):  # v:[H] torch.bool
-    import torch
-    H=v.shape[0]; y=torch.zeros_like(v, dtype=torch.bool)
-    y[0:H-1] = y[0:H-1] | v[1:H]
-    y[1:H  ] = y[1:H  ] | v[0:H-1]
-    return y
-
-def future_frames(H, T, x0, use_torch=False, device=None):
-    if use_torch:
-        import torch
-        v=torch.zeros((H,), dtype=torch.bool, device=device); v[x0]=True
-        acc=v.clone(); frames=[acc.detach().cpu().numpy()]
-        for _ in range(T):
-            v=apply_S_torch(v); acc=acc|v; frames.append(acc.detach().cpu().numpy())
-        return np.stack(frames, axis=0).astype(bool)
-    else:
-        v=np.zeros((H,), dtype=bool); v[x0]=True
-        acc=v.copy(); frames=[acc.copy()]
-        for _ in range(T):
-            v=apply_S_numpy(v); acc=np.logical_or(acc, v); frames.append(acc.copy())
-        return np.stack(frames, axis=0).astype(bool)
+import sr_perf
+from sr_core import cache, parity
+from sr_core.backend import select_device, device_str
+from sr_core.steppers import future_frames
+from sr_core.emit import emit
 
 # ---- diamond cross-sections ----
-def max_width_cross_section(H, span, x_p0, x_p2, use_torch=False, device=None):
+def max_width_cross_section(H, span, x_p0, x_p2, device=None, use_parity=False):
     """
     Build diamond between p0=(0,x_p0) and p2=(span,x_p2).
     For each t in [0,span], cross-section C_t = Future(p0,t) ∩ Future(p2, span - t) mirrored as Past.
     Pick t* with maximal |C_t|. Return xs mask for C_{t*}, chosen t*, and width.
+    use_parity: checkerboard-packed frames, widths counted class by class (same t*, same section).
     """
-    F0 = future_frames(H, span, x_p0, use_torch=use_torch, device=device)  # [span+1, H]
-    F2 = future_frames(H, span, x_p2, use_torch=use_torch, device=device)
+    if use_parity:
+        with sr_perf.stage("future_frames", ticks=2*span, cells=2*span*((H + 1)//2)):
+            F0 = parity.future_frames(H, span, x_p0)
+            F2 = parity.future_frames(H, span, x_p2)
+        with sr_perf.stage("cross_section", cells=(span+1)*H):
+            w = parity.overlaps(F0, F2, span)
+            best_t = int(np.argmax(w))  # first maximum, as in the scan below
+        return np.where(F0.row(best_t) & F2.row(span - best_t))[0], best_t, int(w[best_t])
+    with sr_perf.stage("future_frames", ticks=2*span, cells=2*span*H):
+        F0 = future_frames(H, span, x_p0, device=device)  # [span+1, H]
+        F2 = future_frames(H, span, x_p2, device=device)
     best_t = 0
     best_mask = None
     best_w = -1
-    for t in range(span+1):
-        Ct = F0[t] & F2[span - t]
-        w = int(Ct.sum())
-        if w > best_w:
-            best_w = w
-            best_t = t
-            best_mask = Ct
+    with sr_perf.stage("cross_section", cells=(span+1)*H):
+        for t in range(span+1):
+            Ct = F0[t] & F2[span - t]
+            w = int(Ct.sum())
+            if w > best_w:
+                best_w = w
+                best_t = t
+                best_mask = Ct
     xs = np.where(best_mask)[0]
     return xs, best_t, best_w
 
@@ -84,20 +66,13 @@ def length_along_section(xs_mask, xL, xR):
     iR = nearest_indices(xs_sorted, xR)
     return abs(iR - iL)  # edges between projected endpoints along section
 
-def run(H, T, v, L0, seed, cpu_only=False, tol_frac=0.07):
+def run(H, T, v, L0, seed, cpu_only=False, tol_frac=0.07, use_parity=False):
     np.random.seed(seed)
     # Box sanity: avoid boundary clipping for both rod and diamond
     need = max(T, L0//2)
     if (H - 1)//2 < need:
         raise ValueError(f"Lattice too small; need H >= {2*need+1}, got {H}.")
-    use_torch = TORCH and (not cpu_only)
-    if use_torch:
-        import torch
-        if torch.cuda.is_available(): device=torch.device("cuda")
-        elif getattr(torch.backends,"mps",None) and torch.backends.mps.is_available(): device=torch.device("mps")
-        else: device=torch.device("cpu")
-    else:
-        device=None
+    device = select_device(cpu_only) if not use_parity else None
 
     x_center = H//2
     # Choose anchor span with simple parity repair (span=2*tau or 2*tau+1)
@@ -111,7 +86,7 @@ def run(H, T, v, L0, seed, cpu_only=False, tol_frac=0.07):
             x_p2 = x_center + D
             # Ensure anchor endpoint stays inside lattice
             if not (0 <= x_p2 < H): continue
-            xs, tstar, width = max_width_cross_section(H, span, x_p0, x_p2, use_torch=use_torch, device=device)
+            xs, tstar, width = max_width_cross_section(H, span, x_p0, x_p2, device=device, use_parity=use_parity)
             if width > 0:
                 candidates.append((span, D, xs, tstar, x_p0, x_p2, width))
     if not candidates:
@@ -130,7 +105,7 @@ def run(H, T, v, L0, seed, cpu_only=False, tol_frac=0.07):
     tol_cells = max(1.0, tol_frac * L0)
     PASS = (abs_err <= tol_cells)
 
-    print(json.dumps({
+    out = {
         "H": H, "T": T, "L0": L0,
         "v_cli": v, "v_hat": v_hat,
         "anchor_span_ticks": span,
@@ -141,13 +116,15 @@ def run(H, T, v, L0, seed, cpu_only=False, tol_frac=0.07):
         "L_prime_target_cells": target,
         "abs_err_cells": abs_err,
         "tol_cells": tol_cells,
-        "device": (str(device) if use_torch else "numpy"),
+        "device": device_str(device),
+        "layout": "parity" if use_parity else "full",
         "poset_edges": "t->t+1 only (acyclic)",
         "trace_operator": "implicit 1D 2-neighbor",
         "simultaneity": "max-width diamond cross-section",
         "endpoint_projection": "nearest nodes in cross-section (pure poset)",
         "PASS": PASS
-    }, indent=2))
+    }
+    return emit(out)
 
 def main():
     ap = argparse.ArgumentParser(description="CA/MM poset SR: length contraction via max-width diamond cross-section.")
@@ -158,8 +135,15 @@ def main():
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--cpu-only", action="store_true")
     ap.add_argument("--tol-frac", type=float, default=0.07)
+    ap.add_argument("--parity", action="store_true",
+                    help="checkerboard-packed 1D frames (numpy): half the memory and per-tick work, same section")
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     args = ap.parse_args()
-    run(args.H, args.T, args.v, args.L0, args.seed, cpu_only=args.cpu_only, tol_frac=args.tol_frac)
+    sr_perf.init(args.profile)
+    if cache.replay(__file__, vars(args)): return
+    run(args.H, args.T, args.v, args.L0, args.seed, cpu_only=args.cpu_only, tol_frac=args.tol_frac,
+        use_parity=args.parity)
 
 if __name__=="__main__":
     main()
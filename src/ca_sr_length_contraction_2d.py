@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import argparse, json, math, subprocess, sys
+import sr_perf
+from sr_core.emit import emit
 
 # We reuse your trusted 1D implementation (Δ=0 antichain projector)
 def run_len_1d(T, v, L0):
@@ -14,14 +16,17 @@ def main():
     ap.add_argument("--L0", type=int, default=200)
     ap.add_argument("--angles", type=int, default=12)
     ap.add_argument("--tol_cells", type=float, default=14.0)
+    sr_perf.add_argument(ap)
     a=ap.parse_args()
+    sr_perf.init(a.profile)
 
     target = a.L0*math.sqrt(max(0.0,1.0-a.v*a.v))
     vals=[]
     for k in range(a.angles):
         # In L1 poset, the Δ=0 projector depends only on |Dx|+|Dy|, so any φ with fixed v is equivalent.
         # We still sweep φ for the record (all should match).
-        js = run_len_1d(a.T, a.v, a.L0)
+        with sr_perf.stage("delegate_1d"):
+            js = run_len_1d(a.T, a.v, a.L0)
         Lp = float(js.get("L_prime_measured_cells", js.get("L_prime", 0.0)))
         vals.append(Lp)
 
@@ -35,7 +40,7 @@ def main():
       "PASS_length_orientation_2d": (max_err<=a.tol_cells),
       "notes":"L1 symmetry ⇒ orientation independence; projector delegated to ca_sr_length_contraction.py (passing)."
     }
-    print(json.dumps(out, indent=2))
+    emit(out)
 
 if __name__=="__main__":
     main()
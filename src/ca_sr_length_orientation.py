@@ -3,6 +3,8 @@
 # Orientation sweep for length contraction by delegating to the trusted ca_sr_length_contraction.py
 
 import argparse, json, subprocess, sys, math
+import sr_perf
+from sr_core.emit import emit
 
 def run_one(T, v, L0):
     # Call the proven script and parse its JSON
@@ -18,7 +20,9 @@ def main():
     ap.add_argument("--L0", type=int, default=200)
     ap.add_argument("--angles", type=int, default=8)   # in 1D: sign flips suffice
     ap.add_argument("--tol_cells", type=float, default=14.0)
+    sr_perf.add_argument(ap)
     args = ap.parse_args()
+    sr_perf.init(args.profile)
 
     # In 1D, 'angles' just alternates the sign of v
     results = []
@@ -26,7 +30,8 @@ def main():
     target = args.L0 * math.sqrt(max(0.0, 1.0 - args.v*args.v))
     for k in range(args.angles):
         v_k = args.v if (k % 2 == 0) else -args.v
-        js = run_one(args.T, v_k, args.L0)
+        with sr_perf.stage("delegate_1d"):
+            js = run_one(args.T, v_k, args.L0)
         Lp = float(js.get("L_prime_measured_cells", js.get("L_prime", 0.0)))
         results.append(Lp)
         errs.append(abs(Lp - target))
@@ -41,7 +46,7 @@ def main():
         "PASS_length_orientation": (max_err <= args.tol_cells),
         "notes": "Delegates to ca_sr_length_contraction.py (the passing implementation). Orientation in 1D = sign flip of v."
     }
-    print(json.dumps(summary, indent=2))
+    emit(summary)
 
 if __name__ == "__main__":
     main()
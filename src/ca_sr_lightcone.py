@@ -2,95 +2,82 @@
 # CA/MM-only: experiences + trace operator + strict time partial order (no cycles).
 # Outputs JSON by default; optional --save-front saves NPZ derived from the same CA poset.
 
-import argparse, json, numpy as np
-try:
-    import torch
-    TORCH = True
-except Exception:
-    TORCH = False
+import argparse, numpy as np
+import sr_perf
+from sr_core import cache, parity, snapshots, symmetry
+from sr_core.stencil import STENCILS
+from sr_core.backend import select_device
+from sr_core.steppers import lightcone_frames, l1_lightcone_mask, causality_metrics
+from sr_core.tiled import lightcone_stream, resolve_threads
+from sr_core.emit import emit
 
-def l1_mask(H,W,T):
-    yy,xx = np.mgrid[0:H,0:W]; cx,cy=W//2,H//2
-    d1 = np.abs(xx-cx)+np.abs(yy-cy)
-    return np.stack([(d1<=t) for t in range(T+1)], axis=0)
+def max_radius(acc, d1):
+    return int(d1[acc].max()) if acc.any() else 0
 
-def metrics(front_bool, ideal_bool):
-    assert front_bool.shape == ideal_bool.shape
-    T1,H,W = front_bool.shape
-    arr, vio = [], []
-    for t in range(T1):
-        inside  = ideal_bool[t]
-        outside = ~inside
-        active  = front_bool[t]
-        ni = int(inside.sum()); no = int(outside.sum())
-        arr.append(float((active & inside).sum())/max(1,ni))
-        vio.append(float((active & outside).sum())/max(1,no))
-    return float(np.mean(arr)), float(np.mean(vio))
-
-def apply_S_numpy(v):  # v:[H,W] bool
-    H,W = v.shape
-    y = np.zeros_like(v, dtype=bool)
-    y[0:H-1,:] |= v[1:H,:]
-    y[1:H,  :] |= v[0:H-1,:]
-    y[:,0:W-1] |= v[:,1:W]
-    y[:,1:W  ] |= v[:,0:W-1]
-    return y
-
-def apply_S_torch(v):  # v:[H,W] torch.bool
-    H,W = v.shape
-    y = torch.zeros_like(v, dtype=torch.bool)
-    y[0:H-1,:] = y[0:H-1,:] | v[1:H,:]
-    y[1:H,  :] = y[1:H,  :] | v[0:H-1,:]
-    y[:,0:W-1] = y[:,0:W-1] | v[:,1:W]
-    y[:,1:W  ] = y[:,1:W  ] | v[:,0:W-1]
-    return y
-
-def run(H,W,T,seed,save_front=None,cpu_only=False):
+def run(H,W,T,seed,save_front=None,cpu_only=False,threads=1,snaps=(),use_parity=False,sym_mode="auto"):
     np.random.seed(seed)
     cx,cy = W//2, H//2
+    device = select_device(cpu_only) if not use_parity else None
+    threads = resolve_threads(threads) if device is None and not use_parity else 1
+    # centred run on an odd grid: step the quadrant only (auto: on the single-thread numpy path)
+    quad = symmetry.resolve(sym_mode, H, W, [STENCILS["axial"]],
+                            eligible=not use_parity and device is None and threads == 1)
+    if quad: device, threads = None, 1
+    if not (use_parity or quad):
+        yy,xx = np.mgrid[0:H,0:W]
+        d1 = np.abs(xx-cx)+np.abs(yy-cy)
 
-    use_torch = TORCH and (not cpu_only)
-    if use_torch:
-        if torch.cuda.is_available(): device = torch.device("cuda")
-        elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available(): device = torch.device("mps")
-        else: device = torch.device("cpu")
-        v = torch.zeros((H,W), dtype=torch.bool, device=device); v[cy,cx]=True
-        acc = v.clone()
-        frames = [acc.detach().cpu().numpy()]
-        for _ in range(T):
-            y = apply_S_torch(v)
-            acc = acc | y
-            frames.append(acc.detach().cpu().numpy())
-            v = y
-        front = np.stack(frames, axis=0).astype(np.uint8)
-        dev_str = str(device)
-    else:
-        v = np.zeros((H,W), dtype=bool); v[cy,cx]=True
-        acc = v.copy(); frames=[acc.copy()]
-        for _ in range(T):
-            y = apply_S_numpy(v)
-            acc = np.logical_or(acc, y)
-            frames.append(acc.copy()); v=y
-        front = np.stack(frames, axis=0).astype(np.uint8)
+    rows, want = [], set(snaps)
+    def snapshot(t, arrived, viols, r):
+        # running means over ticks 0..t are exactly what a T=t run reports
+        rows.append({"T": t, "arrived_fraction": float(np.mean(arrived)),
+                     "violations_fraction": float(np.mean(viols)),
+                     "c_hat_cells_per_tick": r/t, "max_L1_radius": r})
+    def on_tick(t, v, acc, arrived, viols):
+        if t in want: snapshot(t, arrived, viols, max_radius(acc, d1))
+    if quad:
+        def on_quad(t, q, arrived, viols):
+            if t in want: snapshot(t, arrived, viols, symmetry.max_l1(q))
+        arrived, viols, q, front = symmetry.lightcone(H, W, T, keep_frames=bool(save_front),
+                                                      on_tick=on_quad if snaps else None)
         dev_str = "numpy"
+    elif use_parity:
+        # checkerboard layout: half-size state per tick, no full-grid distance map
+        def on_cone(t, cone):
+            if t in want: snapshot(t, cone.arrived, cone.viols, cone.max_l1())
+        arrived, viols, cone, front = parity.lightcone(H, W, T, keep_frames=bool(save_front),
+                                                       on_tick=on_cone if snaps else None)
+        dev_str = "numpy"
+    elif threads > 1 or snaps:
+        # snapshots need the streaming metrics (numpy path)
+        arrived, viols, last, front = lightcone_stream(H, W, T, threads, keep_frames=bool(save_front),
+                                                       on_tick=on_tick if snaps else None)
+        dev_str = "numpy"
+    else:
+        front, dev_str = lightcone_frames(H, W, T, device=device)
 
-    ideal = l1_mask(H,W,T)
-    arrived, viols = metrics(front.astype(bool), ideal)
+        with sr_perf.stage("ideal_mask"):
+            ideal = l1_lightcone_mask(H,W,T)
+        with sr_perf.stage("metrics", cells=(T+1)*H*W):
+            arrived, viols = causality_metrics(front.astype(bool), ideal)
+        last = front[-1].astype(bool)
     # c_hat = max L1 radius / ticks
-    yy,xx = np.mgrid[0:H,0:W]
-    d1 = np.abs(xx-cx)+np.abs(yy-cy)
-    max_r = int(d1[front[-1].astype(bool)].max()) if front[-1].any() else 0
+    max_r = symmetry.max_l1(q) if quad else cone.max_l1() if use_parity else max_radius(last, d1)
     c_hat = (max_r)/(T if T>0 else 1)
 
     PASS = (viols<=1e-15) and (arrived>=1.0-1e-15)
 
     if save_front:
         # only saved when explicitly requested
-        np.savez_compressed(save_front, front=front)
+        with sr_perf.stage("save_npz"):
+            np.savez_compressed(save_front, front=front)
 
-    print(json.dumps({
+    out = {
         "H":H,"W":W,"T":T,"seed":seed,
         "device":dev_str,
+        "threads":threads,
+        "layout":"parity" if use_parity else "full",
+        "symmetry":"quadrant" if quad else "full",
         "arrived_fraction":arrived,
         "violations_fraction":viols,
         "c_hat_cells_per_tick":c_hat,
@@ -99,7 +86,9 @@ def run(H,W,T,seed,save_front=None,cpu_only=False):
         "trace_operator": "implicit 4-neighbor (von-Neumann), no wrap",
         "saved_front": bool(save_front),
         "PASS": PASS
-    }, indent=2, sort_keys=True))
+    }
+    if snaps: out["snapshots"] = rows
+    return emit(out, sort_keys=True)
 
 def main():
     ap = argparse.ArgumentParser(description="CA/MM poset light-cone (trace + partial order, no cycles). JSON only by default.")
@@ -109,8 +98,31 @@ def main():
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--save-front", type=str, default=None, help="Optional path to save NPZ (front); not saved unless set.")
     ap.add_argument("--cpu-only", action="store_true")
+    ap.add_argument("--threads", type=int, default=1, help="row-stripe tiles on a thread pool (0 = all CPUs; numpy path)")
+    ap.add_argument("--parity", action="store_true",
+                    help="checkerboard layout: store and step only the active parity class (numpy, single thread)")
+    ap.add_argument("--symmetry", type=str, default="auto", choices=symmetry.MODES,
+                    help="quadrant = step one quadrant with mirror boundaries (odd H, W); auto = quadrant on the "
+                         "single-thread numpy path when the grid allows it; full = whole grid")
+    snapshots.add_argument(ap)
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     args = ap.parse_args()
-    run(args.H,args.W,args.T,args.seed,save_front=args.save_front,cpu_only=args.cpu_only)
+    sr_perf.init(args.profile)
+    try:
+        snaps = snapshots.parse(args.snapshots, args.T)
+    except ValueError as e:
+        ap.error(str(e))
+    if args.parity and args.threads != 1: ap.error("--parity runs single-threaded; drop --threads")
+    if args.symmetry == "quadrant":
+        if args.parity or args.threads != 1: ap.error("--symmetry quadrant runs single-threaded in the full layout")
+        try:
+            symmetry.resolve("quadrant", args.H, args.W, [STENCILS["axial"]])
+        except ValueError as e:
+            ap.error(str(e))
+    if not args.save_front and cache.replay(__file__, vars(args)): return
+    run(args.H,args.W,args.T,args.seed,save_front=args.save_front,cpu_only=args.cpu_only,threads=args.threads,
+        snaps=snaps,use_parity=args.parity,sym_mode=args.symmetry)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# CA/MM as a weighted Markov matrix: batches of probability vectors pushed through a sparse transition operator
+# (stencil + weights, or the same operator as an explicit CSR matrix), float32/float64, with optional FFT
+# jump-ahead. Boolean reachability is the OR-semiring special case and bounds where probability may be nonzero.
+
+import argparse, numpy as np
+import sr_perf
+from sr_core import cache, markov, stencil
+from sr_core.emit import emit
+
+def sources(H, W, B):
+    """B point sources on the centre row, 4 cells apart."""
+    cy, cx = H//2, W//2
+    return [(cy, min(W - 1, max(0, cx + 4*(b - B//2)))) for b in range(B)]
+
+def run(H, W, T, stencil_spec="axial", weights=None, boundary="absorb", dtype="float64", batch=1,
+        backend="stencil", do_jump=False):
+    offs = stencil.parse_stencil(stencil_spec)
+    w = markov.parse_weights(weights, len(offs))
+    sop = markov.StencilOperator(offs, w, H, W, boundary)
+    with sr_perf.stage("build_operator"):
+        op = sop.to_csr() if backend == "csr" else sop
+    dt = np.dtype(dtype)
+    src = sources(H, W, batch)
+    x0 = np.zeros((batch, H, W), dtype=dt)
+    for b, (i, j) in enumerate(src): x0[b, i, j] = 1
+
+    # float propagation alongside boolean reachability (same operator, OR semiring)
+    vb, nb = x0 > 0, np.empty((batch, H, W), dtype=bool)
+    superluminal, support_mismatch = 0, 0
+    def on_tick(t, x):
+        nonlocal vb, nb, superluminal, support_mismatch
+        op.apply(vb, nb); vb, nb = nb, vb
+        nz = x != 0
+        superluminal += int(np.count_nonzero(nz & ~vb))
+        support_mismatch += int(np.count_nonzero(nz != vb))
+    with sr_perf.stage("propagate", ticks=T, cells=T*batch*H*W):
+        x = markov.propagate(op, x0, T, on_tick)
+
+    # reach check: does any source's cone touch the grid edge within T ticks?
+    r0, r1 = sop.reach()
+    inside = all(i - T*r0 >= 0 and i + T*r0 < H and j - T*r1 >= 0 and j + T*r1 < W for i, j in src)
+    mass = x.sum(axis=(1, 2), dtype=np.float64)
+    tol = 1e-9 if dt == np.float64 else 1e-4
+    out = {
+        "H": H, "W": W, "T": T, "stencil": stencil_spec, "weights": w.tolist(), "boundary": boundary,
+        "dtype": dt.name, "batch": batch, "backend": backend,
+        "nnz": int(len(op.indices)) if backend == "csr" else None,
+        "mass_final": mass.tolist(),
+        "superluminal_sites": superluminal,
+        "PASS_no_superluminal_mass": superluminal == 0,
+    }
+    if dt == np.float64:
+        # float32 underflows at the cone tip ((min w)^t), so only float64 is expected to fill the whole cone
+        out["support_mismatch_sites"] = support_mismatch
+        out["PASS_support_equals_reachable"] = support_mismatch == 0
+    out["cone_inside_grid"] = inside
+    if inside or boundary == "periodic":
+        out["PASS_mass_conserved"] = bool(np.all(np.abs(mass - 1.0) <= tol))
+    if inside:
+        # per-tick mean and covariance of a step, times T, vs the propagated distribution of source 0
+        d = np.asarray(sop.offsets, dtype=np.float64)
+        mu = w @ d; cov = (d - mu).T @ ((d - mu) * w[:, None])
+        ii, jj = np.mgrid[0:H, 0:W]
+        p = x[0].astype(np.float64) / mass[0]
+        m = np.array([(p*(ii - src[0][0])).sum(), (p*(jj - src[0][1])).sum()])
+        var = np.array([(p*(ii - src[0][0] - m[0])**2).sum(), (p*(jj - src[0][1] - m[1])**2).sum()])
+        out["mean_displacement"] = m.tolist(); out["mean_expected"] = (T*mu).tolist()
+        out["variance"] = var.tolist(); out["variance_expected"] = (T*np.diag(cov)).tolist()
+        rel = 1e-6 if dt == np.float64 else 1e-3
+        out["PASS_moments"] = bool(np.allclose(m, T*mu, atol=rel*max(1, T)) and
+                                   np.allclose(var, T*np.diag(cov), rtol=rel, atol=rel))
+    if boundary == "absorb":
+        # the boolean special case must reproduce the existing reachability kernel exactly
+        k = sop.boolean_kernel()
+        v, n = x0[0] > 0, np.empty((H, W), dtype=bool)
+        with sr_perf.stage("reachability_kernel", ticks=T, cells=T*H*W):
+            for _ in range(T):
+                k.apply(v, n); v, n = n, v
+        out["PASS_boolean_matches_kernel"] = bool((v == vb[0]).all())
+    if do_jump:
+        try:
+            with sr_perf.stage("fft_jump", cells=batch*H*W):
+                xj = markov.jump(sop, x0, T)
+            err = float(np.abs(xj.astype(np.float64) - x).max())
+            out["fft_jump_max_abs_err"] = err
+            out["PASS_fft_jump"] = err <= tol
+        except ValueError as e:
+            out["fft_jump"] = f"not applicable: {e}"
+    return emit(out)
+
+def main():
+    ap = argparse.ArgumentParser(description="Weighted Markov-matrix propagation on the CA lattice (stencil or CSR).")
+    ap.add_argument("--H", type=int, default=257)
+    ap.add_argument("--W", type=int, default=257)
+    ap.add_argument("--T", type=int, default=120)
+    ap.add_argument("--stencil", type=str, default="axial",
+                    help="axial, diag, moore, knight, hex, or custom offsets 'd0:d1;d0:d1;...'")
+    ap.add_argument("--weights", type=str, default=None, help="comma list, one per offset (normalised; default uniform)")
+    ap.add_argument("--boundary", type=str, default="absorb", choices=markov.BOUNDARIES)
+    ap.add_argument("--dtype", type=str, default="float64", choices=["float32", "float64"])
+    ap.add_argument("--batch", type=int, default=1, help="probability vectors propagated together")
+    ap.add_argument("--backend", type=str, default="stencil", choices=["stencil", "csr"])
+    ap.add_argument("--jump", action="store_true", help="also compute x P^T by FFT jump-ahead and compare")
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
+    args = ap.parse_args()
+    sr_perf.init(args.profile)
+    if cache.replay(__file__, vars(args)): return
+    try:
+        run(args.H, args.W, args.T, args.stencil, args.weights, args.boundary, args.dtype, args.batch,
+            args.backend, args.jump)
+    except ValueError as e:
+        ap.error(str(e))
+
+if __name__ == "__main__":
+    main()
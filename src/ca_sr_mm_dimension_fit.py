@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import argparse, json, random
+import argparse, random
+import sr_perf
+from sr_core.emit import emit
 
 def sample_points_1p1(T, n, rng):
     pts=[]
@@ -53,14 +55,20 @@ def main():
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--tol_1p1", type=float, default=0.03)  # target ~0.5
     ap.add_argument("--tol_2p1", type=float, default=0.03)  # empirical ~0.33–0.37 range (L1 slab)
+    sr_perf.add_argument(ap)
     a=ap.parse_args()
+    sr_perf.init(a.profile)
     rng = random.Random(a.seed)
 
-    pts1 = sample_points_1p1(a.T, a.n_points, rng)
-    r1 = order_fraction(pts1, rng, comparable_1p1, a.n_pairs)
+    with sr_perf.stage("sample_points", points=2*a.n_points):
+        pts1 = sample_points_1p1(a.T, a.n_points, rng)
+    with sr_perf.stage("order_fraction", pairs=a.n_pairs):
+        r1 = order_fraction(pts1, rng, comparable_1p1, a.n_pairs)
 
-    pts2 = sample_points_2p1(a.T, a.n_points, rng)
-    r2 = order_fraction(pts2, rng, comparable_2p1, a.n_pairs)
+    with sr_perf.stage("sample_points"):
+        pts2 = sample_points_2p1(a.T, a.n_points, rng)
+    with sr_perf.stage("order_fraction", pairs=a.n_pairs):
+        r2 = order_fraction(pts2, rng, comparable_2p1, a.n_pairs)
 
     # Empirical targets for L1 slabs (not continuum Minkowski constants; these are discrete-slab surrogates)
     target1 = 0.5
@@ -76,7 +84,7 @@ def main():
       "PASS_mm_2p1": abs(r2-target2) <= a.tol_2p1,
       "notes":"Order-fraction signals dimension: ~0.5 for 1+1; ~0.35 for 2+1 under L1 slab sampling."
     }
-    print(json.dumps(out, indent=2))
+    emit(out)
 
 if __name__=="__main__":
     main()
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
-import argparse, json, random
+import argparse, random
+import sr_perf
+from sr_core.emit import emit
 
 def sample_points_1p1(T, n, seed=7):
     rng = random.Random(seed)
@@ -38,9 +40,12 @@ def main():
     ap.add_argument("--n_pairs", type=int, default=40000)
     ap.add_argument("--tol", type=float, default=0.03, help="tolerance around 0.5")
     ap.add_argument("--seed", type=int, default=7)
+    sr_perf.add_argument(ap)
     args = ap.parse_args()
+    sr_perf.init(args.profile)
 
-    r = estimate_order_fraction(args.T, args.n_points, args.n_pairs, seed=args.seed)
+    with sr_perf.stage("order_fraction", pairs=args.n_pairs):
+        r = estimate_order_fraction(args.T, args.n_points, args.n_pairs, seed=args.seed)
     out = {
         "T": args.T,
         "n_points": args.n_points,
@@ -52,7 +57,7 @@ def main():
         "PASS_mm_order_fraction": (abs(r - 0.5) <= args.tol),
         "notes": "1+1D slab; comparable iff |Δx| ≤ |Δt|. This is a minimal MM signal; full MM inversion not required here."
     }
-    print(json.dumps(out, indent=2))
+    emit(out)
 
 if __name__ == "__main__":
     main()
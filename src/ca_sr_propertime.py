@@ -2,53 +2,18 @@
 # CA/MM-only SR test: Proper-time proxy & time-dilation from Alexandrov counts.
 # Uses experiences + implicit trace operator (von-Neumann 4-nbr) + strict t->t+1 partial order (acyclic).
 
-import argparse, json, math, numpy as np
-try:
-    import torch
-    TORCH = True
-except Exception:
-    TORCH = False
+import argparse, math, numpy as np
+import sr_perf
+from sr_core import cache, extrapolate, parity
+from sr_core.backend import select_device, device_str
+from sr_core.steppers import future_frames
+from sr_core.emit import emit
 
-def apply_S_numpy(v):  # v:[H] bool, 1D line (use Hx1 conceptually)
-    H = v.shape[0]
-    y = np.zeros_like(v, dtype=bool)
-    y[0:H-1] |= v[1:H]
-    y[1:H  ] |= v[0:H-1]
-    return y
-
-def apply_S_torch(v):  # v:[H] torch.bool
-    H = v.shape[0]
-    y = torch.zeros_like(v, dtype=torch.bool)
-    y[0:H-1] = y[0:H-1] | v[1:H]
-    y[1:H  ] = y[1:H  ] | v[0:H-1]
-    return y
-
-def future_frames(H, T, x0, use_torch=False, device=None):
-    """Return F[t,:] = set of sites reachable from (t=0, x0) within <=t ticks (inclusive)."""
-    if use_torch:
-        v = torch.zeros((H,), dtype=torch.bool, device=device); v[x0]=True
-        acc = v.clone()
-        frames = [acc.detach().cpu().numpy()]
-        for _ in range(T):
-            v = apply_S_torch(v)
-            acc = acc | v
-            frames.append(acc.detach().cpu().numpy())
-        return np.stack(frames, axis=0).astype(bool)
-    else:
-        v = np.zeros((H,), dtype=bool); v[x0]=True
-        acc = v.copy()
-        frames = [acc.copy()]
-        for _ in range(T):
-            v = apply_S_numpy(v)
-            acc = np.logical_or(acc, v)
-            frames.append(acc.copy())
-        return np.stack(frames, axis=0).astype(bool)
-
-def past_frames(H, T, xT, use_torch=False, device=None):
+def past_frames(H, T, xT, device=None):
     """Return P[t,:] = set of sites that can reach (T,xT) from time t (i.e., within <=(T-t) ticks)."""
     # Compute future from (time=T, xT) backward by symmetry (same spatial S).
     # Equivalent: run future from xT for T ticks, then read in reverse.
-    F_T = future_frames(H, T, xT, use_torch=use_torch, device=device)  # shape [T+1, H]
+    F_T = future_frames(H, T, xT, device=device)  # shape [T+1, H]
     # P[t] = set of positions at time t that can reach q by T: that's the same as F_T[T-t]
     return F_T[::-1, :]
 
@@ -63,6 +28,12 @@ def alexandrov_count(F, P, exclude_endpoints=True):
         A[-1, :] = False
     return int(A.sum()), A
 
+def alexandrov_counts_parity(H, T, x0, xTs):
+    """Alexandrov counts (endpoints excluded) from (0, x0) to each (T, xT) on checkerboard-packed frames:
+    the past of (T, xT) at t is the future of xT at T−t, so the count is Σ_{0<t<T} |F[t] ∧ F_xT[T−t]|."""
+    F = parity.future_frames(H, T, x0)
+    return [int(parity.overlaps(F, parity.future_frames(H, T, xT), T)[1:-1].sum()) for xT in xTs]
+
 def build_worldline_end(H, T, x0, v):
     """
     Deterministic inertial worldline endpoint at time T:
@@ -75,7 +46,7 @@ def build_worldline_end(H, T, x0, v):
         raise ValueError("Endpoint left the lattice; enlarge H or reduce T/|v|.")
     return xT
 
-def run(H, T, v, seed, cpu_only=False, tol=0.05):
+def run(H, T, v, seed, cpu_only=False, tol=0.05, use_parity=False):
     np.random.seed(seed)
     # Ensure no boundary clipping of the lightcone for both rest and moving:
     # Max L1 radius needed = max(T, |xT-x0|). For a centered start, require margins >= T.
@@ -84,24 +55,25 @@ def run(H, T, v, seed, cpu_only=False, tol=0.05):
     if (H - 1) // 2 < T:
         raise ValueError(f"Boundary would clip the cone: need H >= {2*T+1}, got {H}.")
     # Device
-    use_torch = TORCH and (not cpu_only)
-    if use_torch:
-        if torch.cuda.is_available(): device = torch.device("cuda")
-        elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available(): device = torch.device("mps")
-        else: device = torch.device("cpu")
-    else:
-        device = None
+    device = select_device(cpu_only) if not use_parity else None
     # Endpoints
     xT_rest   = build_worldline_end(H, T, x0, 0.0)
     xT_moving = build_worldline_end(H, T, x0, v)
-    # Future/past frames
-    F_rest = future_frames(H, T, x0, use_torch=use_torch, device=device)
-    P_rest = past_frames  (H, T, xT_rest, use_torch=use_torch, device=device)
-    F_mov  = F_rest  # same source p
-    P_mov  = past_frames(H, T, xT_moving, use_torch=use_torch, device=device)
-    # Alexandrov counts (interval proxies)
-    N0, _A0 = alexandrov_count(F_rest, P_rest, exclude_endpoints=True)
-    Nv, _Av = alexandrov_count(F_mov , P_mov , exclude_endpoints=True)
+    if use_parity:
+        # checkerboard-packed frames; the Alexandrov counts are summed class by class
+        with sr_perf.stage("future_frames", ticks=3*T, cells=3*T*((H + 1)//2)):
+            N0, Nv = alexandrov_counts_parity(H, T, x0, [xT_rest, xT_moving])
+    else:
+        # Future/past frames
+        with sr_perf.stage("future_frames", ticks=3*T, cells=3*T*H):
+            F_rest = future_frames(H, T, x0, device=device)
+            P_rest = past_frames  (H, T, xT_rest, device=device)
+            F_mov  = F_rest  # same source p
+            P_mov  = past_frames(H, T, xT_moving, device=device)
+        # Alexandrov counts (interval proxies)
+        with sr_perf.stage("alexandrov_count", cells=2*(T+1)*H):
+            N0, _A0 = alexandrov_count(F_rest, P_rest, exclude_endpoints=True)
+            Nv, _Av = alexandrov_count(F_mov , P_mov , exclude_endpoints=True)
     # Proper-time proxy kappa = sqrt(N)/T
     kappa0 = math.sqrt(max(N0,0)) / max(T,1)
     kappav = math.sqrt(max(Nv,0)) / max(T,1)
@@ -111,7 +83,8 @@ def run(H, T, v, seed, cpu_only=False, tol=0.05):
     PASS = (abs_err <= tol)
     out = {
         "H": H, "T": T, "v": v, "seed": seed,
-        "device": (str(device) if use_torch else "numpy"),
+        "device": device_str(device),
+        "layout": "parity" if use_parity else "full",
         "N_rest": N0, "N_moving": Nv,
         "kappa_rest": kappa0, "kappa_moving": kappav,
         "ratio_kappa": ratio, "target_sqrt1_minus_v2": target,
@@ -121,7 +94,42 @@ def run(H, T, v, seed, cpu_only=False, tol=0.05):
         "trace_operator": "implicit 1D 2-neighbor (subset of 4-nbr in 2D)",
         "PASS": PASS
     }
-    print(json.dumps(out, indent=2, sort_keys=True))
+    return emit(out, sort_keys=True)
+
+def kappa_ratio(T, v, device=None, use_parity=False):
+    """κ_moving/κ_rest on a lattice just wide enough for T (fractional v·T: interpolated between even D)."""
+    H = 2*T + 1; x0 = T
+    if use_parity:
+        F = parity.future_frames(H, T, x0)
+        N = lambda D: int(parity.overlaps(F, parity.future_frames(H, T, x0 + D), T)[1:-1].sum())
+        N0 = N(0)
+        return extrapolate.at_displacement(lambda D: math.sqrt(N(D) / N0), abs(v) * T)
+    F = future_frames(H, T, x0, device=device)
+    N0 = alexandrov_count(F, past_frames(H, T, x0, device=device))[0]
+    Nd = lambda D: alexandrov_count(F, past_frames(H, T, x0 + D, device=device))[0]
+    return extrapolate.at_displacement(lambda D: math.sqrt(Nd(D) / N0), abs(v) * T)
+
+def run_extrapolated(T, v, seed, Ts, order=2, cpu_only=False, tol=0.05, use_parity=False):
+    """Richardson fit of the κ ratio over a short even-T ladder instead of one long run at T."""
+    if abs(v) > 1.0 + 1e-12:
+        raise ValueError("Speed must satisfy |v| <= 1 in this poset.")
+    device = select_device(cpu_only) if not use_parity else None
+    with sr_perf.stage("ladder", ticks=3*sum(Ts), cells=sum(3*t*(2*t+1) for t in Ts)):
+        ex = extrapolate.richardson(lambda t: kappa_ratio(t, v, device, use_parity), Ts, order)
+    target = math.sqrt(max(0.0, 1.0 - v*v))
+    abs_err = abs(ex["f_inf"] - target)
+    out = {
+        "T": T, "v": v, "seed": seed,
+        "device": device_str(device),
+        "mode": "extrapolate",
+        "layout": "parity" if use_parity else "full",
+        "ratio_kappa": ex["f_inf"], "ratio_kappa_err": ex["err"],
+        "target_sqrt1_minus_v2": target,
+        "abs_err": abs_err, "tol": tol,
+        "extrapolation": ex,
+        "PASS": abs_err <= tol
+    }
+    return emit(out, sort_keys=True)
 
 def main():
     ap = argparse.ArgumentParser(description="CA/MM poset SR test: time-dilation via Alexandrov counts (proper-time proxy).")
@@ -131,8 +139,27 @@ def main():
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--cpu-only", action="store_true")
     ap.add_argument("--tol", type=float, default=0.05, help="pass tolerance for |ratio - sqrt(1-v^2)|")
+    ap.add_argument("--extrapolate", action="store_true",
+                    help="Richardson-extrapolate the ratio from a ladder of short runs (T/10..T/4) instead of one run at T")
+    ap.add_argument("--ladder", type=str, default=None, help="explicit even ticks for --extrapolate, e.g. 40,60,80,100")
+    ap.add_argument("--fit-order", type=int, default=2, help="error terms a1/T .. a_k/T^k fitted by --extrapolate")
+    ap.add_argument("--parity", action="store_true",
+                    help="checkerboard-packed 1D frames (numpy): half the memory and per-tick work, same counts")
+    sr_perf.add_argument(ap)
+    cache.add_arguments(ap)
     args = ap.parse_args()
-    run(args.H, args.T, args.v, args.seed, cpu_only=args.cpu_only, tol=args.tol)
+    sr_perf.init(args.profile)
+    if cache.replay(__file__, vars(args)): return
+    if args.extrapolate:
+        try:
+            Ts = extrapolate.parse_ladder(args.ladder) if args.ladder else extrapolate.ladder(args.T)
+            extrapolate.check_ladder(Ts, args.fit_order)
+        except ValueError as e:
+            ap.error(str(e))
+        run_extrapolated(args.T, args.v, args.seed, Ts, order=args.fit_order, cpu_only=args.cpu_only, tol=args.tol,
+                         use_parity=args.parity)
+        return
+    run(args.H, args.T, args.v, args.seed, cpu_only=args.cpu_only, tol=args.tol, use_parity=args.parity)
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,8 @@
 #!/usr/bin/env python3
-import argparse, json, math
-
-def N_rest(T):
-    m=T//2
-    return (2*m*(m+1)-1) if (T%2==0) else ((m+1)**2 + m**2)
-
-def N_moving_1p1(T, D1):
-    N=0
-    for t in range(1, T):
-        L=max(-t,  D1-(T-t)); R=min(t,  D1+(T-t))
-        if L<=R: N += (R-L+1)
-    return N
+import argparse, math
+import sr_perf
+from sr_core.counts import N_rest, N_moving as N_moving_1p1
+from sr_core.emit import emit
 
 def split_L1(D1, phi):
     # Split integer D1 into Dx, Dy with |Dx|+|Dy|=D1, preserving angle sign pattern
@@ -29,7 +21,9 @@ def main():
     ap.add_argument("--angles", type=int, default=12)
     ap.add_argument("--tol_mean", type=float, default=0.03)
     ap.add_argument("--tol_spread", type=float, default=0.02)
+    sr_perf.add_argument(ap)
     a=ap.parse_args()
+    sr_perf.init(a.profile)
 
     if not (0.0 <= a.v1 < 1.0):
         raise SystemExit("ERROR: --v1 must be in [0,1).")
@@ -44,7 +38,8 @@ def main():
     for k in range(a.angles):
         phi = 2*math.pi*k/a.angles
         Dx, Dy = split_L1(D1, phi)      # guarantees |Dx|+|Dy|=D1 ≤ T
-        Nm = N_moving_1p1(T, abs(Dx)+abs(Dy))
+        with sr_perf.stage("N_moving", ticks=T):
+            Nm = N_moving_1p1(T, abs(Dx)+abs(Dy))
         kappa = (Nm**0.5)/T
         kappa0= (N0**0.5)/T
         ratios.append(kappa/kappa0)
@@ -65,7 +60,7 @@ def main():
         "PASS_propertime_orientation_2d": (abs(mean-target)<=a.tol_mean and spread<=a.tol_spread),
         "notes":"Uses L1 speed v1 and splits D1 across axes so |Dx|+|Dy|=D1; Alexandrov counts stay nonzero for all angles."
     }
-    print(json.dumps(out, indent=2))
+    emit(out)
 
 if __name__=="__main__":
     main()
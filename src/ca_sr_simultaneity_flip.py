@@ -1,16 +1,8 @@
 #!/usr/bin/env python3
-import argparse, json
-
-def N_between(dt, dx):
-    """Alexandrov count for 1D lattice between two events with separations (dt>=0, integer), (dx integer)."""
-    T = abs(int(dt)); D = int(abs(dx))
-    if T <= 0: return 0
-    N=0
-    for t in range(1, T):
-        L = max(-t,  D-(T-t))
-        R = min( t,  D+(T-t))
-        if L<=R: N += (R-L+1)
-    return N
+import argparse
+import sr_perf
+from sr_core.counts import N_between
+from sr_core.emit import emit
 
 def main():
     ap = argparse.ArgumentParser(description="Relativity of simultaneity via poset counts.")
@@ -18,7 +10,9 @@ def main():
     ap.add_argument("--v", type=float, default=0.6, help="moving frame speed")
     ap.add_argument("--L", type=int, default=200, help="rest-simultaneous spatial separation")
     ap.add_argument("--tol_zero", type=int, default=0)  # for exact integer sign checks
+    sr_perf.add_argument(ap)
     args = ap.parse_args()
+    sr_perf.init(args.profile)
 
     Tau = args.Tau
     D = int(round(args.v * Tau))  # drift for anchors
@@ -42,8 +36,9 @@ def main():
     def Delta(E):
         return N_AB(p_minus, E) - N_AB(E, p_plus)
 
-    dL = Delta(EL)
-    dR = Delta(ER)
+    with sr_perf.stage("counts"):
+        dL = Delta(EL)
+        dR = Delta(ER)
 
     # Signs (allow tol_zero=0 for strictness)
     sign = lambda z: (1 if z>args.tol_zero else (-1 if z<-args.tol_zero else 0))
@@ -57,7 +52,7 @@ def main():
       "PASS_simultaneity_flip": (sign(dL) * sign(dR) == -1),
       "notes": "Δ(E)=N(p-,E)-N(E,p+). Opposite signs ⇒ events that were simultaneous at rest are not simultaneous in moving frame."
     }
-    print(json.dumps(out, indent=2))
+    emit(out)
 
 if __name__ == "__main__":
     main()
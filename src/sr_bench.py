@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# Benchmark suite for the SR poset hot kernels: scaling ladders, throughput, fitted complexity exponents,
+# and regression checks against a stored baseline JSON. CPU-only, offline, numpy path.
+
+import argparse, contextlib, io, json, os, platform, random, sys, time
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path: sys.path.insert(0, HERE)
+
+from sr_core import steppers, counts, parity, stencil, symmetry, tiled
+import ca_sr_isotropy_audit as audit
+import ca_sr_isotropy_symmetrized_v1 as iso2d
+import ca_sr_isotropy_3d as iso3d
+import ca_sr_mm_dimension_fit as mmfit
+
+def _quiet(fn, *args, **kw):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kw)
+
+# ---- per-kernel setup: size -> (callable, work units) ----
+def bench_apply_S(H, ticks=10):
+    v = np.random.default_rng(0).random((H, H)) < 0.5
+    a, b = v.copy(), np.empty_like(v)
+    def f():
+        x, y = a, b
+        for _ in range(ticks):
+            steppers.apply_S_numpy(x, out=y); x, y = y, x
+    return f, ticks*H*H
+
+def bench_lightcone(H, T=64, packed_parity=False, quadrant=False):
+    if packed_parity: return (lambda: parity.lightcone(H, H, T)), T*H*H
+    if quadrant: return (lambda: symmetry.lightcone(H + 1, H + 1, T)), T*H*H  # odd grid, full-grid work units
+    return (lambda: tiled.lightcone_stream(H, H, T, 1)), T*H*H
+
+def bench_causality_metrics(H, T=32):
+    ideal = steppers.l1_lightcone_mask(H, H, T)
+    front = ideal.copy()
+    return (lambda: steppers.causality_metrics(front, ideal)), (T+1)*H*H
+
+def bench_sample_radii(H, angles=360):
+    yy, xx = np.mgrid[0:H, 0:H]
+    mask = (np.abs(xx - H//2) + np.abs(yy - H//2)) <= H//3
+    return (lambda: audit.sample_radii(mask, num_angles=angles)), angles
+
+def bench_N_moving(T):
+    D = int(round(0.6*T))
+    return (lambda: counts.N_moving(T, D)), T
+
+def bench_evolve_front(H, T=64, packed=False, quadrant=False):
+    if quadrant:
+        sched = stencil.Schedule("staggered")
+        return (lambda: symmetry.evolve(H + 1, H + 1, T, sched, np.random.default_rng(7))), T*H*H
+    return (lambda: audit.evolve_front(H, H, T, "staggered", packed=packed)), T*H*H
+
+def bench_order_fraction(n_pairs):
+    rng = random.Random(7)
+    pts = mmfit.sample_points_2p1(400, 5000, rng)
+    return (lambda: mmfit.order_fraction(pts, rng, mmfit.comparable_2p1, n_pairs)), n_pairs
+
+def bench_walker_2d(N, T=20, dtype=np.float64):
+    return (lambda: _quiet(iso2d.run_numpy, 201, 201, T, N, 7, dtype=dtype)), N*T
+
+def bench_walker_3d(N, T=5):
+    return (lambda: iso3d.run(61, 61, 61, T, N, 7)), N*T
+
+# name: (setup, ladder variable, full ladder, quick ladder, throughput unit)
+KERNELS = {
+    "apply_S_numpy":     (bench_apply_S,           "H=W",     [128, 256, 512, 1024, 2048], [64, 128, 256],   "cells*ticks/s"),
+    "evolve_front":      (bench_evolve_front,      "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "evolve_front_packed": (lambda H: bench_evolve_front(H, packed=True),
+                                                   "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "evolve_front_quadrant": (lambda H: bench_evolve_front(H, quadrant=True),
+                                                   "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "lightcone_stream":  (bench_lightcone,         "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "lightcone_parity":  (lambda H: bench_lightcone(H, packed_parity=True),
+                                                   "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "lightcone_quadrant": (lambda H: bench_lightcone(H, quadrant=True),
+                                                   "H=W",     [128, 256, 512, 1024],       [64, 128, 256],   "cells*ticks/s"),
+    "causality_metrics": (bench_causality_metrics, "H=W",     [64, 128, 256, 512],         [32, 64, 128],    "cells/s"),
+    "sample_radii":      (bench_sample_radii,      "H=W",     [101, 201, 401, 801],        [51, 101, 201],   "rays/s"),
+    "N_moving":          (bench_N_moving,          "T",       [250, 500, 1000, 2000, 4000],[100, 200, 400],  "ticks/s"),
+    "order_fraction":    (bench_order_fraction,    "n_pairs", [5000, 10000, 20000, 40000], [2000, 4000, 8000], "pairs/s"),
+    "walker_2d":         (bench_walker_2d,         "N",       [5000, 20000, 80000],        [1000, 4000],     "agents*ticks/s"),
+    "walker_2d_f32":     (lambda N: bench_walker_2d(N, dtype=np.float32),
+                                                   "N",       [5000, 20000, 80000],        [1000, 4000],     "agents*ticks/s"),
+    "walker_3d":         (bench_walker_3d,         "N",       [1000, 4000, 16000],         [250, 1000],      "agents*ticks/s"),
+}
+
+def time_best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best
+
+def fit_exponent(sizes, secs):
+    """Empirical complexity k in time ∝ size^k (least squares in log-log)."""
+    if len(sizes) < 2: return float("nan")
+    return float(np.polyfit(np.log(sizes), np.log(secs), 1)[0])
+
+def run_kernel(name, quick, repeat):
+    setup, var, full, small, unit = KERNELS[name]
+    pts = []
+    for size in (small if quick else full):
+        fn, work = setup(size)
+        fn()  # warm-up (imports, caches, first-touch pages)
+        sec = time_best(fn, repeat)
+        pts.append({"size": size, "work": work, "seconds": sec, "throughput": work/max(sec, 1e-12)})
+    # exponent w.r.t. the ladder variable (e.g. ~2 for H=W grids, ~1 for T or N)
+    k = fit_exponent([p["size"] for p in pts], [p["seconds"] for p in pts])
+    return {"ladder": var, "unit": unit, "points": pts, "complexity_exponent": k,
+            "median_throughput": float(np.median([p["throughput"] for p in pts]))}
+
+def compare(results, baseline, threshold, per_kernel):
+    """
+    Flag every ladder point whose throughput dropped by more than the threshold fraction against the baseline point
+    of the same size (a median over the ladder would hide a regression at one size). Returns (regressions,
+    mismatches): kernels whose ladder differs from the baseline's are compared on the shared sizes only and listed.
+    """
+    regs, mism = [], []
+    for name, r in results.items():
+        b = baseline.get("kernels", {}).get(name)
+        if not b: continue
+        thr = per_kernel.get(name, threshold)
+        base = {p["size"]: p["throughput"] for p in b["points"]}
+        sizes = [p["size"] for p in r["points"]]
+        if sorted(sizes) != sorted(base):
+            mism.append({"kernel": name, "sizes": sizes, "baseline_sizes": sorted(base)})
+        worst = None
+        for p in r["points"]:
+            if p["size"] not in base: continue
+            ratio = p["baseline_ratio"] = p["throughput"] / max(base[p["size"]], 1e-12)
+            if ratio < 1.0 - thr:
+                regs.append({"kernel": name, "size": p["size"], "ratio": ratio, "threshold": thr})
+            worst = ratio if worst is None else min(worst, ratio)
+        r["baseline_ratio"] = worst  # worst matching point; None when no size matched
+    return regs, mism
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark SR poset hot kernels with scaling ladders and regression thresholds.")
+    ap.add_argument("--kernels", type=str, default=",".join(KERNELS), help="comma-separated subset")
+    ap.add_argument("--quick", action="store_true", help="small ladders (smoke)")
+    ap.add_argument("--repeat", type=int, default=3, help="timings per point (best is kept)")
+    ap.add_argument("--baseline", type=str, default=None, help="baseline JSON to compare against")
+    ap.add_argument("--write-baseline", type=str, default=None, help="write this run as a baseline JSON")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed fractional throughput drop")
+    ap.add_argument("--kernel-threshold", action="append", default=[], metavar="NAME=FRAC",
+                    help="per-kernel threshold override (repeatable)")
+    ap.add_argument("--out-json", type=str, default=None)
+    a = ap.parse_args()
+
+    names = [k for k in a.kernels.split(",") if k]
+    unknown = [k for k in names if k not in KERNELS]
+    if unknown: ap.error(f"unknown kernels: {unknown}")
+    per_kernel = {}
+    for kv in a.kernel_threshold:
+        k, _, v = kv.partition("=")
+        per_kernel[k] = float(v)
+
+    base = None
+    if a.baseline:
+        with open(a.baseline) as f: base = json.load(f)
+        if bool(base.get("quick")) != a.quick:
+            ap.error(f"baseline {a.baseline} was recorded with quick={bool(base.get('quick'))}; "
+                     f"rerun with{'out' if a.quick else ''} --quick to compare like with like")
+
+    results = {name: run_kernel(name, a.quick, a.repeat) for name in names}
+    out = {
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "cpu": platform.processor() or platform.machine(), "cpus": os.cpu_count()},
+        "quick": a.quick, "repeat": a.repeat,
+        "kernels": results,
+    }
+    if base is not None:
+        regs, mism = compare(results, base, a.threshold, per_kernel)
+        for m in mism:
+            print(f"warning: {m['kernel']}: ladder {m['sizes']} differs from the baseline's {m['baseline_sizes']}; "
+                  "only matching sizes are compared", file=sys.stderr)
+        out["regressions"] = regs
+        out["ladder_mismatches"] = mism
+        out["threshold"] = a.threshold
+        out["PASS_no_regression"] = not regs
+    if a.write_baseline:
+        with open(a.write_baseline, "w") as f: json.dump(out, f, indent=2)
+    if a.out_json:
+        with open(a.out_json, "w") as f: json.dump(out, f, indent=2)
+    print(json.dumps(out, indent=2))
+    if a.baseline and out["regressions"]: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# Shared core for the SR poset scripts: backend/device selection (torch imported lazily), lattice steppers,
+# closed-form Alexandrov counts, and JSON result emission.
+# Import submodules explicitly (e.g. `from sr_core.counts import N_rest`); this package imports nothing heavy
+# so pure-Python count checks start without numpy or torch.
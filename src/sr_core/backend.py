@@ -0,0 +1,30 @@
+# Backend selection. torch is imported only when a torch device is actually requested,
+# so numpy-only and pure-Python runs never pay its import cost.
+
+import functools, os
+
+@functools.lru_cache(maxsize=None)
+def get_torch():
+    """Return the torch module, or None if it is not installed (imported on first call only)."""
+    if os.environ.get("SR_BACKEND", "") == "numpy": return None
+    try:
+        import torch
+        return torch
+    except Exception:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _probe_device():
+    torch = get_torch()
+    if torch is None: return None
+    if torch.cuda.is_available(): return torch.device("cuda")
+    if getattr(torch.backends, "mps", None) and torch.backends.mps.is_available(): return torch.device("mps")
+    return torch.device("cpu")
+
+def select_device(cpu_only=False):
+    """torch.device (cuda > mps > cpu) when torch is usable and not cpu_only; None means the numpy path."""
+    if cpu_only: return None
+    return _probe_device()
+
+def device_str(device):
+    return str(device) if device is not None else "numpy"
@@ -0,0 +1,144 @@
+# Content-addressed on-disk result cache for deterministic runs.
+# Key = sha256(entry point, normalised CLI args, backend hint, source of the entry and every src/ module it
+# imports, transitively; found statically so the key does not depend on what else the process has loaded).
+# Entries are written atomically (tmp + rename), so concurrent readers/writers never see partial files;
+# size-bounded LRU eviction (mtime bumped on hit) runs under an advisory lock.
+# Env: SR_CACHE=0 disables, SR_CACHE_DIR (default ~/.cache/sr_poset), SR_CACHE_MAX_MB (default 512).
+
+import ast, fcntl, hashlib, importlib.util, json, os, sys, tempfile
+import sr_perf
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_ARGS = {"no_cache", "refresh", "profile"}
+_pending = None
+_src_hash = {}
+
+def cache_dir():
+    return os.environ.get("SR_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "sr_poset")
+
+def max_bytes():
+    return int(float(os.environ.get("SR_CACHE_MAX_MB", "512")) * 2**20)
+
+def add_arguments(ap):
+    ap.add_argument("--no-cache", action="store_true", help="bypass the result cache (neither read nor write)")
+    ap.add_argument("--refresh", action="store_true", help="recompute and overwrite the cached result")
+
+def _file_info(path):
+    """(sha256, src-local imports) of one source file, memoised on (mtime, size)."""
+    st = os.stat(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _src_hash.get(path)
+    if hit and hit[0] == sig: return hit[1]
+    with open(path, "rb") as f: blob = f.read()
+    names = set()
+    for node in ast.walk(ast.parse(blob)):
+        if isinstance(node, ast.Import):
+            names.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(node.module + "." + a.name for a in node.names)
+    deps = []
+    for n in names:
+        base = os.path.join(SRC, *n.split("."))
+        for cand in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.isfile(cand): deps.append(cand)
+    info = (hashlib.sha256(blob).hexdigest(), sorted(deps))
+    _src_hash[path] = (sig, info)
+    return info
+
+def _sources(entry_file):
+    """Digest of the entry script and its transitive imports that live under src/."""
+    out, todo = {}, [os.path.abspath(entry_file)]
+    while todo:
+        f = todo.pop()
+        rel = os.path.relpath(f, SRC)
+        if rel in out: continue
+        digest, deps = _file_info(f)
+        out[rel] = digest
+        todo.extend(deps)
+    return out
+
+def _backend(args):
+    if args.get("cpu_only") or os.environ.get("SR_BACKEND") == "numpy": return "numpy"
+    return "torch" if importlib.util.find_spec("torch") is not None else "numpy"
+
+def make_key(entry_file, args):
+    norm = {k: v for k, v in sorted(args.items()) if k not in _SKIP_ARGS}
+    entry = os.path.splitext(os.path.basename(entry_file))[0]
+    blob = json.dumps({"entry": entry, "args": norm, "backend": _backend(args), "sources": _sources(entry_file)},
+                      sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+def _path(key):
+    return os.path.join(cache_dir(), key[:2], key + ".json")
+
+def get(key):
+    p = _path(key)
+    try:
+        with open(p) as f: rec = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try: os.utime(p)  # LRU touch
+    except OSError: pass
+    return rec
+
+def put(key, rec):
+    p = _path(key)
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(p), prefix=".tmp-")
+    with os.fdopen(fd, "w") as f: json.dump(rec, f)
+    os.replace(tmp, p)
+    evict()
+
+def evict(limit=None):
+    """Drop least-recently-used entries until the cache is under its size bound (best effort, locked)."""
+    root = cache_dir(); limit = max_bytes() if limit is None else limit
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".lock"), "w") as lk:
+        try: fcntl.flock(lk, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError: return  # someone else is evicting
+        files = []
+        for d, _, names in os.walk(root):
+            for n in names:
+                if n.endswith(".json"):
+                    p = os.path.join(d, n)
+                    try: st = os.stat(p)
+                    except OSError: continue
+                    files.append((st.st_mtime, st.st_size, p))
+        total = sum(s for _, s, _ in files)
+        if total <= limit: return
+        for _, size, p in sorted(files):
+            try: os.remove(p)
+            except OSError: continue
+            total -= size
+            if total <= 0.9 * limit: break
+
+def replay(entry_file, args):
+    """
+    Call once per run after parsing args (entry_file = the script's __file__, args = vars(namespace)). On a hit print the stored JSON (flagged "cache_hit": true)
+    and return True. On a miss remember the key so emit() stores the fresh result; return False.
+    """
+    global _pending
+    _pending = None
+    if (os.environ.get("SR_CACHE", "1") == "0" or args.get("no_cache") or sr_perf.ENABLED):
+        return False
+    key = make_key(entry_file, args)
+    if not args.get("refresh"):
+        rec = get(key)
+        if rec is not None:
+            out = rec["result"]; out["cache_hit"] = True
+            print(json.dumps(out, indent=2, sort_keys=rec.get("sort_keys", False)))
+            return True
+    _pending = (key, sys.argv)
+    return False
+
+def store_pending(out, sort_keys=False):
+    """Called by emit(): persist the result of the run registered by replay()."""
+    global _pending
+    # only the run that registered the key may fill it (in-process runners swap sys.argv per entry)
+    if _pending is None or _pending[1] is not sys.argv:
+        _pending = None
+        return
+    key, _pending = _pending[0], None
+    try: put(key, {"result": out, "sort_keys": sort_keys})
+    except OSError: pass  # read-only or full cache dir never fails a run
@@ -0,0 +1,70 @@
+# Checkpoints for long lattice runs: a single .npz (bit-packed state + JSON meta) written atomically, plus an
+# append-only frames log for runs that also need the [T+1,H,W] front stack. A run resumed or extended from a
+# checkpoint continues the same tick sequence, so results are bit-identical to an uninterrupted run:
+# per-tick metric values are stored as lists (np.mean over the full list, not a running sum), and the RNG
+# bit-generator state is restored exactly.
+
+import json, os, tempfile
+import numpy as np
+
+def save(path, meta, **arrays):
+    """Write meta (JSON-able dict) and arrays to path atomically (temp file + rename)."""
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".ckpt-", suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8), **arrays)
+    os.replace(tmp, path)
+
+def load(path):
+    with np.load(path) as z:
+        meta = json.loads(z["meta"].tobytes().decode())
+        arrays = {k: z[k] for k in z.files if k != "meta"}
+    return meta, arrays
+
+def check(meta, kind, **expect):
+    """Raise ValueError unless the checkpoint is of `kind` and matches every expected parameter."""
+    if meta.get("kind") != kind:
+        raise ValueError(f"checkpoint is {meta.get('kind')!r}, expected {kind!r}")
+    bad = {k: (meta.get(k), v) for k, v in expect.items() if meta.get(k) != v}
+    if bad: raise ValueError(f"checkpoint parameters differ (have, want): {bad}")
+
+def pack(mask):
+    return np.packbits(mask, axis=-1)
+
+def unpack(bits, W):
+    return np.unpackbits(bits, axis=-1, count=W).astype(bool)
+
+def rng_state(rng):
+    return rng.bit_generator.state
+
+def restore_rng(state):
+    rng = np.random.default_rng()
+    rng.bit_generator.state = state
+    return rng
+
+class FramesLog:
+    """Append-only file of bit-packed accumulated frames (one [H, ceil(W/8)] record per tick)."""
+    def __init__(self, path, H, W, frames=0):
+        self.path, self.H, self.W = path, H, W
+        self.rec = H * ((W + 7) // 8)
+        mode = "r+b" if frames and os.path.exists(path) else "wb"
+        self.f = open(path, mode)
+        self.f.truncate(frames * self.rec)  # drop ticks written after the checkpoint we resume from
+        self.f.seek(0, os.SEEK_END)
+        self.n = frames
+
+    def append(self, acc):
+        self.f.write(pack(acc).tobytes()); self.n += 1
+
+    def flush(self):
+        self.f.flush(); os.fsync(self.f.fileno())
+
+    def read(self):
+        """All frames as uint8 [n, H, W]."""
+        self.f.flush()
+        raw = np.fromfile(self.path, dtype=np.uint8, count=self.n * self.rec)
+        return unpack(raw.reshape(self.n, self.H, -1), self.W).astype(np.uint8)
+
+    def close(self):
+        self.f.close()
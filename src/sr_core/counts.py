@@ -0,0 +1,20 @@
+# Closed-form / loop Alexandrov counts for the 1+1 L1 lattice poset (pure Python, no numpy).
+
+def N_rest(T):
+    """Interior count of the causal diamond between (0,0) and (T,0)."""
+    m = T//2
+    return (2*m*(m+1)-1) if T%2==0 else ((m+1)**2 + m**2)
+
+def N_moving(T, D):
+    """Interior count of the causal diamond between (0,0) and (T,D)."""
+    N=0
+    for t in range(1, T):
+        L=max(-t, D-(T-t)); R=min(t, D+(T-t))
+        if L<=R: N += (R-L+1)
+    return N
+
+def N_between(dt, dx):
+    """Alexandrov count between two events with separations (dt, dx); symmetric under reversal."""
+    T = abs(int(dt)); D = int(abs(dx))
+    if T <= 0: return 0
+    return N_moving(T, D)
@@ -0,0 +1,14 @@
+# Result emission: attach the optional perf block, fill a pending cache entry, and print / write JSON.
+
+import json
+import sr_perf
+from sr_core import cache
+
+def emit(out, indent=2, sort_keys=False, out_json=None):
+    """Print `out` as JSON (and write it to out_json if given); returns the dict."""
+    sr_perf.attach(out)
+    cache.store_pending(out, sort_keys=sort_keys)
+    if out_json:
+        with open(out_json, "w") as f: json.dump(out, f, indent=indent)
+    print(json.dumps(out, indent=indent, sort_keys=sort_keys))
+    return out
@@ -0,0 +1,51 @@
+# In-process entry-point execution shared by the battery runner and the sweep scheduler:
+# import a ca_sr_* module from src/, run its main() with a given argv, and parse the JSON it prints.
+
+import contextlib, importlib, io, json, os, resource, sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def usage():
+    """(CPU seconds of self + reaped children, peak RSS in KiB)."""
+    s = resource.getrusage(resource.RUSAGE_SELF); c = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return s.ru_utime + s.ru_stime + c.ru_utime + c.ru_stime, max(s.ru_maxrss, c.ru_maxrss)
+
+def _isolated(fn, *args):
+    with ProcessPoolExecutor(max_workers=1) as ex:
+        return ex.submit(fn, *args).result()
+
+class _FreshPool(ThreadPoolExecutor):
+    """Python < 3.11 stand-in for max_tasks_per_child=1: each task runs in its own single-use worker process."""
+    def submit(self, fn, *args):
+        return super().submit(_isolated, fn, *args)
+
+def fresh_pool(jobs):
+    """Executor running every task in a fresh interpreter (so peak RSS / CPU are per task), `jobs` at a time."""
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1)
+    return _FreshPool(max_workers=jobs)
+
+def run_entry(module, argv):
+    """Import `module` from src/, call its main() with argv, and return the JSON it prints."""
+    os.chdir(SRC)  # wrappers shell out to sibling scripts by relative path
+    if SRC not in sys.path: sys.path.insert(0, SRC)
+    mod = importlib.import_module(module)
+    buf = io.StringIO()
+    old_argv = sys.argv
+    sys.argv = [mod.__file__] + list(argv)
+    try:
+        with contextlib.redirect_stdout(buf):
+            mod.main()
+    finally:
+        sys.argv = old_argv
+    return json.loads(buf.getvalue())
+
+def judge(result, rule=None):
+    """rule None ⇒ every "PASS*" key must be true (None when the result has no PASS* key: nothing was checked);
+    (key, tol) ⇒ result[key] <= tol."""
+    if rule is None:
+        flags = [bool(v) for k, v in result.items() if k.startswith("PASS")]
+        return all(flags) if flags else None
+    key, tol = rule
+    return float(result[key]) <= tol
@@ -0,0 +1,79 @@
+# Richardson extrapolation for count-based estimators (pure Python, no numpy).
+# Lattice discretisation leaves a smooth f(T) = f∞ + a1/T + a2/T² + ... error, so evaluating an estimator on a short
+# ladder of modest T and fitting those terms recovers the continuum value f∞ from runs ~10× shorter than a direct
+# estimate at the same tolerance. Counts jump between parity classes (odd vs even T, odd vs even displacement D),
+# so ladders use even T only, and a displacement v·T that is not an even integer is handled by linear
+# interpolation between the two neighbouring even D (exact when v·T is one).
+
+import math
+
+def ladder(T, n=4, lo=0.1, hi=0.25, min_T=8):
+    """n even ticks spread over [lo·T, hi·T], ascending; for small T, where they collide at min_T or round together,
+    the ladder is widened upwards in steps of 2 so it still has n distinct points."""
+    pts = [lo + (hi - lo) * i / max(1, n - 1) for i in range(n)]
+    Ts = sorted({max(min_T, 2 * round(T * f / 2)) for f in pts})
+    while len(Ts) < n: Ts.append(Ts[-1] + 2)
+    return Ts
+
+def parse_ladder(spec):
+    Ts = sorted({int(x) for x in spec.split(",") if x.strip()})
+    if any(T <= 0 or T % 2 for T in Ts): raise ValueError(f"ladder ticks must be positive and even: {spec!r}")
+    return Ts
+
+def check_ladder(Ts, order):
+    """ValueError unless an order-`order` fit (plus the order−1 error estimate) is possible on ladder Ts."""
+    if order < 0: raise ValueError(f"fit order must be >= 0, got {order}")
+    if len(Ts) < order + 1:
+        raise ValueError(f"order {order} fit needs >= {order + 1} distinct ladder ticks, got {Ts}")
+    return Ts
+
+def at_displacement(f, x):
+    """f(D) at fractional displacement x ≥ 0, interpolated linearly between the neighbouring even D."""
+    d = math.floor(x / 2)
+    th = x / 2 - d
+    lo = f(2 * d)
+    return lo if th == 0 else (1 - th) * lo + th * f(2 * d + 2)
+
+def _solve(A, b):
+    """Gaussian elimination with partial pivoting on a small dense system."""
+    n = len(b)
+    M = [list(r) + [y] for r, y in zip(A, b)]
+    for c in range(n):
+        p = max(range(c, n), key=lambda r: abs(M[r][c]))
+        M[c], M[p] = M[p], M[c]
+        if M[c][c] == 0: raise ValueError("singular fit (ladder needs more distinct T than fit terms)")
+        for r in range(c + 1, n):
+            k = M[r][c] / M[c][c]
+            for j in range(c, n + 1): M[r][j] -= k * M[c][j]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (M[r][n] - sum(M[r][j] * x[j] for j in range(r + 1, n))) / M[r][r]
+    return x
+
+def fit(Ts, fs, order=2):
+    """Least-squares f∞ + Σ_{k≤order} a_k/T^k; returns (f∞, [a_1..a_order], rms residual)."""
+    if len(Ts) < order + 1: raise ValueError(f"order {order} fit needs >= {order + 1} ladder points, got {len(Ts)}")
+    s = min(Ts)  # basis in (s/T)^k keeps the normal equations well conditioned
+    rows = [[(s / T) ** k for k in range(order + 1)] for T in Ts]
+    A = [[sum(r[i] * r[j] for r in rows) for j in range(order + 1)] for i in range(order + 1)]
+    b = [sum(r[i] * f for r, f in zip(rows, fs)) for i in range(order + 1)]
+    c = _solve(A, b)
+    res = [f - sum(ci * ri for ci, ri in zip(c, r)) for r, f in zip(rows, fs)]
+    rms = math.sqrt(sum(e * e for e in res) / len(res))
+    return c[0], [c[k] * s ** k for k in range(1, order + 1)], rms
+
+def richardson(fn, Ts, order=2):
+    """
+    Evaluate fn(T) on the ladder and extrapolate to T → ∞. The error estimate is the larger of the change
+    against a one-order-lower fit on the longest points and the fit's rms residual.
+    """
+    Ts = list(Ts)
+    fs = [fn(T) for T in Ts]
+    f_inf, coeffs, rms = fit(Ts, fs, order)
+    if order > 0:
+        f_low = fit(Ts[-order:], fs[-order:], order - 1)[0]
+        err = max(abs(f_inf - f_low), rms)
+    else:
+        err = rms
+    return {"ladder": Ts, "values": fs, "order": order, "f_inf": f_inf, "err": err,
+            "coeffs": coeffs, "residual_rms": rms}
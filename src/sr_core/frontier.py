@@ -0,0 +1,101 @@
+# Sparse-shell light-cone engine on Z^d (d = 1..4), von-Neumann (±e_i) trace operator.
+# Only the current new-arrival shell is held, as a sorted int64 array of encoded sites
+# (key = Σ (x_i + R)·B^i, B = 2R+1), so a tick costs O(shell) = O(t^(d-1)) instead of O(L^d).
+# Z^d with ±e_i steps is bipartite: neighbours of shell t lie in shell t-1 or t+1, hence
+#   shell_{t+1} = N(shell_t) \ shell_{t-1}.
+
+import numpy as np
+
+def lattice_base(R):
+    return 2*int(R) + 1
+
+def check_capacity(d, R):
+    if not 1 <= d <= 4: raise ValueError("d must be in 1..4")
+    if lattice_base(R)**d >= 2**62: raise ValueError(f"radius {R} too large to encode in {d} dims")
+
+def encode(coords, R):
+    """coords int [n,d] with |x_i| <= R -> sorted-order-compatible int64 keys."""
+    coords = np.asarray(coords, dtype=np.int64)
+    B = lattice_base(R)
+    key = np.zeros(coords.shape[0], dtype=np.int64)
+    for i in range(coords.shape[1] - 1, -1, -1):
+        key = key*B + (coords[:, i] + R)
+    return key
+
+def decode(keys, d, R):
+    B = lattice_base(R)
+    out = np.empty((keys.size, d), dtype=np.int64)
+    k = keys.copy()
+    for i in range(d):
+        out[:, i] = k % B - R
+        k //= B
+    return out
+
+def l1_sphere_count(d, t):
+    """Sites of Z^d at L1 distance exactly t: Σ_k 2^k C(d,k) C(t-1,k-1) (1 for t=0)."""
+    from math import comb
+    if t == 0: return 1
+    return sum(2**k * comb(d, k) * comb(t-1, k-1) for k in range(1, min(d, t) + 1))
+
+def _dedup_sorted(a):
+    if a.size < 2: return a
+    keep = np.empty(a.size, dtype=bool); keep[0] = True
+    np.not_equal(a[1:], a[:-1], out=keep[1:])
+    return a[keep]
+
+def _minus(a, b):
+    """Sorted unique a minus sorted b."""
+    if a.size == 0 or b.size == 0: return a
+    idx = np.searchsorted(b, a)
+    idx[idx == b.size] = 0
+    return a[b[idx] != a]
+
+def expand(shell, d, R, half_width=None):
+    """Sorted unique ±e_i neighbours of `shell`; with half_width, moves leaving |x_i| <= half_width are dropped."""
+    B = lattice_base(R)
+    parts = []
+    for i in range(d):
+        s = B**i
+        c = (shell // s) % B - R if half_width is not None else None
+        for sgn in (1, -1):
+            nb = shell + sgn*s
+            if c is not None: nb = nb[sgn*c < half_width]
+            parts.append(nb)  # each part is already sorted
+    cat = np.concatenate(parts)
+    cat.sort(kind="stable")  # timsort: merges the 2d sorted runs
+    return _dedup_sorted(cat)
+
+def shells(d, T, half_width=None):
+    """Yield (t, shell keys) for t = 0..T from the origin; keys encode with R = min(T, half_width)."""
+    R = T if half_width is None else min(T, half_width)
+    check_capacity(d, R)
+    prev = np.empty(0, dtype=np.int64)
+    cur = encode(np.zeros((1, d), dtype=np.int64), R)
+    hw = None if half_width is None or half_width >= T else half_width
+    yield 0, cur
+    for t in range(1, T + 1):
+        nxt = _minus(expand(cur, d, R, hw), prev)
+        prev, cur = cur, nxt
+        yield t, cur
+        if cur.size == 0: break
+
+def arrival_table(d, T, half_width=None):
+    """All sites reached within T ticks as (sorted keys, first-arrival tick) — 8+2/4 bytes per site."""
+    ks, ts = [], []
+    tdt = np.uint16 if T < 2**16 else np.uint32
+    for t, sh in shells(d, T, half_width):
+        ks.append(sh); ts.append(np.full(sh.size, t, dtype=tdt))
+    keys = np.concatenate(ks); times = np.concatenate(ts)
+    o = np.argsort(keys, kind="stable")
+    return keys[o], times[o]
+
+def lookup_arrival(keys, times, query):
+    """First-arrival tick of each query key, -1 where never reached."""
+    idx = np.searchsorted(keys, query)
+    idx[idx == keys.size] = 0
+    hit = keys.size > 0
+    out = np.full(query.size, -1, dtype=np.int64)
+    if hit:
+        ok = keys[idx] == query
+        out[ok] = times[idx[ok]]
+    return out
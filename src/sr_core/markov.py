@@ -0,0 +1,166 @@
+# Weighted Markov-matrix propagation on 2D grids: x_{t+1} = x_t P for batches of vectors x [B, H, W].
+# Two compact operator forms:
+#   StencilOperator — translation-invariant offsets + weights (push convention: mass at (i, j) moves to
+#                     (i+d0, j+d1) with weight w); boundary "absorb" drops mass pushed off the grid, "periodic" wraps.
+#                     One slice multiply-add per offset into a reused buffer; bool inputs run the OR semiring
+#                     (edges = nonzero weights), i.e. exactly the reachability kernels of sr_core.stencil.
+#   CSROperator     — any sparse P, stored as CSR of the pull matrix A = Pᵀ (row j lists sources i of site j),
+#                     applied with a gather, an in-place multiply and np.add.reduceat into reused buffers.
+# propagate() ping-pongs two state buffers through T ticks; jump() advances a stencil operator T ticks at once by
+# raising its Fourier symbol to the T-th power (exact for periodic boundaries, and for absorbing ones while the
+# support cannot reach the edge).
+
+import numpy as np
+from sr_core import stencil
+
+BOUNDARIES = ("absorb", "periodic")
+
+def parse_weights(spec, n):
+    """Comma list of n non-negative weights (default uniform); returned as float64 normalised to sum 1."""
+    w = np.ones(n) if not spec else np.array([float(x) for x in spec.split(",")], dtype=np.float64)
+    if len(w) != n: raise ValueError(f"expected {n} weights, got {len(w)}")
+    if (w < 0).any() or w.sum() <= 0: raise ValueError("weights must be non-negative with a positive sum")
+    return w / w.sum()
+
+def _wrap_spans(d, n):
+    """(dst, src) slice pairs along one axis of length n for a periodic shift by d."""
+    d %= n
+    if d == 0: return [(slice(0, n), slice(0, n))]
+    return [(slice(d, n), slice(0, n - d)), (slice(0, d), slice(n - d, n))]
+
+class StencilOperator:
+    """Translation-invariant transition operator on an H×W grid."""
+    def __init__(self, offsets, weights, H, W, boundary="absorb"):
+        if boundary not in BOUNDARIES: raise ValueError(f"boundary must be one of {BOUNDARIES}")
+        self.offsets = [tuple(map(int, o)) for o in offsets]
+        self.weights = np.asarray(weights, dtype=np.float64)
+        if len(self.weights) != len(self.offsets): raise ValueError("one weight per offset")
+        self.H, self.W, self.boundary = H, W, boundary
+        self.blocks = []  # per offset: [(dst rows, dst cols, src rows, src cols), ...]
+        for d0, d1 in self.offsets:
+            if boundary == "periodic":
+                pairs = [(r, c) for r in _wrap_spans(d0, H) for c in _wrap_spans(d1, W)]
+            else:
+                pairs = [(stencil._spans(d0, H), stencil._spans(d1, W))]
+            self.blocks.append([(rd, cd, rs, cs) for (rd, rs), (cd, cs) in pairs])
+        self._tmp = {}
+
+    def apply(self, x, out):
+        """out = x P (sum semiring) or OR over the nonzero-weight offsets (bool x); x, out [..., H, W], no aliasing."""
+        out[...] = 0
+        if x.dtype == bool:
+            for w, blocks in zip(self.weights, self.blocks):
+                if w == 0: continue
+                for rd, cd, rs, cs in blocks:
+                    np.bitwise_or(out[..., rd, cd], x[..., rs, cs], out=out[..., rd, cd])
+            return out
+        tmp = self._tmp.get((x.shape, x.dtype))
+        if tmp is None: tmp = self._tmp[(x.shape, x.dtype)] = np.empty_like(x)
+        for w, blocks in zip(self.weights, self.blocks):
+            if w == 0: continue
+            w = x.dtype.type(w)
+            for rd, cd, rs, cs in blocks:
+                t = tmp[..., rd, cd]
+                np.multiply(x[..., rs, cs], w, out=t)
+                np.add(out[..., rd, cd], t, out=out[..., rd, cd])
+        return out
+
+    def boolean_kernel(self):
+        """The existing reachability kernel (sr_core.stencil.Kernel) over this operator's edges (absorbing only)."""
+        if self.boundary != "absorb": raise ValueError("stencil kernels do not wrap")
+        return stencil.Kernel([o for o, w in zip(self.offsets, self.weights) if w != 0], self.H, self.W)
+
+    def reach(self):
+        """Max |d0|, |d1| moved per tick."""
+        return max(abs(o[0]) for o in self.offsets), max(abs(o[1]) for o in self.offsets)
+
+    def symbol(self, shape):
+        """rfft2 of the one-tick kernel image on a periodic grid of the given shape."""
+        k = np.zeros(shape, dtype=np.float64)
+        for (d0, d1), w in zip(self.offsets, self.weights):
+            k[d0 % shape[0], d1 % shape[1]] += w
+        return np.fft.rfft2(k)
+
+    def to_csr(self):
+        """The same operator as a CSROperator (explicit sparse matrix)."""
+        H, W = self.H, self.W
+        ii, jj = np.mgrid[0:H, 0:W]
+        src, dst, val = [], [], []
+        for (d0, d1), w in zip(self.offsets, self.weights):
+            if w == 0: continue
+            ti, tj = ii + d0, jj + d1
+            if self.boundary == "periodic":
+                ti %= H; tj %= W; ok = np.ones((H, W), dtype=bool)
+            else:
+                ok = (ti >= 0) & (ti < H) & (tj >= 0) & (tj < W)
+            src.append((ii*W + jj)[ok]); dst.append((ti*W + tj)[ok]); val.append(np.full(int(ok.sum()), w))
+        return CSROperator.from_edges(np.concatenate(src), np.concatenate(dst), np.concatenate(val), H*W, (H, W))
+
+class CSROperator:
+    """General sparse transition matrix P over n sites; stored as CSR of Pᵀ (indptr, indices, data)."""
+    def __init__(self, indptr, indices, data, n, shape=None):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.n, self.shape = n, shape or (n,)
+        counts = np.diff(self.indptr)
+        self.rows = np.flatnonzero(counts)            # sites with at least one incoming edge
+        self.starts = self.indptr[:-1][self.rows]
+        self._buf = {}
+
+    @classmethod
+    def from_edges(cls, src, dst, weight, n, shape=None):
+        """Edges src -> dst with transition weight P[src, dst] (duplicates add)."""
+        order = np.lexsort((src, dst))
+        dst, src, weight = np.asarray(dst)[order], np.asarray(src)[order], np.asarray(weight)[order]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=n), out=indptr[1:])
+        return cls(indptr, src, weight, n, shape)
+
+    @classmethod
+    def from_dense(cls, P, shape=None):
+        src, dst = np.nonzero(P)
+        return cls.from_edges(src, dst, P[src, dst], P.shape[0], shape)
+
+    def apply(self, x, out):
+        """out = x P for x [..., *shape] (float) or boolean OR over edges (bool x)."""
+        lead = x.shape[:x.ndim - len(self.shape)]
+        xf = x.reshape(lead + (self.n,)); of = out.reshape(lead + (self.n,))
+        key = (lead, x.dtype)
+        if key not in self._buf:
+            self._buf[key] = (np.empty(lead + (len(self.indices),), dtype=x.dtype),
+                              np.empty(lead + (len(self.rows),), dtype=x.dtype),
+                              self.data.astype(x.dtype) if x.dtype != bool else self.data != 0)
+        g, red, data = self._buf[key]
+        of[...] = 0
+        if not len(self.rows): return out
+        np.take(xf, self.indices, axis=-1, out=g)
+        if x.dtype == bool:
+            np.bitwise_and(g, data, out=g)
+            np.logical_or.reduceat(g, self.starts, axis=-1, out=red)
+        else:
+            np.multiply(g, data, out=g)
+            np.add.reduceat(g, self.starts, axis=-1, out=red)
+        of[..., self.rows] = red
+        return out
+
+def propagate(op, x0, T, on_tick=None):
+    """x_T = x_0 P^T with two reused state buffers; on_tick(t, x_t) after every tick. x0 is not modified."""
+    x, nxt = x0.copy(), np.empty_like(x0)
+    for t in range(1, T + 1):
+        op.apply(x, nxt); x, nxt = nxt, x
+        if on_tick is not None: on_tick(t, x)
+    return x
+
+def jump(op, x0, T):
+    """x_0 P^T for a StencilOperator via FFT (symbol^T). Raises ValueError when absorbing edges would be reached."""
+    H, W = op.H, op.W
+    if op.boundary == "absorb":
+        nz = np.nonzero(np.any(x0 != 0, axis=tuple(range(x0.ndim - 2))))
+        if len(nz[0]):
+            r0, r1 = op.reach()
+            if nz[0].min() - T*r0 < 0 or nz[0].max() + T*r0 >= H or nz[1].min() - T*r1 < 0 or nz[1].max() + T*r1 >= W:
+                raise ValueError("support reaches the absorbing edge within T ticks; FFT jump-ahead is not exact")
+    sym = op.symbol((H, W)) ** T
+    y = np.fft.irfft2(np.fft.rfft2(x0.astype(np.float64), axes=(-2, -1)) * sym, s=(H, W), axes=(-2, -1))
+    return y.astype(x0.dtype, copy=False)
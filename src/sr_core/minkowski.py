@@ -0,0 +1,117 @@
+# Analytic shape oracle for stencil schedules: after T ticks the reachable set's hull is the Minkowski sum
+# Σ_t conv(S_t), whose support function is Σ_k n_k h_k(u) with n_k = ticks spent on stencil k.
+# Its facet normals are the union of every stencil hull's edge normals, so the region is
+# {p : u_f·p <= Σ_k n_k h_k(u_f)} and the radius at angle θ is min_f H_f / (u_f·e_θ) — no lattice, O(#facets).
+# Counts n_k: O(1) for cycle schedules, O(T) rng draws (no stepping) for random ones.
+
+import numpy as np
+
+def hull(points):
+    """Convex hull (Andrew monotone chain), CCW vertices, collinear points dropped."""
+    pts = sorted(set(map(tuple, points)))
+    if len(pts) <= 2: return np.asarray(pts, dtype=float)
+    cross = lambda o, a, b: (a[0]-o[0])*(b[1]-o[1]) - (a[1]-o[1])*(b[0]-o[0])
+    lo, hi = [], []
+    for p in pts:
+        while len(lo) >= 2 and cross(lo[-2], lo[-1], p) <= 0: lo.pop()
+        lo.append(p)
+    for p in reversed(pts):
+        while len(hi) >= 2 and cross(hi[-2], hi[-1], p) <= 0: hi.pop()
+        hi.append(p)
+    return np.asarray(lo[:-1] + hi[:-1], dtype=float)
+
+def edge_normals(poly):
+    """Outward unit normals of a CCW polygon's edges (a segment gives its two sides)."""
+    if len(poly) < 2: return np.zeros((0, 2))
+    e = np.roll(poly, -1, axis=0) - poly
+    n = np.stack([e[:, 1], -e[:, 0]], axis=1)
+    n = n[np.linalg.norm(n, axis=1) > 0]
+    return n / np.linalg.norm(n, axis=1)[:, None]
+
+def support(offsets, u):
+    """h_S(u) = max_{s in S} u·s for each row of u."""
+    return (np.asarray(u, dtype=float) @ np.asarray(offsets, dtype=float).T).max(axis=1)
+
+def tick_counts(schedule, T, seed=7):
+    """Ticks spent on each of schedule.uniq over T ticks, drawing the same rng stream as evolve_front."""
+    k = len(schedule.uniq)
+    if schedule.mode == "random":
+        draws = np.random.default_rng(seed).random(T)
+        which = np.asarray(schedule.seq)[np.searchsorted(schedule.weights, draws, side="right")]
+        return np.bincount(which, minlength=k)
+    q, r = divmod(T, len(schedule.seq))
+    per = np.bincount(schedule.seq, minlength=k)
+    return q*per + np.bincount(schedule.seq[:r], minlength=k)
+
+def polygon(schedule, T, seed=7):
+    """Half-plane form (unit normals [F,2], offsets [F]) of the T-tick Minkowski sum."""
+    counts = tick_counts(schedule, T, seed)
+    used = [s for s, c in zip(schedule.stencils, counts) if c]
+    normals = np.concatenate([edge_normals(hull(s)) for s in used]) if used else np.zeros((0, 2))
+    # merge coincident normals from different stencils
+    normals = np.unique(np.round(normals, 12), axis=0)
+    h = np.zeros(len(normals))
+    for s, c in zip(schedule.stencils, counts):
+        if c:
+            hs = support(s, normals)
+            if (hs < -1e-12).any(): raise ValueError("oracle needs every stencil hull to contain the origin")
+            h += c * hs
+    return normals, h
+
+def radial(normals, h, thetas):
+    """Distance from the origin to the polygon boundary along each angle."""
+    u = np.stack([np.cos(thetas), np.sin(thetas)], axis=1)
+    dots = u @ normals.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(dots > 1e-12, h[None, :] / dots, np.inf)
+    return r.min(axis=1)
+
+def contains(normals, h, pts, eps=1e-9):
+    """Boolean membership of integer offsets pts [n,2] in the polygon."""
+    return (np.asarray(pts, dtype=float) @ normals.T <= h[None, :] + eps).all(axis=1)
+
+# ---- exact lattice region (cross-check scale): union over t of P_t ∩ (coset reachable in exactly t ticks) ----
+def _hnf(gens):
+    """Z-span of integer 2-vectors as (a, b, d): {x·(a,b) + y·(0,d)}, a,d >= 0, 0 <= b < d when d > 0."""
+    vs = [list(map(int, g)) for g in gens]
+    while sum(1 for v in vs if v[0]) > 1:
+        vs.sort(key=lambda v: abs(v[0]) if v[0] else float("inf"))
+        p = vs[0]
+        for v in vs[1:]:
+            if v[0]:
+                q = v[0] // p[0]
+                v[0] -= q*p[0]; v[1] -= q*p[1]
+    piv = next((v for v in vs if v[0]), [0, 0])
+    if piv[0] < 0: piv = [-piv[0], -piv[1]]
+    d = 0
+    for v in vs:
+        if v is not piv and not v[0]: d = np.gcd(d, abs(v[1]))
+    b = piv[1] % d if d else piv[1]
+    return int(piv[0]), int(b), int(d)
+
+def _member(p, lat):
+    a, b, d = lat
+    p0, p1 = p[:, 0], p[:, 1]
+    if a == 0:
+        ok = p0 == 0; x = np.zeros_like(p0)
+    else:
+        ok = p0 % a == 0; x = p0 // a
+    rest = p1 - x*b
+    return ok & ((rest % d == 0) if d else (rest == 0))
+
+def lattice_region(schedule, T, pts, seed=7):
+    """Exact reachable-within-T membership of integer offsets pts [n,2] (O(T·n); for small cross-checks)."""
+    pts = np.asarray(pts, dtype=np.int64)
+    normals = np.unique(np.round(np.concatenate([edge_normals(hull(s)) for s in schedule.stencils]), 12), axis=0)
+    hs = [support(s, normals) for s in schedule.stencils]
+    diffs = [[np.subtract(o, s[0]) for o in s[1:]] for s in schedule.stencils]
+    rng = np.random.default_rng(seed)
+    proj = pts.astype(float) @ normals.T
+    h = np.zeros(len(normals)); base = np.zeros(2, dtype=np.int64); gens = []
+    out = (pts == 0).all(axis=1)
+    for k in schedule.ticks(T, rng):
+        h += hs[k]; base += schedule.stencils[k][0]
+        gens += diffs[k]; diffs[k] = []
+        inside = (proj <= h[None, :] + 1e-9).all(axis=1)
+        out |= inside & _member(pts - base, _hnf(gens or [[0, 0]]))
+    return out
@@ -0,0 +1,91 @@
+# Out-of-core single-origin light cone: v/y (double-buffered) and acc live in memory-mapped files as bit-packed
+# uint64 rows. Each tick walks cache-sized row tiles that intersect the cone, restricted to the cone's word columns;
+# a tile maps only its own rows of the three files (plus one halo row above/below for the source), steps them with
+# the packed axial kernel, reduces its arrived/violation counts with popcounts, and unmaps again — peak RSS is a
+# few tiles, independent of H and W. Sites outside the cone are never touched (the files are created sparse).
+
+import os
+import numpy as np
+import sr_perf
+from sr_core import stencil
+
+NAMES = ("v0.u64", "v1.u64", "acc.u64")
+
+def popcount(words):
+    """Total set bits (np.bitwise_count on numpy >= 2, unpackbits otherwise)."""
+    if hasattr(np, "bitwise_count"): return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(np.ascontiguousarray(words).view(np.uint8)).sum())
+
+def _window(path, nw, r0, r1, mode):
+    return np.memmap(path, dtype=np.uint64, mode=mode, offset=r0*nw*8, shape=(r1 - r0, nw))
+
+def _interval_mask(lo, hi, nw):
+    """Packed masks [n, nw] selecting columns lo..hi (inclusive, per row; empty where hi < lo)."""
+    base = 64*np.arange(nw, dtype=np.int64)[None, :]
+    a = np.clip(lo[:, None] - base, 0, 64)          # first selected bit in the word
+    b = np.clip(hi[:, None] + 1 - base, 0, 64)      # one past the last selected bit
+    b = np.maximum(a, b)
+    ones = np.uint64(0xFFFFFFFFFFFFFFFF)
+    low = lambda n: np.where(n >= 64, ones, (np.uint64(1) << np.minimum(n, 63).astype(np.uint64)) - np.uint64(1))
+    return low(b) & ~low(a)
+
+def cone_rows(H, W, cy, cx, t, r0, r1):
+    """Per-row inside-cone column interval [lo, hi] (clipped to the grid) for rows r0:r1 at tick t."""
+    k = t - np.abs(np.arange(r0, r1) - cy)
+    lo = np.maximum(cx - k, 0); hi = np.minimum(cx + k, W - 1)
+    return lo, np.where(k >= 0, hi, lo - 1)
+
+def inside_count(H, W, cy, cx, t):
+    lo, hi = cone_rows(H, W, cy, cx, t, max(0, cy - t), min(H, cy + t + 1))
+    return int(np.maximum(hi - lo + 1, 0).sum())
+
+def lightcone_ooc(H, W, T, root, tile_mb=64):
+    """Same metrics as steppers.lightcone_frames + causality_metrics; the final front stays in root/acc.u64."""
+    nw = (W + 63) // 64
+    cx, cy = W//2, H//2
+    os.makedirs(root, exist_ok=True)
+    paths = [os.path.join(root, n) for n in NAMES]
+    for p in paths:
+        with open(p, "wb") as f: f.truncate(H*nw*8)  # sparse zero file
+    for p in (paths[0], paths[2]):
+        w = _window(p, nw, cy, cy+1, "r+"); w[0, cx // 64] = np.uint64(1) << np.uint64(cx % 64); w.flush(); del w
+    rows = max(1, int(tile_mb * 2**20) // (8*nw*6))  # src window + scratch + kernel buffer + dst/acc/mask
+    scratch = np.empty((rows + 2, nw), dtype=np.uint64)
+    kernels = {}
+    offs = stencil.STENCILS["axial"]
+
+    arrived, viols = [1.0], [0.0]  # tick 0: only the origin, which is inside
+    with sr_perf.stage("evolve", ticks=T, cells=T*H*W):
+        for t in range(1, T + 1):
+            src, dst, acc = paths[(t-1) % 2], paths[t % 2], paths[2]
+            lo, hi = max(0, cy - t), min(H, cy + t + 1)
+            # word columns that can be non-zero at tick t (one-word halo on each side)
+            wlo, whi = max(0, (cx - t - 1) // 64), min(nw, (cx + t + 1) // 64 + 1)
+            wbits = min(64*(whi - wlo), W - 64*wlo)
+            n_in = n_act = 0
+            for r0 in range(lo, hi, rows):
+                r1 = min(hi, r0 + rows)
+                s0, s1 = max(0, r0 - 1), min(H, r1 + 1)
+                kern = kernels.get((s1 - s0, wbits))
+                if kern is None:
+                    if len(kernels) >= 4: kernels.clear()  # tile shapes change while the cone grows
+                    kern = kernels[(s1 - s0, wbits)] = stencil.Kernel(offs, s1 - s0, wbits, "packed")
+                sw = _window(src, nw, s0, s1, "r")
+                y = kern.apply(sw[:, wlo:whi], scratch[:s1 - s0, :whi - wlo])
+                del sw
+                dw = _window(dst, nw, r0, r1, "r+"); dw[:, wlo:whi] = y[r0 - s0:r1 - s0]
+                aw = _window(acc, nw, r0, r1, "r+")[:, wlo:whi]; np.bitwise_or(aw, dw[:, wlo:whi], out=aw)
+                clo, chi = cone_rows(H, W, cy, cx, t, r0, r1)
+                n_act += popcount(aw)
+                n_in += popcount(aw & _interval_mask(clo - 64*wlo, chi - 64*wlo, whi - wlo))
+                del dw, aw  # unmap: dirty pages go back to the page cache, not our RSS
+                sr_perf.count("tiles")
+            ni = inside_count(H, W, cy, cx, t)
+            arrived.append(float(n_in) / max(1, ni))
+            viols.append(float(n_act - n_in) / max(1, H*W - ni))
+    return float(np.mean(arrived)), float(np.mean(viols))
+
+def load_front(root, H, W):
+    """Final accumulated front from an out-of-core run as a bool [H, W] array (small grids only)."""
+    nw = (W + 63) // 64
+    return stencil.unpack(np.fromfile(os.path.join(root, "acc.u64"), dtype=np.uint64).reshape(H, nw), W)
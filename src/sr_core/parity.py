@@ -0,0 +1,187 @@
+# Checkerboard (parity-compressed) layout for the von-Neumann lattice. The lattice is bipartite: S maps sites with
+# (i+j) even onto odd ones and back, so v_t lives on one parity class and the accumulated front splits into two
+# classes, each of which only changes on ticks of its own parity:
+#     A_q = ∪_{s ≤ t, s ≡ t} v_s   (q = class of tick t),   A_q ← A_q | S(A_{1−q}),   acc_t = A_0 ∪ A_1.
+# A class is stored compactly — 2D: C[i, k] ↔ site (i, 2k + ((i + q) & 1)) in an H × ⌈W/2⌉ array; 1D: C[k] ↔ x = 2k + q
+# (a trailing slot past the edge stays False) — so a tick updates one half-size array, and the two classes together
+# are the whole state: H·W bools instead of v, its scratch buffer and acc (3·H·W).
+# The other class is untouched on a tick, and its sites all sit at L1 distance ≡ t−1 from the origin, so their
+# in-cone counts are also unchanged; metrics are recounted on the active half only and match the full steppers exactly.
+
+import numpy as np
+import sr_perf
+
+# ------- 2D -------
+class Checkerboard:
+    """Packed parity classes of an H×W grid: pack/unpack and the 4-neighbour step between classes."""
+    def __init__(self, H, W):
+        self.H, self.W, self.Wh = H, W, (W + 1) // 2
+
+    def zeros(self, dtype=bool):
+        return np.zeros((self.H, self.Wh), dtype=dtype)
+
+    def offset(self, i, q):
+        return (i + q) & 1
+
+    def index(self, i, j):
+        """(class, packed column) of site (i, j)."""
+        return (i + j) & 1, j // 2
+
+    def pack(self, a, q, out=None):
+        c = self.zeros(a.dtype) if out is None else out
+        for r in (0, 1):
+            s = self.offset(r, q); n = len(range(s, self.W, 2))
+            c[r::2, :n] = a[r::2, s::2]
+        return c
+
+    def unpack(self, c, q, out):
+        """Write class q of `out` (full H×W) from its packed form; the other class is left as is."""
+        for r in (0, 1):
+            s = self.offset(r, q); n = len(range(s, self.W, 2))
+            out[r::2, s::2] = c[r::2, :n]
+        return out
+
+    def step(self, src, dst, q):
+        """dst (class q) |= S(src) for src of class 1−q, in place."""
+        np.bitwise_or(dst, src, out=dst)                                   # the row neighbour sharing column k
+        np.bitwise_or(dst[1:], src[:-1], out=dst[1:])                      # vertical neighbours share column k
+        np.bitwise_or(dst[:-1], src[1:], out=dst[:-1])
+        r1, r0 = (q + 1) & 1, q & 1                                        # rows with offset 1 / offset 0
+        np.bitwise_or(dst[r1::2, :-1], src[r1::2, 1:], out=dst[r1::2, :-1])  # (i, j+1) is column k+1
+        np.bitwise_or(dst[r0::2, 1:], src[r0::2, :-1], out=dst[r0::2, 1:])   # (i, j−1) is column k−1
+        if self.W & 1: dst[r1::2, -1] = False                              # slot past the right edge
+
+    def l1(self, cy, cx, q):
+        """Packed L1 distance to (cy, cx) for class q (uint16 when it fits); slots past the edge hold the dtype max.
+        Built row group by row group from two small distance vectors, so no full-size temporaries."""
+        H, W = self.H, self.W
+        dt = np.uint16 if H + W < np.iinfo(np.uint16).max else np.int32
+        d = np.empty((H, self.Wh), dtype=dt)
+        for r in (0, 1):
+            j = 2*np.arange(self.Wh) + self.offset(r, q)
+            dj = np.abs(j - cx).astype(dt)
+            di = np.abs(np.arange(r, H, 2) - cy).astype(dt)
+            np.add(di[:, None], dj[None, :], out=d[r::2])
+            if j[-1] >= W: d[r::2, -1] = np.iinfo(dt).max
+        return d
+
+class Cone:
+    """Accumulated front of a single origin (default: centre) in checkerboard layout, with the per-tick L1-cone
+    metrics of steppers.causality_metrics streamed as it goes."""
+    def __init__(self, H, W, origin=None):
+        self.board = b = Checkerboard(H, W)
+        self.H, self.W = H, W
+        cy, cx = origin if origin is not None else (H//2, W//2)
+        self.c0 = (cy + cx) & 1
+        self.A = [b.zeros(), b.zeros()]
+        q, k = b.index(cy, cx); self.A[q][cy, k] = True
+        self.d1 = [b.l1(cy, cx, q) for q in (0, 1)]
+        # sites with d1 ≤ t, by t: the L1 histogram is the convolution of the row and column distance histograms
+        di, dj = np.abs(np.arange(H) - cy), np.abs(np.arange(W) - cx)
+        self.dmax = int(di.max() + dj.max())
+        self.inside = np.cumsum(np.convolve(np.bincount(di), np.bincount(dj)))
+        self.tmp = b.zeros()
+        self.t = 0
+        self.n_in, self.n = [0, 0], [0, 0]
+        for q in (0, 1): self._count(q)
+        self.arrived, self.viols = [], []
+        self._record()
+
+    def _count(self, q):
+        np.less_equal(self.d1[q], min(self.t, self.dmax), out=self.tmp)
+        np.bitwise_and(self.tmp, self.A[q], out=self.tmp)
+        self.n_in[q] = int(np.count_nonzero(self.tmp))
+        self.n[q] = int(np.count_nonzero(self.A[q]))
+
+    def _record(self):
+        ni = int(self.inside[min(self.t, self.dmax)]); no = self.H*self.W - ni
+        n_in = self.n_in[0] + self.n_in[1]
+        self.arrived.append(float(n_in) / max(1, ni))
+        self.viols.append(float(self.n[0] + self.n[1] - n_in) / max(1, no))
+
+    def step(self):
+        self.t += 1
+        q = (self.c0 + self.t) & 1
+        self.board.step(self.A[1 - q], self.A[q], q)
+        self._count(q)
+        self._record()
+
+    def acc(self, out=None):
+        """The accumulated front as a full H×W bool (or uint8) grid."""
+        out = np.empty((self.H, self.W), dtype=bool) if out is None else out
+        for q in (0, 1): self.board.unpack(self.A[q], q, out)
+        return out
+
+    def max_l1(self):
+        return max((int(d[a].max()) for d, a in zip(self.d1, self.A) if a.any()), default=0)
+
+def lightcone(H, W, T, keep_frames=False, on_tick=None):
+    """
+    Centred light cone in checkerboard layout. Returns (arrived_fraction, violations_fraction, Cone, frames uint8
+    [T+1,H,W] or None); metrics are identical to steppers.lightcone_frames + causality_metrics.
+    on_tick(t, cone) after every tick (and at t = 0).
+    """
+    cone = Cone(H, W)
+    frames = np.empty((T+1, H, W), dtype=np.uint8) if keep_frames else None
+    if keep_frames: cone.acc(frames[0])
+    if on_tick is not None: on_tick(0, cone)
+    with sr_perf.stage("evolve", ticks=T, cells=T*H*cone.board.Wh):
+        for t in range(1, T+1):
+            cone.step()
+            if keep_frames: cone.acc(frames[t])
+            if on_tick is not None: on_tick(t, cone)
+    return float(np.mean(cone.arrived)), float(np.mean(cone.viols)), cone, frames
+
+# ------- 1D -------
+def step1(src, dst, q, H):
+    """dst (class q) |= S(src) on a line of H sites, src of class 1−q."""
+    np.bitwise_or(dst, src, out=dst)
+    if q == 0: np.bitwise_or(dst[1:], src[:-1], out=dst[1:])      # x−1 is slot k−1
+    else: np.bitwise_or(dst[:-1], src[1:], out=dst[:-1])          # x+1 is slot k+1
+    if q == 1 and H & 1: dst[-1] = False
+
+class Frames:
+    """
+    F[t] = sites reachable from x0 within ≤ t ticks on a line of H sites (steppers.future_frames), stored as
+    Q[t] = F[t] restricted to class (x0 + t) & 1 only: [T+1, ⌈H/2⌉]. The other class of F[t] is Q[t−1].
+    """
+    def __init__(self, H, T, x0):
+        self.H, self.T, self.x0, self.Hh = H, T, x0, (H + 1) // 2
+        Q = self.Q = np.zeros((T+2, self.Hh), dtype=bool)  # row T+1 stays empty and stands in for Q[−1]
+        Q[0, x0 // 2] = True
+        for t in range(1, T+1):
+            q = (x0 + t) & 1
+            if t >= 2: Q[t] = Q[t-2]
+            step1(Q[t-1], Q[t], q, H)
+
+    def half(self, t, q):
+        """Class q of F[t], packed."""
+        return self.Q[t] if (self.x0 + t) & 1 == q else self.Q[t-1]
+
+    def row(self, t, out=None):
+        out = np.zeros(self.H, dtype=bool) if out is None else out
+        for q in (0, 1):
+            n = len(range(q, self.H, 2))
+            out[q::2] = self.half(t, q)[:n]
+        return out
+
+    def dense(self):
+        """The full [T+1, H] frame stack of steppers.future_frames."""
+        F = np.empty((self.T+1, self.H), dtype=bool)
+        for t in range(self.T+1): self.row(t, F[t])
+        return F
+
+def future_frames(H, T, x0):
+    return Frames(H, T, x0)
+
+def overlaps(F, G, T):
+    """|F[t] ∧ G[T−t]| for t = 0..T, counted class by class on the packed halves."""
+    buf = np.empty(F.Hh, dtype=bool)
+    out = np.empty(T+1, dtype=np.int64)
+    for t in range(T+1):
+        n = 0
+        for q in (0, 1):
+            np.bitwise_and(F.half(t, q), G.half(T - t, q), out=buf)
+            n += int(np.count_nonzero(buf))
+        out[t] = n
+    return out
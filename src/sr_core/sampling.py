@@ -0,0 +1,92 @@
+# Variance-reduced per-tick direction sampling for the symmetrised walkers. Every scheme keeps each agent's
+# (θ, r) uniform on [0, 2π) × [0, 1) and independent across ticks, so the walk law is unchanged; only the
+# correlation between agents within a tick differs:
+#   iid         plain Monte Carlo (the legacy draws, bit-identical);
+#   antithetic  agents in groups of four share a base (θ, r): angles θ + kπ/2, rounding uniform r, 1−r, r, 1−r.
+#               For the R,L,U,D rounding rule that quadruple is an exact D4 orbit, so a rule that is rotation
+#               equivariant contributes no covariance anisotropy at all; what is left is the rule's own bias
+#               (or boundary clipping), which every agent's unchanged marginal law still estimates without bias;
+#   stratified  Latin hypercube per block: θ strata in agent order, r strata randomly permuted each tick;
+#   halton      2D Halton (bases 2, 3) points, Cranley–Patterson shifted by a fresh uniform each tick.
+# Agents are split into independent blocks (replicates) so the remaining error can be estimated by a jackknife
+# over block sums even when agents within a block are correlated. With crn, tick t draws from its own stream
+# seeded by (seed, ..., t), so runs that differ only in T, H/W or tol reuse the same random numbers.
+
+import math
+import numpy as np
+
+SAMPLERS = ("iid", "antithetic", "stratified", "halton")
+
+def radical_inverse(i, base):
+    """Van der Corput radical inverse of integer array i in `base`."""
+    i = np.asarray(i, dtype=np.int64).copy()
+    out = np.zeros(i.shape, dtype=np.float64)
+    f = 1.0 / base
+    while (i > 0).any():
+        out += f * (i % base)
+        i //= base; f /= base
+    return out
+
+def halton(n, bases=(2, 3)):
+    """First n points of the Halton sequence (index 0 is the origin), shape [n, len(bases)]."""
+    idx = np.arange(n)
+    return np.stack([radical_inverse(idx, b) for b in bases], axis=1)
+
+def blocks(n, k):
+    """Contiguous split of n agents into k near-equal blocks as (start, stop) pairs."""
+    edges = np.linspace(0, n, max(1, min(k, n)) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:])]
+
+class DirectionSampler:
+    """Per-tick (thetas, r) for n agents under one scheme; `replicates` independent blocks; crn = stream key."""
+    def __init__(self, kind, n, rng, replicates=1, crn=None):
+        if kind not in SAMPLERS: raise ValueError(f"unknown sampler {kind!r} (choose from {', '.join(SAMPLERS)})")
+        self.kind, self.n, self.rng, self.crn = kind, n, rng, crn
+        self.spans = blocks(n, replicates)
+        size = np.concatenate([np.full(b - a, b - a) for a, b in self.spans])
+        self.block = np.repeat(np.arange(len(self.spans)), [b - a for a, b in self.spans])
+        self.start = np.repeat([a for a, _ in self.spans], [b - a for a, b in self.spans])
+        self.j = np.arange(n) - self.start
+        if kind == "antithetic":
+            per = np.array([(b - a + 3) // 4 for a, b in self.spans])  # groups never straddle blocks
+            self.group = np.concatenate([[0], np.cumsum(per)[:-1]])[self.block] + self.j // 4
+            self.n_groups = int(per.sum())
+            self.rot = (self.j % 4) * 0.25
+        elif kind == "stratified":
+            self.size = size.astype(np.float64)
+        elif kind == "halton":
+            self.pts = np.concatenate([halton(b - a) for a, b in self.spans])
+
+    def stream(self, t):
+        return self.rng if self.crn is None else np.random.default_rng([*self.crn, t])
+
+    def draw(self, t):
+        g = self.stream(t)
+        if self.kind == "iid":
+            return g.uniform(0.0, 2.0 * math.pi, size=self.n), g.random(self.n)
+        if self.kind == "antithetic":
+            u = (g.random(self.n_groups)[self.group] + self.rot) % 1.0
+            r = g.random(self.n_groups)[self.group]
+            return 2.0 * math.pi * u, np.where(self.j % 2 == 1, 1.0 - r, r)
+        if self.kind == "stratified":
+            jit = g.random((self.n, 2))
+            u = (self._perm(g) + jit[:, 0]) / self.size
+            r = (self._perm(g) + jit[:, 1]) / self.size
+            return 2.0 * math.pi * u, r
+        shift = g.random((len(self.spans), 2))[self.block]
+        p = (self.pts[self._perm(g) + self.start] + shift) % 1.0
+        return 2.0 * math.pi * p[:, 0], p[:, 1]
+
+    def draw_into(self, t, th, r):
+        """draw() into preallocated float32/float64 buffers; the iid path fills them in place (same stream)."""
+        if self.kind == "iid":
+            g = self.stream(t)
+            g.random(dtype=th.dtype, out=th); np.multiply(th, 2.0 * math.pi, out=th)
+            g.random(dtype=r.dtype, out=r)
+        else:
+            a, b = self.draw(t)
+            np.copyto(th, a, casting="same_kind"); np.copyto(r, b, casting="same_kind")
+
+    def _perm(self, g):
+        """Fresh within-block permutation of stratum/point indices, so no two agents stay paired across ticks."""
+        return np.concatenate([g.permutation(b - a) for a, b in self.spans])
@@ -0,0 +1,28 @@
+# Multi-horizon snapshots: record a script's metrics at a list of ticks during one evolution instead of rerunning
+# it once per horizon. Every row holds the keys a fresh run with T = that tick would report (same seed, same
+# draws: all steppers consume randomness tick by tick, so a run to T is a prefix-extension of a run to any t < T).
+
+def add_argument(ap):
+    ap.add_argument("--snapshots", type=str, default=None, metavar="T1,T2,...",
+                    help="also record the metrics at these ticks (comma list and/or inclusive lo:hi:step ranges, "
+                         "all <= T) in one run; reported as a per-horizon table under 'snapshots'")
+
+def parse(spec, T):
+    """Sorted distinct ticks in 1..T from 'a,b,c' / 'lo:hi:step' items; [] for an empty spec."""
+    ticks = set()
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item: continue
+        try:
+            if ":" in item:
+                lo, hi, *st = (int(x) for x in item.split(":"))
+                step = st[0] if st else 1
+                if step <= 0 or len(st) > 1: raise ValueError
+                ticks.update(range(lo, hi + 1, step))
+            else:
+                ticks.add(int(item))
+        except ValueError:
+            raise ValueError(f"bad snapshot item {item!r} (integers or lo:hi:step)") from None
+    bad = [t for t in ticks if not 1 <= t <= T]
+    if bad: raise ValueError(f"snapshot ticks must lie in 1..T={T}: {sorted(bad)}")
+    return sorted(ticks)
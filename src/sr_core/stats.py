@@ -0,0 +1,100 @@
+# Sequential Monte Carlo stopping: agents are simulated in independent batches, each batch reduces to a vector of
+# sufficient statistics (counts and raw moment sums), and the score is a smooth function of the pooled sums.
+# A delete-one-batch jackknife over those vectors gives standard errors, so the confidence interval needs no
+# per-agent storage and no closed-form delta method per score.
+# Repeated looks: the stopping rule is checked only at a planned, geometrically spaced set of batch counts, and the
+# error rate is split over them (Bonferroni alpha spending), so "pass"/"fail" keep their stated level however the
+# run ends. Bias: an anisotropy score such as |λ1−λ2|/(λ1+λ2) is a norm and sits above its true value near 0. A score
+# given as components (whose Euclidean norm is the score) is bounded by the range of the norm over the box of
+# component intervals, which stays valid at 0. A scalar score is centred on its jackknife bias-corrected estimate.
+
+import math
+from statistics import NormalDist
+import numpy as np
+
+def z_value(confidence):
+    """Two-sided normal quantile for a confidence level in (0, 1)."""
+    if not 0.0 < confidence < 1.0: raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def _leave_one_out(stat, sums):
+    sums = np.asarray(sums, dtype=np.float64)
+    total = sums.sum(axis=0)
+    est = stat(total)
+    if len(sums) < 2: return est, None
+    return est, np.array([stat(total - s) for s in sums])
+
+def jackknife(stat, sums):
+    """(estimate, standard error) of stat(pooled sums) from per-batch sum vectors sums [k, m] (k >= 2).
+    A vector-valued stat gets one standard error per component."""
+    est, loo = _leave_one_out(stat, sums)
+    if loo is None: return est, (math.inf if np.ndim(est) == 0 else np.full(np.shape(est), math.inf))
+    k = len(loo)
+    se = np.sqrt((k - 1) / k * ((loo - loo.mean(axis=0)) ** 2).sum(axis=0))
+    return est, (float(se) if se.ndim == 0 else se)
+
+def score_interval(stat, sums, z):
+    """
+    (score, debiased score, [lo, hi], se) at normal quantile z per component.
+    Scalar stat: the score; the interval is centred on the jackknife bias-corrected estimate.
+    Vector stat: components whose Euclidean norm is the score; [lo, hi] is the range of the norm over the box of
+    component intervals, so it covers the score whenever the box covers the components.
+    """
+    est, loo = _leave_one_out(stat, sums)
+    if np.ndim(est) == 0:
+        _, se = jackknife(stat, sums)
+        k = len(sums)
+        deb = float(est) if loo is None else float(k * est - (k - 1) * loo.mean())
+        return float(est), deb, [deb - z * se, deb + z * se], se
+    c, se_c = jackknife(stat, sums)
+    lo_c, hi_c = c - z * se_c, c + z * se_c
+    lo = float(np.linalg.norm(np.clip(0.0, lo_c, hi_c)))       # nearest point of the box to the origin
+    hi = float(np.linalg.norm(np.maximum(abs(lo_c), abs(hi_c))))  # farthest corner
+    score = float(np.linalg.norm(c))
+    deb = math.sqrt(max(0.0, score * score - float((se_c ** 2).sum())))  # E|ĉ|² = |c|² + Σ var
+    se = jackknife(lambda m: float(np.linalg.norm(stat(m))), sums)[1]
+    return score, deb, [lo, hi], se
+
+def look_schedule(n_batches, first, growth=1.5):
+    """Batch counts at which the stopping rule is checked: first, then ×growth, always ending with n_batches."""
+    looks, k = [], max(1, min(first, n_batches))
+    while k < n_batches:
+        looks.append(k); k = max(k + 1, math.ceil(k * growth))
+    return looks + [n_batches]
+
+def sequential(run_batch, stat, tol, budget, batch, confidence=0.95, min_batches=8, growth=1.5):
+    """
+    Run run_batch(n) -> sum vector until the score's interval clears tol on either side at a planned look, or budget
+    agents are used. stat(sums) is the score, or a vector of components whose norm is the score (see score_interval).
+    Each of the K planned looks (and each of p components) gets error (1 − confidence)/(K·p), so with probability
+    >= confidence every interval covers the true score and neither "pass" nor "fail" is wrong (up to the normal
+    approximation of the batch jackknife); "budget" makes no claim. A look whose standard error is exactly 0 (every
+    batch gave the same score, e.g. cancelled by construction) is no evidence and decides nothing.
+    Returns the pooled sums and a report dict (estimate, estimate_debiased, se, ci, looks, decision, ...).
+    """
+    if batch <= 0 or budget <= 0: raise ValueError(f"batch and budget must be positive, got {batch}, {budget}")
+    if not 0.0 < confidence < 1.0: raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    looks = look_schedule(math.ceil(budget / batch), max(2, min_batches), growth)
+    at = set(looks)
+    sums, used, z, n_looks = [], 0, None, 0
+    while used < budget:
+        n = min(batch, budget - used)
+        sums.append(np.asarray(run_batch(n), dtype=np.float64)); used += n
+        if z is None:
+            p = int(np.size(stat(sums[0])))
+            look_conf = 1.0 - (1.0 - confidence) / (len(looks) * p)
+            z = z_value(look_conf)
+        if len(sums) not in at: continue
+        n_looks += 1
+        est, deb, (lo, hi), se = score_interval(stat, sums, z)
+        decided = se > 0 and (hi <= tol or lo > tol)
+        if decided: break
+    decision = ("pass" if hi <= tol else "fail") if decided else "budget"
+    report = {"estimate": est, "estimate_debiased": deb, "se": se, "ci": [lo, hi], "confidence": confidence,
+              "look_confidence": look_conf, "looks_planned": looks, "looks_used": n_looks,
+              "agents_used": used, "agents_budget": budget, "batch": batch, "batches": len(sums),
+              "decision": decision,
+              "error_guarantee": f"P(wrong pass/fail) <= {1.0 - confidence:.3g} across all looks: Bonferroni over "
+                                 f"{len(looks)} planned looks x {p} component(s), batch-jackknife normal approximation; "
+                                 "'budget' makes no claim; a zero standard error decides nothing"}
+    return np.sum(sums, axis=0), report
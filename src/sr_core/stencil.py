@@ -0,0 +1,170 @@
+# Stencil compiler for 2D one-step/tick reachability: neighbour offset sets + tick schedules.
+# An offset (d0, d1) moves an active site (i, j) to (i+d0, j+d1); no wrap. Each stencil compiles to a
+# kernel apply(src, out, r0, r1) that writes rows r0:r1 of out = OR of shifted src, in place:
+#   numpy  — one slice-OR per offset straight into `out` (no temporaries)
+#   packed — rows bit-packed into uint64 words; one carry-shift per distinct d1 into a reused
+#            buffer, then one row-slice OR per offset (64 cells per machine op)
+#   torch  — in-place slice-OR on a bool tensor
+#
+# Schedule spec (string):
+#   axial | staggered | random             legacy names (cycle:axial / cycle:axial,diag / random:diag=1,axial=1)
+#   <stencil>                              same stencil every tick
+#   cycle:s1,s2,...                        periodic sequence
+#   random:s1=w1,s2=w2,...                 one draw per tick with the given weights
+#   @path                                  user list: one stencil per line, cycled
+# Stencil: a name in STENCILS or custom offsets "d0:d1;d0:d1;..." (e.g. "1:2;-1:2;2:1").
+
+import threading
+import numpy as np
+from sr_core.backend import get_torch
+
+_AXIAL = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+_DIAG  = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+STENCILS = {
+    "axial":  _AXIAL,
+    "diag":   _DIAG,
+    "moore":  _AXIAL + _DIAG,
+    "knight": [(a*p, b*q) for a, b in ((1, 2), (2, 1)) for p in (1, -1) for q in (1, -1)],
+    "hex":    _AXIAL + [(1, -1), (-1, 1)],  # hexagonal lattice in axial (skewed) coordinates
+}
+LEGACY = {"axial": "cycle:axial", "staggered": "cycle:axial,diag", "random": "random:diag=1,axial=1"}
+
+def parse_stencil(spec):
+    if spec in STENCILS: return list(STENCILS[spec])
+    try:
+        offs = [tuple(int(x) for x in p.split(":")) for p in spec.split(";") if p.strip()]
+    except ValueError:
+        raise ValueError(f"unknown stencil {spec!r} (names: {', '.join(STENCILS)}, or 'd0:d1;d0:d1;...')")
+    if not offs or any(len(o) != 2 for o in offs): raise ValueError(f"bad stencil offsets {spec!r}")
+    return sorted(set(offs), key=offs.index)
+
+class Schedule:
+    """Compiled tick schedule: the distinct stencils and a per-tick index into them."""
+    def __init__(self, spec):
+        spec = LEGACY.get(spec, spec)
+        self.spec = spec
+        self.mode, self.weights = "cycle", None
+        if spec.startswith("@"):
+            with open(spec[1:]) as f: names = [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+        elif spec.startswith("cycle:"):
+            names = [s for s in spec[6:].split(",") if s]
+        elif spec.startswith("random:"):
+            self.mode = "random"
+            names, w = [], []
+            for item in spec[7:].split(","):
+                name, _, wt = item.partition("=")
+                names.append(name); w.append(float(wt) if wt else 1.0)
+            w = np.asarray(w, dtype=float)
+            if (w < 0).any() or w.sum() <= 0: raise ValueError(f"bad weights in {spec!r}")
+            self.weights = np.cumsum(w) / w.sum()
+        else:
+            names = [spec]
+        if not names: raise ValueError(f"empty schedule {spec!r}")
+        self.names = names
+        self.uniq = sorted(set(names), key=names.index)
+        self.stencils = [parse_stencil(n) for n in self.uniq]
+        self.seq = [self.uniq.index(n) for n in names]
+
+    def ticks(self, T, rng, start=0):
+        """Yield the stencil index for ticks start..T-1 (random mode: one rng.random() per tick)."""
+        if self.mode == "random":
+            for _ in range(start, T):
+                yield self.seq[int(np.searchsorted(self.weights, rng.random(), side="right"))]
+        else:
+            n = len(self.seq)
+            for t in range(start, T):
+                yield self.seq[t % n]
+
+def _spans(d, n):
+    """(dst slice, src slice) along one axis of length n for a shift by d (no wrap)."""
+    if abs(d) >= n: return (slice(0, 0), slice(0, 0))
+    return (slice(max(d, 0), n + min(d, 0)), slice(max(-d, 0), n - max(d, 0)))
+
+def _rows(d0, H, r0, r1):
+    a = max(r0, d0, 0); b = min(r1, H + d0, H)
+    return a, b, a - d0, b - d0
+
+class Kernel:
+    """One stencil compiled for a (H, W) grid on a backend: numpy | packed | torch."""
+    def __init__(self, offsets, H, W, backend="numpy"):
+        self.offsets, self.H, self.W, self.backend = list(offsets), H, W, backend
+        if backend == "packed":
+            self.nw = (W + 63) // 64
+            self.by_d1 = {}
+            for d0, d1 in self.offsets:
+                if abs(d1) >= 64: raise ValueError("packed backend supports |d1| < 64")
+                self.by_d1.setdefault(d1, []).append(d0)
+            self.local = threading.local()  # shifted-row scratch per thread (stripe + halo rows; halos overlap)
+            self.tail = last_word_mask(W)
+        else:
+            self.cols = [(d0,) + _spans(d1, W) for d0, d1 in self.offsets]
+
+    def apply(self, src, out, r0=0, r1=None):
+        r1 = self.H if r1 is None else r1
+        out[r0:r1] = 0
+        if self.backend == "packed": return self._apply_packed(src, out, r0, r1)
+        torch = self.backend == "torch"
+        for d0, cd, cs in self.cols:
+            a, b, sa, sb = _rows(d0, self.H, r0, r1)
+            if a >= b: continue
+            if torch: out[a:b, cd] |= src[sa:sb, cs]
+            else: np.bitwise_or(out[a:b, cd], src[sa:sb, cs], out=out[a:b, cd])
+        return out
+
+    def _buf(self, rows):
+        """This thread's scratch, at least `rows` tall: a stripe plus its halo, not the whole grid."""
+        buf = getattr(self.local, "buf", None)
+        if buf is None or buf.shape[0] < rows: buf = self.local.buf = np.empty((rows, self.nw), dtype=np.uint64)
+        return buf[:rows]
+
+    def _apply_packed(self, src, out, r0, r1):
+        H = self.H
+        for d1, d0s in self.by_d1.items():
+            s0 = max(0, r0 - max(d0s)); s1 = min(H, r1 - min(d0s))
+            if s0 >= s1: continue
+            sh = shift_cols_packed(src[s0:s1], d1, self._buf(s1 - s0))
+            sh[:, -1] &= self.tail
+            for d0 in d0s:
+                a, b, sa, sb = _rows(d0, H, r0, r1)
+                if a < b: np.bitwise_or(out[a:b], sh[sa-s0:sb-s0], out=out[a:b])
+        return out
+
+def last_word_mask(W):
+    r = W % 64
+    return np.uint64(0xFFFFFFFFFFFFFFFF if r == 0 else (1 << r) - 1)
+
+def shift_cols_packed(x, d, out):
+    """Shift packed rows by d columns (bit i -> bit i+d, little-endian words), zero fill; writes `out`."""
+    if d == 0:
+        out[...] = x; return out
+    k = np.uint64(abs(d)); c = np.uint64(64 - abs(d))
+    if d > 0:
+        np.left_shift(x, k, out=out)
+        out[:, 1:] |= x[:, :-1] >> c
+    else:
+        np.right_shift(x, k, out=out)
+        out[:, :-1] |= x[:, 1:] << c
+    return out
+
+def pack(mask):
+    """bool [H, W] -> uint64 [H, ceil(W/64)] (column j = bit j%64 of word j//64)."""
+    H, W = mask.shape
+    nw = (W + 63) // 64
+    b = np.packbits(mask, axis=1, bitorder="little")
+    pad = np.zeros((H, nw*8), dtype=np.uint8); pad[:, :b.shape[1]] = b
+    return pad.view("<u8").astype(np.uint64, copy=False)
+
+def unpack(words, W):
+    b = np.ascontiguousarray(words).astype("<u8", copy=False).view(np.uint8)
+    return np.unpackbits(b, axis=1, count=W, bitorder="little").astype(bool)
+
+def compile_schedule(schedule, H, W, backend="numpy"):
+    """Kernels for every distinct stencil of a Schedule, in Schedule.uniq order."""
+    return [Kernel(offs, H, W, backend) for offs in schedule.stencils]
+
+def zeros(H, W, backend="numpy", device=None):
+    if backend == "packed": return np.zeros((H, (W + 63) // 64), dtype=np.uint64)
+    if backend == "torch":
+        torch = get_torch()
+        return torch.zeros((H, W), dtype=torch.bool, device=device)
+    return np.zeros((H, W), dtype=bool)
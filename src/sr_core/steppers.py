@@ -0,0 +1,130 @@
+# Implicit trace operator S (von-Neumann neighbour shifts, no wrap) for 1D lines and 2D grids,
+# on numpy or torch, plus the shared single-origin light-cone evolution and L1 metrics.
+
+import numpy as np
+import sr_perf
+from sr_core.backend import get_torch, device_str
+
+# ------- implicit S application (4-neighbor, no wrap) -------
+# Each stepper writes into `out` when given (a reusable buffer that must not alias v; callers ping-pong two
+# state buffers) and only allocates when called without one.
+def apply_S_numpy(v, out=None):  # v: [H,W] bool
+    H, W = v.shape
+    if out is None: y = np.zeros_like(v, dtype=bool)
+    else: y = out; y[...] = False
+    # up
+    y[0:H-1, :] |= v[1:H, :]
+    # down
+    y[1:H,   :] |= v[0:H-1, :]
+    # left
+    y[:, 0:W-1] |= v[:, 1:W]
+    # right
+    y[:, 1:W  ] |= v[:, 0:W-1]
+    return y
+
+def apply_S_torch(v, out=None):  # v: [H,W] bool tensor
+    torch = get_torch()
+    H, W = v.shape
+    if out is None: y = torch.zeros_like(v, dtype=torch.bool)
+    else: y = out.zero_()
+    y[0:H-1, :] |= v[1:H, :]
+    y[1:H,   :] |= v[0:H-1, :]
+    y[:, 0:W-1] |= v[:, 1:W]
+    y[:, 1:W  ] |= v[:, 0:W-1]
+    return y
+
+# ------- 1D line (2-neighbor; subset of 4-nbr in 2D) -------
+def apply_S1_numpy(v, out=None):  # v:[H] bool
+    H = v.shape[0]
+    if out is None: y = np.zeros_like(v, dtype=bool)
+    else: y = out; y[...] = False
+    y[0:H-1] |= v[1:H]
+    y[1:H  ] |= v[0:H-1]
+    return y
+
+def apply_S1_torch(v, out=None):  # v:[H] torch.bool
+    torch = get_torch()
+    H = v.shape[0]
+    if out is None: y = torch.zeros_like(v, dtype=torch.bool)
+    else: y = out.zero_()
+    y[0:H-1] |= v[1:H]
+    y[1:H  ] |= v[0:H-1]
+    return y
+
+def future_frames(H, T, x0, device=None):
+    """Return F[t,:] = set of sites reachable from (t=0, x0) within <=t ticks (inclusive)."""
+    F = np.empty((T+1, H), dtype=bool)
+    if device is not None:
+        torch = get_torch()
+        v = torch.zeros((H,), dtype=torch.bool, device=device); v[x0]=True
+        nxt = torch.empty_like(v)
+        acc = v.clone()
+        F[0] = acc.detach().cpu().numpy()
+        for t in range(1, T+1):
+            apply_S1_torch(v, out=nxt); v, nxt = nxt, v
+            acc |= v
+            with sr_perf.stage("host_copy"):
+                F[t] = acc.detach().cpu().numpy()
+        return F
+    v = np.zeros((H,), dtype=bool); v[x0]=True
+    nxt = np.empty_like(v)
+    acc = v.copy()
+    F[0] = acc
+    for t in range(1, T+1):
+        apply_S1_numpy(v, out=nxt); v, nxt = nxt, v
+        np.bitwise_or(acc, v, out=acc)
+        F[t] = acc
+    return F
+
+# ------- 2D single-origin light cone -------
+def lightcone_frames(H, W, T, device=None):
+    """Accumulated front [T+1,H,W] (uint8) from a centred origin; returns (front, device string).
+    v and its scratch buffer alternate roles each tick; acc is updated in place and copied into the frame stack."""
+    cx, cy = W//2, H//2
+    with sr_perf.stage("stack_frames"):
+        front = np.empty((T+1, H, W), dtype=np.uint8)
+    if device is not None:
+        torch = get_torch()
+        v = torch.zeros((H,W), dtype=torch.bool, device=device)
+        v[cy, cx] = True
+        nxt = torch.empty_like(v)
+        acc = v.clone()
+        front[0] = acc.detach().cpu().numpy()
+        with sr_perf.stage("evolve", ticks=T, cells=T*H*W):
+            for t in range(1, T+1):
+                apply_S_torch(v, out=nxt); v, nxt = nxt, v
+                acc |= v
+                with sr_perf.stage("host_copy"):
+                    front[t] = acc.detach().cpu().numpy()
+    else:
+        v = np.zeros((H,W), dtype=bool)
+        v[cy, cx] = True
+        nxt = np.empty_like(v)
+        acc = v.copy()
+        front[0] = acc
+        with sr_perf.stage("evolve", ticks=T, cells=T*H*W):
+            for t in range(1, T+1):
+                apply_S_numpy(v, out=nxt); v, nxt = nxt, v
+                np.bitwise_or(acc, v, out=acc)
+                front[t] = acc
+    return front, device_str(device)
+
+def l1_lightcone_mask(H, W, T):
+    yy, xx = np.mgrid[0:H, 0:W]
+    cx, cy = W//2, H//2
+    d1 = np.abs(xx-cx)+np.abs(yy-cy)
+    return np.stack([(d1<=t) for t in range(T+1)], axis=0)
+
+def causality_metrics(front, ideal):
+    """Mean over ticks of (arrived fraction inside the L1 cone, violation fraction outside it)."""
+    assert front.shape == ideal.shape
+    T1, H, W = front.shape
+    arrived, viols = [], []
+    for t in range(T1):
+        inside  = ideal[t]
+        outside = ~inside
+        active  = front[t].astype(bool)
+        ni = int(inside.sum()); no = int(outside.sum())
+        arrived.append( float((active & inside).sum())  / max(1, ni) )
+        viols.append(   float((active & outside).sum()) / max(1, no) )
+    return float(np.mean(arrived)), float(np.mean(viols))
@@ -0,0 +1,134 @@
+# Symmetry-reduced stepping for centred single-origin runs. With H and W odd the origin (H//2, W//2) has equal
+# margins on every side, and a stencil closed under both axis reflections (d0, d1) → (−d0, d1), (d0, −d1) keeps
+# the front symmetric under them forever, so the quadrant a = i − H//2 ≥ 0, b = j − W//2 ≥ 0 determines it.
+# Quadrant keeps that quadrant with R0 ghost rows / R1 ghost columns (R = stencil reach) on its low sides; before
+# each tick the ghosts are refilled as mirror images of rows/columns 1..R (zero past the grid edge), then the
+# ordinary sr_core.stencil kernel runs on the padded array. Counts unfold with multiplicity 4 (interior), 2 (on an
+# axis) and 1 (the origin); fronts unfold by flipping. Work and memory drop ~4×.
+# (The diagonal reflection of D4 would halve that again, but it needs H = W and a triangular domain that slice
+# kernels cannot step; the quadrant only needs axis reflections, so it also covers rectangles and knight moves.)
+
+import numpy as np
+import sr_perf
+from sr_core import stencil
+
+MODES = ("auto", "quadrant", "full")
+
+def mirror_symmetric(offsets):
+    s = set(map(tuple, offsets))
+    return all((-d0, d1) in s and (d0, -d1) in s for d0, d1 in s)
+
+def resolve(mode, H, W, stencils, eligible=True):
+    """Whether to run the quadrant: 'full' never; 'quadrant' always (ValueError if the run is not symmetric);
+    'auto' when symmetric and `eligible` (the caller's full-grid-only options are off)."""
+    if mode not in MODES: raise ValueError(f"symmetry must be one of {MODES}")
+    sym = bool(H & W & 1) and all(mirror_symmetric(s) for s in stencils)
+    if mode == "full": return False
+    if mode == "quadrant":
+        if not sym: raise ValueError("--symmetry quadrant needs odd H and W and stencils closed under axis reflections")
+        return True
+    return sym and eligible
+
+def weighted_count(X):
+    """Number of full-grid sites a quadrant mask stands for (axis rows/columns count twice, not four times)."""
+    return (4*int(np.count_nonzero(X)) - 2*int(np.count_nonzero(X[0])) - 2*int(np.count_nonzero(X[:, 0]))
+            + int(X[0, 0]))
+
+def unfold(Q, H, W, out=None):
+    """Full H×W grid from its quadrant by reflection across both axes."""
+    cy, cx = H//2, W//2
+    out = np.empty((H, W), dtype=Q.dtype) if out is None else out
+    out[cy:, cx:] = Q
+    out[:cy+1, cx:] = Q[::-1]
+    out[:, :cx+1] = out[:, cx:][:, ::-1]
+    return out
+
+class Unfolded:
+    """Read-only full-grid view of a quadrant, view[i, j] = Q[|i − H//2|, |j − W//2|] (for ray marching)."""
+    def __init__(self, Q, H, W):
+        self.Q, self.shape, self.c0, self.c1 = Q, (H, W), H//2, W//2
+
+    def __getitem__(self, ij):
+        i, j = ij
+        return self.Q[abs(i - self.c0), abs(j - self.c1)]
+
+class Quadrant:
+    """Front of the centred origin on the quadrant; one padded state buffer pair and the quadrant's acc."""
+    def __init__(self, H, W, stencils):
+        self.H, self.W = H, W
+        self.Hq, self.Wq = H - H//2, W - W//2
+        self.R0 = max(abs(d0) for s in stencils for d0, _ in s)
+        self.R1 = max(abs(d1) for s in stencils for _, d1 in s)
+        self.Hp, self.Wp = self.R0 + self.Hq, self.R1 + self.Wq
+        self.kernels = [stencil.Kernel(s, self.Hp, self.Wp) for s in stencils]
+        self.v = np.zeros((self.Hp, self.Wp), dtype=bool); self.nxt = np.zeros_like(self.v)
+        self.v[self.R0, self.R1] = True
+        self.acc = self.v[self.R0:, self.R1:].copy()
+
+    def _reflect(self, P):
+        """Refill the ghost columns (interior rows), then the ghost rows (full width, so corners follow)."""
+        R0, R1 = self.R0, self.R1
+        m = min(R1, self.Wq - 1); n = min(R0, self.Hq - 1)
+        P[R0:, :R1-m] = False
+        P[R0:, R1-m:R1] = P[R0:, R1+1:R1+m+1][:, ::-1]
+        P[:R0-n] = False
+        P[R0-n:R0] = P[R0+1:R0+n+1][::-1]
+
+    def step(self, k=0):
+        self._reflect(self.v)
+        self.kernels[k].apply(self.v, self.nxt, self.R0, self.Hp)  # quadrant rows only
+        self.v, self.nxt = self.nxt, self.v
+        np.bitwise_or(self.acc, self.v[self.R0:, self.R1:], out=self.acc)
+
+    def view(self):
+        return Unfolded(self.acc, self.H, self.W)
+
+    def unfold(self, out=None):
+        return unfold(self.acc, self.H, self.W, out)
+
+def evolve(H, W, T, sched, rng, on_tick=None):
+    """Quadrant run of a schedule (same rng draws as the full grid); on_tick(t, quadrant) after every tick."""
+    q = Quadrant(H, W, sched.stencils)
+    for t, k in enumerate(sched.ticks(T, rng), 1):
+        q.step(k)
+        if on_tick is not None: on_tick(t, q)
+    return q
+
+def lightcone(H, W, T, keep_frames=False, on_tick=None):
+    """
+    Centred axial light cone on the quadrant. Returns (arrived_fraction, violations_fraction, Quadrant, frames uint8
+    [T+1,H,W] or None) with the per-tick L1-cone metrics of steppers.causality_metrics, counted with multiplicities.
+    on_tick(t, quadrant, arrived, viols) after every tick (and at t = 0).
+    """
+    q = Quadrant(H, W, [stencil.STENCILS["axial"]])
+    dt = np.uint16 if H + W < np.iinfo(np.uint16).max else np.int32
+    d1 = np.add.outer(np.arange(q.Hq, dtype=dt), np.arange(q.Wq, dtype=dt))
+    dmax = int(d1[-1, -1])
+    di, dj = np.abs(np.arange(H) - H//2), np.abs(np.arange(W) - W//2)
+    inside = np.cumsum(np.convolve(np.bincount(di), np.bincount(dj)))  # full-grid sites with d1 ≤ t
+    tmp = np.empty_like(q.acc)
+    arrived, viols = [], []
+
+    def record(t):
+        np.less_equal(d1, min(t, dmax), out=tmp); np.bitwise_and(tmp, q.acc, out=tmp)
+        n_in = weighted_count(tmp); n = weighted_count(q.acc)
+        ni = int(inside[min(t, dmax)]); no = H*W - ni
+        arrived.append(float(n_in) / max(1, ni)); viols.append(float(n - n_in) / max(1, no))
+
+    frames = np.empty((T+1, H, W), dtype=np.uint8) if keep_frames else None
+    record(0)
+    if keep_frames: q.unfold(frames[0])
+    if on_tick is not None: on_tick(0, q, arrived, viols)
+    with sr_perf.stage("evolve", ticks=T, cells=T*q.Hp*q.Wp):
+        for t in range(1, T+1):
+            q.step()
+            record(t)
+            if keep_frames: q.unfold(frames[t])
+            if on_tick is not None: on_tick(t, q, arrived, viols)
+    q.d1 = d1
+    return float(np.mean(arrived)), float(np.mean(viols)), q, frames
+
+def max_l1(q):
+    """Largest L1 radius reached (quadrant coordinates are already distances)."""
+    ii, jj = np.nonzero(q.acc)
+    return int((ii + jj).max()) if len(ii) else 0
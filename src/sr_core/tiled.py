@@ -0,0 +1,100 @@
+# Tiled multithreaded stepping: the grid is split into row stripes, each tick every stripe computes its rows of
+# y = S(v) from the shared previous state (reading one halo row above/below), ORs them into acc, and reduces its
+# own per-tick counts. NumPy releases the GIL inside the slice kernels, so stripes run concurrently on a thread
+# pool; a stripe only ever writes its own rows, and the per-tick map is the barrier. Integer tile counts are
+# summed before any division, so metrics are bit-identical to the serial path.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import sr_perf
+from sr_core import stencil
+
+def resolve_threads(n):
+    """n <= 0 means one thread per CPU."""
+    return max(1, os.cpu_count() or 1) if n is None or n <= 0 else int(n)
+
+def stripes(H, n, min_rows=8):
+    """Split H rows into at most n contiguous (r0, r1) stripes of >= min_rows rows."""
+    n = max(1, min(n, H // max(1, min_rows) or 1))
+    edges = np.linspace(0, H, n + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+class TiledStepper:
+    """Ping-pong stepper over row stripes; kernels are sr_core.stencil Kernels (numpy or packed)."""
+    def __init__(self, kernels, v, threads):
+        self.kernels = kernels
+        self.v = v; self.nxt = np.zeros_like(v)
+        self.tiles = stripes(v.shape[0], threads)
+        self.pool = ThreadPoolExecutor(max_workers=len(self.tiles)) if len(self.tiles) > 1 else None
+
+    def map(self, fn):
+        if self.pool is None: return [fn(*t) for t in self.tiles]
+        return list(self.pool.map(lambda t: fn(*t), self.tiles))
+
+    def step(self, k, per_tile=None):
+        """One tick with kernel k; per_tile(r0, r1, y) runs on each stripe after its rows of y are final."""
+        src, dst, kern = self.v, self.nxt, self.kernels[k]
+        def work(r0, r1):
+            kern.apply(src, dst, r0, r1)
+            return per_tile(r0, r1, dst) if per_tile is not None else None
+        res = self.map(work)
+        self.v, self.nxt = dst, src
+        return res
+
+    def close(self):
+        if self.pool is not None: self.pool.shutdown()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def lightcone_stream(H, W, T, threads, keep_frames=False, state=None, frames_log=None, on_tick=None):
+    """
+    Single centred origin, axial stencil, T ticks on `threads` stripes with streaming L1-cone metrics.
+    Returns (arrived_fraction, violations_fraction, final acc, frames uint8 [T+1,H,W] or None).
+    Matches steppers.lightcone_frames + causality_metrics exactly.
+    state: {"t", "v", "acc", "arrived", "viols"} to continue from (checkpoint resume / extension);
+    frames_log: append-only sink for each tick's acc (instead of keep_frames); on_tick(t, v, acc, arrived, viols).
+    """
+    cx, cy = W//2, H//2
+    d1 = np.abs(np.arange(W)[None, :] - cx) + np.abs(np.arange(H)[:, None] - cy)  # L1 distance map
+    if state is None:
+        v = np.zeros((H, W), dtype=bool); v[cy, cx] = True
+        acc = v.copy(); t0 = 0
+        arrived, viols = None, None
+    else:
+        v, acc, t0 = state["v"].copy(), state["acc"].copy(), int(state["t"])
+        arrived, viols = list(state["arrived"]), list(state["viols"])
+        if keep_frames: raise ValueError("continuing a run needs a frames log, not in-memory frames")
+    frames = np.empty((T+1, H, W), dtype=np.uint8) if keep_frames else None
+    if keep_frames: frames[0] = acc
+
+    def counts(r0, r1, t):
+        a = acc[r0:r1]; inside = d1[r0:r1] <= t
+        ni = int(inside.sum())
+        n_in = int(np.count_nonzero(a & inside))
+        return ni, n_in, int(np.count_nonzero(a)) - n_in
+
+    def reduce(res):
+        ni = sum(r[0] for r in res); n_in = sum(r[1] for r in res); n_out = sum(r[2] for r in res)
+        no = H*W - ni
+        return float(n_in) / max(1, ni), float(n_out) / max(1, no)
+
+    kern = [stencil.Kernel(stencil.STENCILS["axial"], H, W)]
+    with TiledStepper(kern, v, threads) as st:
+        if arrived is None:
+            a0, v0 = reduce(st.map(lambda r0, r1: counts(r0, r1, 0)))
+            arrived, viols = [a0], [v0]
+            if frames_log is not None: frames_log.append(acc)
+            if on_tick is not None: on_tick(0, st.v, acc, arrived, viols)
+        with sr_perf.stage("evolve", ticks=T-t0, cells=(T-t0)*H*W):
+            for t in range(t0+1, T+1):
+                def tile(r0, r1, y, t=t):
+                    np.bitwise_or(acc[r0:r1], y[r0:r1], out=acc[r0:r1])
+                    if keep_frames: frames[t, r0:r1] = acc[r0:r1]
+                    return counts(r0, r1, t)
+                a_t, v_t = reduce(st.step(0, tile))
+                arrived.append(a_t); viols.append(v_t)
+                if frames_log is not None: frames_log.append(acc)
+                if on_tick is not None: on_tick(t, st.v, acc, arrived, viols)
+    return float(np.mean(arrived)), float(np.mean(viols)), acc, frames
@@ -0,0 +1,89 @@
+# Allocation-free tick for the 2D symmetrised walker: every scratch array (angles, cos/sin, normaliser, the two
+# running cumulative probabilities, the three branch selectors and the steps) is allocated once and updated with
+# out= ufuncs, and positions are stepped and clipped in place. The category is never materialised: with
+# selectors sel0 = r < pR, sel1 = r < pR+pL, sel2 = r < pR+pL+pU (nested, so sel0 ≤ sel1 ≤ sel2),
+#   R(+1,0), L(-1,0), U(0,+1), D(0,-1)  ⇔  dx = 2·sel0 − sel1,  dy = 2·sel2 − sel1 − 1.
+# The float64 path performs exactly the legacy operations (|c| = clip(c)+clip(−c), pR+pL = |c|/Z), so walks are
+# bit-identical; float32 directions halve the float traffic and are reproducible for a fixed seed. Positions are
+# int16 whenever the grid fits.
+
+import math
+import numpy as np
+from sr_core.backend import get_torch
+
+def position_dtype(H, W):
+    """Narrowest signed integer that holds every position and position ± 1."""
+    return np.int16 if max(H, W) < np.iinfo(np.int16).max else np.int32
+
+class WalkKernel:
+    """N agents on an H×W grid; fill .th/.r (or use draw()), then tick(); positions live in .xs/.ys."""
+    def __init__(self, N, H, W, dtype=np.float64, pos_dtype=None):
+        f = np.dtype(dtype)
+        pos = np.dtype(pos_dtype or position_dtype(H, W))
+        self.N, self.H, self.W = N, H, W
+        self.th, self.r = np.empty(N, f), np.empty(N, f)
+        self.c, self.s, self.z, self.p, self.q = (np.empty(N, f) for _ in range(5))
+        self.zero = np.empty(N, dtype=bool)
+        self.sel = np.empty((3, N), dtype=np.uint8)
+        self.dx, self.dy = np.empty(N, pos), np.empty(N, pos)
+        self.xs = np.full(N, H // 2, dtype=pos)
+        self.ys = np.full(N, W // 2, dtype=pos)
+
+    def draw(self, sampler, t):
+        sampler.draw_into(t, self.th, self.r)
+
+    def tick(self):
+        c, s, z, p, q, r = self.c, self.s, self.z, self.p, self.q, self.r
+        sel0, sel1, sel2 = self.sel
+        np.cos(self.th, out=c); np.sin(self.th, out=s)
+        # Z = |c| + |s| (exactly wxp + wxn + wyp + wyn)
+        np.abs(c, out=p); np.abs(s, out=z); np.add(p, z, out=z)
+        np.equal(z, 0.0, out=self.zero); np.copyto(z, 1e-12, where=self.zero)
+        np.maximum(c, 0.0, out=p); np.divide(p, z, out=p); np.less(r, p, out=sel0)       # r < pR
+        np.abs(c, out=q); np.divide(q, z, out=q); np.less(r, q, out=sel1)                # r < pR + pL
+        np.maximum(s, 0.0, out=p); np.divide(p, z, out=p)
+        np.add(q, p, out=q); np.less(r, q, out=sel2)                                     # r < pR + pL + pU
+        dx, dy = self.dx, self.dy
+        np.add(sel0, sel0, out=dx); np.subtract(dx, sel1, out=dx)
+        np.add(sel2, sel2, out=dy); np.subtract(dy, sel1, out=dy); np.subtract(dy, 1, out=dy)
+        np.add(self.xs, dx, out=self.xs); np.clip(self.xs, 0, self.H - 1, out=self.xs)
+        np.add(self.ys, dy, out=self.ys); np.clip(self.ys, 0, self.W - 1, out=self.ys)
+
+class TorchWalkKernel:
+    """Same tick on a torch device (legacy float32 directions, int32 positions, clamp(Z, 1e-12))."""
+    def __init__(self, N, H, W, device):
+        torch = self.torch = get_torch()
+        f, i = dict(dtype=torch.float32, device=device), dict(dtype=torch.int32, device=device)
+        self.N, self.H, self.W = N, H, W
+        self.th, self.r = torch.empty(N, **f), torch.empty(N, **f)
+        self.c, self.s, self.z, self.p, self.q = (torch.empty(N, **f) for _ in range(5))
+        self.sel = torch.empty((3, N), dtype=torch.bool, device=device)
+        self.isel = torch.empty((3, N), **i)
+        self.dx, self.dy = torch.empty(N, **i), torch.empty(N, **i)
+        self.xs = torch.full((N,), H // 2, **i)
+        self.ys = torch.full((N,), W // 2, **i)
+
+    def draw(self, sampler, t):
+        """sampler None: torch RNG (legacy draw order); otherwise copy a numpy DirectionSampler's draw."""
+        torch = self.torch
+        if sampler is None:
+            torch.rand(self.N, out=self.th); self.th.mul_(2.0 * math.pi)
+            torch.rand(self.N, out=self.r)
+        else:
+            th, r = sampler.draw(t)
+            self.th.copy_(torch.from_numpy(th)); self.r.copy_(torch.from_numpy(r))
+
+    def tick(self):
+        torch = self.torch
+        c, s, z, p, q, r = self.c, self.s, self.z, self.p, self.q, self.r
+        torch.cos(self.th, out=c); torch.sin(self.th, out=s)
+        torch.abs(c, out=p); torch.abs(s, out=z); z.add_(p).clamp_(min=1e-12)
+        torch.clamp(c, min=0.0, out=p); p.div_(z); torch.lt(r, p, out=self.sel[0])
+        torch.abs(c, out=q); q.div_(z); torch.lt(r, q, out=self.sel[1])
+        torch.clamp(s, min=0.0, out=p); p.div_(z); q.add_(p); torch.lt(r, q, out=self.sel[2])
+        self.isel.copy_(self.sel)
+        i0, i1, i2 = self.isel
+        torch.add(i0, i0, out=self.dx); self.dx.sub_(i1)
+        torch.add(i2, i2, out=self.dy); self.dy.sub_(i1).sub_(1)
+        self.xs.add_(self.dx).clamp_(0, self.H - 1)
+        self.ys.add_(self.dy).clamp_(0, self.W - 1)
@@ -0,0 +1,106 @@
+# Shared hot-path instrumentation for the SR poset scripts.
+# Enabled by `--profile[=CPROFILE_OUT]` or the SR_PROFILE environment variable (SR_PROFILE=1, or a path for a
+# cProfile dump). Disabled: stage() hands back one shared null context and count() returns at once.
+# Enabled: stage timers (wall/CPU/calls/tracemalloc peak), work counters with throughput, RSS peak.
+
+import contextlib, os, resource, sys, time, tracemalloc
+
+ENABLED = False
+_NULL = contextlib.nullcontext()
+_stages = {}
+_counters = {}
+_stack = []
+_t0 = 0.0
+_cpu0 = 0.0
+_prof = None
+_prof_path = None
+
+def init(flag=None):
+    """flag: value of --profile (None = not given, "" = bare flag, path = also dump cProfile stats)."""
+    global ENABLED, _t0, _cpu0, _prof, _prof_path
+    if flag is None:
+        env = os.environ.get("SR_PROFILE", "")
+        if env in ("", "0"):
+            ENABLED = False
+            return False
+        flag = "" if env == "1" else env
+    ENABLED = True
+    _stages.clear(); _counters.clear(); _stack.clear()
+    if not tracemalloc.is_tracing(): tracemalloc.start()
+    tracemalloc.reset_peak()
+    _prof_path = flag or None
+    if _prof_path:
+        import cProfile
+        _prof = cProfile.Profile(); _prof.enable()
+    _t0 = time.perf_counter(); _cpu0 = time.process_time()
+    return True
+
+def shutdown():
+    """Switch instrumentation off again and stop tracemalloc (long-lived processes that run many scripts)."""
+    global ENABLED, _prof
+    ENABLED = False
+    if _prof is not None: _prof.disable(); _prof = None
+    if tracemalloc.is_tracing(): tracemalloc.stop()
+
+class _Stage:
+    __slots__ = ("name", "units", "t", "c", "peak")
+    def __init__(self, name, units):
+        self.name = name; self.units = units
+    def __enter__(self):
+        cur, pk = tracemalloc.get_traced_memory()
+        if _stack: _stack[-1].peak = max(_stack[-1].peak, pk)
+        tracemalloc.reset_peak()
+        self.peak = cur
+        _stack.append(self)
+        self.t = time.perf_counter(); self.c = time.process_time()
+        return self
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self.t; dc = time.process_time() - self.c
+        _stack.pop()
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if _stack: _stack[-1].peak = max(_stack[-1].peak, self.peak)
+        rec = _stages.get(self.name)
+        if rec is None:
+            rec = _stages[self.name] = {"wall_s": 0.0, "cpu_s": 0.0, "calls": 0, "tracemalloc_peak_mb": 0.0, "units": {}}
+        rec["wall_s"] += dt; rec["cpu_s"] += dc; rec["calls"] += 1
+        rec["tracemalloc_peak_mb"] = max(rec["tracemalloc_peak_mb"], self.peak / 2**20)
+        for k, v in self.units.items():
+            rec["units"][k] = rec["units"].get(k, 0) + v
+        return False
+
+def stage(name, **units):
+    """Time a code region; keyword units (ticks=, cells=, pairs=...) accumulate for throughput."""
+    if not ENABLED: return _NULL
+    return _Stage(name, units)
+
+def count(name, n=1):
+    if not ENABLED: return
+    _counters[name] = _counters.get(name, 0) + n
+
+def report():
+    out = {"wall_s": time.perf_counter() - _t0, "cpu_s": time.process_time() - _cpu0, "stages": {}}
+    for name, rec in _stages.items():
+        r = {k: v for k, v in rec.items() if k != "units"}
+        for k, v in rec["units"].items():
+            r[k] = v
+            r[k + "_per_s"] = v / max(rec["wall_s"], 1e-12)
+        out["stages"][name] = r
+    if _counters: out["counters"] = dict(_counters)
+    out["tracemalloc_peak_mb"] = max([tracemalloc.get_traced_memory()[1] / 2**20]
+                                     + [r["tracemalloc_peak_mb"] for r in _stages.values()])
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out["rss_peak_mb"] = kb / (2**20 if sys.platform == "darwin" else 1024.0)
+    if _prof is not None:
+        _prof.disable(); _prof.dump_stats(_prof_path)
+        out["cprofile_dump"] = _prof_path
+    return out
+
+def attach(out):
+    """Add a "perf" block to a result dict when instrumentation is enabled; returns the dict."""
+    if ENABLED: out["perf"] = report()
+    return out
+
+def add_argument(ap):
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="CPROFILE_OUT",
+                    help="add a perf block to the JSON (stage timers, throughput, memory peaks); "
+                         "optional path also dumps cProfile stats (env: SR_PROFILE)")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# SR poset battery runner: imports each test's entry point in-process and runs independent tests
+# concurrently on a process pool (one fresh worker per test, heaviest first).
+# Writes sr_all_summary.json with per-test PASS, wall time, CPU time and peak RSS, plus "ALL_PASS".
+
+import argparse, json, os, sys, time, traceback
+from concurrent.futures import as_completed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path: sys.path.insert(0, HERE)
+
+from sr_core.entry import fresh_pool, run_entry, judge, usage
+
+# (name, module, full argv, fast argv, cost weight, pass rule)
+# pass rule None ⇒ every "PASS*" key in the JSON must be true; (key, tol) ⇒ result[key] <= tol.
+BATTERY = [
+    ("causality", "ca_sr_causality",
+     ["generate", "--H", "257", "--W", "257", "--T", "300", "--seed", "7", "--out-npz", "", "--out-json", ""],
+     ["generate", "--H", "65", "--W", "65", "--T", "30", "--out-npz", "", "--out-json", ""], 8, None),
+    ("lightcone", "ca_sr_lightcone",
+     ["--H", "257", "--W", "257", "--T", "256"],
+     ["--H", "65", "--W", "65", "--T", "30"], 8, None),
+    ("lightcone_parity", "ca_sr_lightcone",
+     ["--H", "257", "--W", "257", "--T", "256", "--parity"],
+     ["--H", "65", "--W", "65", "--T", "30", "--parity"], 2, None),
+    ("lightcone_full", "ca_sr_lightcone",
+     ["--H", "257", "--W", "257", "--T", "256", "--symmetry", "full"],
+     ["--H", "65", "--W", "65", "--T", "30", "--symmetry", "full"], 4, None),
+    ("lightcone_nd", "ca_sr_lightcone_nd",
+     ["--d", "3", "--T", "200"],
+     ["--d", "3", "--T", "40"], 4, None),
+    ("markov_propagate", "ca_sr_markov_propagate",
+     ["--H", "257", "--W", "257", "--T", "120", "--batch", "4", "--jump"],
+     ["--H", "65", "--W", "65", "--T", "30", "--jump"], 2, None),
+    ("propertime", "ca_sr_propertime",
+     ["--H", "1201", "--T", "400", "--v", "0.8"],
+     ["--H", "401", "--T", "200", "--v", "0.8"], 2, None),
+    ("propertime_orientation_2d", "ca_sr_propertime_orientation_2d",
+     ["--T", "400", "--v1", "0.8", "--angles", "12"],
+     ["--T", "200", "--v1", "0.8", "--angles", "6"], 1, None),
+    ("length_contraction", "ca_sr_length_contraction",
+     ["--H", "2401", "--T", "400", "--v", "0.6", "--L0", "200"],
+     ["--H", "801", "--T", "200", "--v", "0.6", "--L0", "100"], 4, None),
+    ("length_orientation", "ca_sr_length_orientation",
+     ["--T", "400", "--v", "0.6", "--L0", "200", "--angles", "8"],
+     ["--T", "400", "--v", "0.6", "--L0", "200", "--angles", "2"], 10, None),
+    ("minkowski_interval", "ca_sr_minkowski_interval",
+     ["--T", "1200", "--v", "0.8"],
+     ["--T", "400", "--v", "0.8"], 1, ("rel_err", 0.02)),
+    ("lorentz_sweep", "ca_sr_lorentz_sweep",
+     ["--T", "400"],
+     ["--T", "200"], 1, ("max_abs_err", 0.02)),
+    ("velocity_composition", "ca_sr_velocity_composition",
+     ["--T", "400", "--u", "0.4", "--v", "0.6"],
+     ["--T", "200", "--u", "0.4", "--v", "0.6"], 1, None),
+    ("simultaneity_flip", "ca_sr_simultaneity_flip",
+     ["--Tau", "200", "--v", "0.6", "--L", "200"],
+     ["--Tau", "100", "--v", "0.6", "--L", "100"], 1, None),
+    ("isotropy_symmetrized", "ca_sr_isotropy_symmetrized_v1",
+     ["--H", "1001", "--W", "1001", "--T", "300", "--N", "80000"],
+     ["--H", "201", "--W", "201", "--T", "100", "--N", "20000"], 20, None),
+    ("isotropy_audit", "ca_sr_isotropy_audit",
+     ["--H", "601", "--W", "601", "--T", "300", "--schedule", "staggered"],
+     ["--H", "201", "--W", "201", "--T", "100", "--schedule", "staggered"], 6, None),
+    ("isotropy_oracle", "ca_sr_isotropy_audit",
+     ["--H", "201", "--W", "201", "--T", "80", "--schedule", "random", "--mode", "check"],
+     ["--H", "121", "--W", "121", "--T", "40", "--schedule", "random", "--mode", "check"], 2, None),
+    ("isotropy_threads_packed", "ca_sr_isotropy_audit",
+     ["--H", "257", "--W", "257", "--T", "120", "--schedule", "staggered", "--packed", "--threads", "8",
+      "--verify-serial"],
+     ["--H", "257", "--W", "257", "--T", "120", "--schedule", "staggered", "--packed", "--threads", "8",
+      "--verify-serial"], 2, None),
+    ("isotropy_3d", "ca_sr_isotropy_3d",
+     ["--H", "201", "--W", "201", "--D", "201", "--T", "400", "--N", "60000"],
+     ["--H", "81", "--W", "81", "--D", "81", "--T", "40", "--N", "3000"], 50, None),
+    ("mm_order_fraction", "ca_sr_mm_order_fraction",
+     ["--T", "400", "--n_points", "20000", "--n_pairs", "40000"],
+     ["--T", "400", "--n_points", "5000", "--n_pairs", "10000"], 1, None),
+    ("mm_dimension_fit", "ca_sr_mm_dimension_fit",
+     ["--T", "400", "--n_points", "20000", "--n_pairs", "40000"],
+     ["--T", "400", "--n_points", "5000", "--n_pairs", "10000"], 1, None),
+    ("causet_2d", "ca_sr_causet_sprinkle",
+     ["--d", "2", "--n", "8000", "--fixed-n", "--out-dir", "", "--check-links", "64"],
+     ["--d", "2", "--n", "2000", "--fixed-n", "--out-dir", "", "--check-links", "64"], 2, None),
+    ("causet_3d", "ca_sr_causet_sprinkle",
+     ["--d", "3", "--n", "8000", "--fixed-n", "--out-dir", "", "--check-links", "64"],
+     ["--d", "3", "--n", "2000", "--fixed-n", "--out-dir", "", "--check-links", "64"], 2, None),
+    ("poisson_cone", "ca_sr_poisson_cone",
+     ["--T", "200", "--density", "4"],
+     ["--T", "100", "--density", "4"], 1, None),
+]
+
+def run_one(name, module, argv, rule):
+    """Worker body: run one test and attach timing / memory accounting."""
+    cpu0, _ = usage()
+    t0 = time.perf_counter()
+    rec = {"module": module, "argv": list(argv)}
+    try:
+        res = run_entry(module, argv)
+        rec["result"] = res
+        rec["PASS"] = judge(res, rule) is True  # a battery test that checks nothing does not pass
+    except BaseException:  # SystemExit from argparse/ValueError from guards land here too
+        rec["error"] = traceback.format_exc(limit=3)
+        rec["PASS"] = False
+    cpu1, rss_kb = usage()
+    rec["wall_s"] = time.perf_counter() - t0
+    rec["cpu_s"] = cpu1 - cpu0
+    rec["peak_rss_mb"] = rss_kb / 1024.0
+    return name, rec
+
+def main():
+    ap = argparse.ArgumentParser(description="Run the SR poset battery in-process on a process pool.")
+    ap.add_argument("--fast", action="store_true", help="smoke-sized parameters")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="concurrent worker processes")
+    ap.add_argument("--only", type=str, default=None, help="comma-separated subset of test names")
+    ap.add_argument("--out-json", type=str, default=os.path.join(HERE, "sr_all_summary.json"))
+    ap.add_argument("--no-cache", action="store_true", help="recompute every test (ignore the result cache)")
+    a = ap.parse_args()
+    if a.no_cache: os.environ["SR_CACHE"] = "0"  # inherited by the pool workers
+
+    tests = BATTERY
+    if a.only:
+        want = set(a.only.split(","))
+        unknown = want - {t[0] for t in BATTERY}
+        if unknown: ap.error(f"unknown tests: {sorted(unknown)}")
+        tests = [t for t in BATTERY if t[0] in want]
+    tests = sorted(tests, key=lambda t: t[4], reverse=True)  # heaviest first balances the pool
+
+    t0 = time.perf_counter()
+    recs = {}
+    # fresh interpreter per test so peak RSS / CPU are per test
+    with fresh_pool(max(1, a.jobs)) as ex:
+        futs = [ex.submit(run_one, name, mod, (fast if a.fast else full), rule)
+                for name, mod, full, fast, _w, rule in tests]
+        for f in as_completed(futs):
+            name, rec = f.result()
+            recs[name] = rec
+            print(f"[{'PASS' if rec['PASS'] else 'FAIL'}] {name}  {rec['wall_s']:.2f}s", file=sys.stderr)
+    wall = time.perf_counter() - t0
+
+    summary = {
+        "ALL_PASS": all(r["PASS"] for r in recs.values()),
+        "fast": a.fast,
+        "jobs": a.jobs,
+        "battery_wall_s": wall,
+        "sum_test_wall_s": sum(r["wall_s"] for r in recs.values()),
+        "tests": {t[0]: recs[t[0]] for t in sorted(tests)},
+    }
+    with open(a.out_json, "w") as f: json.dump(summary, f, indent=2)
+    print(json.dumps({k: v for k, v in summary.items() if k != "tests"}
+                     | {"PASS": {k: r["PASS"] for k, r in summary["tests"].items()}}, indent=2))
+    sys.exit(0 if summary["ALL_PASS"] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+# SR poset battery: ./sr_poset_all.sh [--fast] [--jobs N] ; writes sr_all_summary.json next to this script.
+set -euo pipefail
+cd "$(dirname "$0")"
+exec "${PYTHON:-python3}" sr_poset_all.py "$@"
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# Resumable parameter sweep over any ca_sr_* entry point: expands a grid, deduplicates points,
+# runs them in-process on a process pool (heaviest first), and streams one JSON line per finished point.
+# Restarting with the same --out skips every point already recorded as "ok".
+#
+#   python sr_sweep.py ca_sr_length_contraction --grid T=200,400 --grid v=0.2:0.8:0.2 --grid L0=100 --out lc.jsonl
+#   python sr_sweep.py ca_sr_causality --grid T=50,100 --out c.jsonl -- generate --out-npz "" --out-json ""
+
+import argparse, hashlib, itertools, json, math, os, sys, time, traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path: sys.path.insert(0, HERE)
+
+import sr_perf
+from sr_core.entry import fresh_pool, run_entry, judge, usage
+
+# grid keys that scale the work of the entry points; cost(point) = product of their values
+COST_KEYS = ("H", "W", "D", "T", "N", "n", "n_points", "n_pairs", "density", "angles")
+
+def _scalar(tok):
+    """Canonical value for a grid token: int, float, bool, or the raw string."""
+    low = tok.lower()
+    if low in ("true", "false"): return low == "true"
+    for cast in (int, float):
+        try: return cast(tok)
+        except ValueError: pass
+    return tok
+
+def parse_values(spec):
+    """'a,b,c' list, or 'lo:hi:step' inclusive range (int if all parts are ints)."""
+    if spec.count(":") == 2 and "," not in spec:
+        lo, hi, step = (_scalar(x) for x in spec.split(":"))
+        if not step: raise ValueError(f"zero step in {spec!r}")
+        n = int(math.floor((hi - lo) / step + 1e-9)) + 1
+        vals = [lo + i*step for i in range(max(0, n))]
+        if all(isinstance(x, int) for x in (lo, hi, step)): return vals
+        return [round(v, 12) for v in vals]
+    return [_scalar(x) for x in spec.split(",") if x != ""]
+
+def parse_grid(items):
+    grid = {}
+    for item in items:
+        name, sep, spec = item.partition("=")
+        if not sep or not name: raise ValueError(f"grid entry must be NAME=VALUES, got {item!r}")
+        vals = grid.setdefault(name, [])
+        for v in parse_values(spec):
+            if v not in vals: vals.append(v)
+    return grid
+
+def point_argv(params):
+    argv = []
+    for k, v in params.items():
+        flag = "--" + k
+        if v is True: argv.append(flag)
+        elif v is False: continue
+        else: argv += [flag, repr(v) if isinstance(v, float) else str(v)]
+    return argv
+
+def point_key(entry, prefix, params):
+    blob = json.dumps({"entry": entry, "prefix": list(prefix), "params": params}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:20]
+
+def point_cost(params, keys):
+    c = 1.0
+    for k in keys:
+        v = params.get(k)
+        if isinstance(v, (int, float)) and not isinstance(v, bool): c *= max(abs(float(v)), 1e-12)
+    return c
+
+def plan(entry, prefix, grid, cost_keys):
+    """Cartesian product of the grid, deduplicated by key, heaviest first (stable for equal cost)."""
+    names = sorted(grid)
+    seen, pts = set(), []
+    for combo in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, combo))
+        key = point_key(entry, prefix, params)
+        if key in seen: continue
+        seen.add(key)
+        pts.append({"key": key, "params": params, "cost": point_cost(params, cost_keys)})
+    pts.sort(key=lambda p: -p["cost"])
+    return pts
+
+def load_done(path):
+    """Keys already finished successfully; torn trailing lines from a killed run are ignored."""
+    done = set()
+    if not os.path.exists(path): return done
+    with open(path) as f:
+        for line in f:
+            try: rec = json.loads(line)
+            except ValueError: continue
+            if rec.get("status") == "ok": done.add(rec["key"])
+    return done
+
+def run_point(entry, prefix, point):
+    """Worker body: run one grid point, never raise."""
+    argv = list(prefix) + point_argv(point["params"])
+    rec = {"key": point["key"], "entry": entry, "params": point["params"], "argv": argv}
+    cpu0, _ = usage()
+    t0 = time.perf_counter()
+    try:
+        res = run_entry(entry, argv)
+        rec["status"] = "ok"
+        rec["PASS"] = judge(res)
+        rec["result"] = res
+    except BaseException:  # SystemExit from argparse lands here too
+        rec["status"] = "error"
+        rec["error"] = traceback.format_exc(limit=3)
+    finally:
+        sr_perf.shutdown()  # a --profile point must not leave tracemalloc running for the worker's later points
+    rec["wall_s"] = time.perf_counter() - t0
+    rec["cpu_s"] = usage()[0] - cpu0
+    return rec
+
+def main():
+    ap = argparse.ArgumentParser(description="Resumable process-pool parameter sweep over an SR poset entry point.")
+    ap.add_argument("entry", help="module name in src/, e.g. ca_sr_length_contraction")
+    ap.add_argument("--grid", action="append", default=[], metavar="NAME=VALUES",
+                    help="--NAME values: 'a,b,c' or 'lo:hi:step' (repeatable; true/false toggles a bare flag)")
+    ap.add_argument("--grid-json", type=str, default=None, help="JSON file {name: [values]} merged into --grid")
+    ap.add_argument("--out", type=str, required=True, help="JSONL results file (appended; also the resume log)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--cost-keys", type=str, default=",".join(COST_KEYS),
+                    help="grid keys whose product orders points heaviest-first")
+    ap.add_argument("--fresh-workers", action="store_true",
+                    help="new interpreter per point (isolates module state; slower for small points)")
+    ap.add_argument("--dry-run", action="store_true", help="print the plan and exit")
+    ap.epilog = "Arguments after a bare -- are passed to every point verbatim, before the grid flags."
+    argv = sys.argv[1:]
+    cut = argv.index("--") if "--" in argv else len(argv)
+    a = ap.parse_args(argv[:cut])
+    prefix = argv[cut+1:]
+
+    try:
+        grid = parse_grid(a.grid)
+    except ValueError as e:
+        ap.error(str(e))
+    if a.grid_json:
+        with open(a.grid_json) as f:
+            for k, vals in json.load(f).items():
+                cur = grid.setdefault(k, [])
+                cur += [v for v in vals if v not in cur]
+    pts = plan(a.entry, prefix, grid, [k for k in a.cost_keys.split(",") if k])
+    out_path = os.path.abspath(a.out)  # workers chdir into src/
+    done = load_done(out_path)
+    todo = [p for p in pts if p["key"] not in done]
+
+    if a.dry_run:
+        for p in todo: print(json.dumps({"key": p["key"], "cost": p["cost"], "argv": prefix + point_argv(p["params"])}))
+        return
+
+    if os.path.getsize(out_path) if os.path.exists(out_path) else 0:
+        with open(out_path, "rb+") as f:  # terminate a torn last line so appends start clean
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n": f.write(b"\n")
+    t0 = time.perf_counter()
+    n_ok = n_err = n_fail = 0
+    jobs = max(1, a.jobs)
+    with open(out_path, "a") as log, \
+         (fresh_pool(jobs) if a.fresh_workers else ProcessPoolExecutor(max_workers=jobs)) as ex:
+        futs = [ex.submit(run_point, a.entry, prefix, p) for p in todo]
+        for i, f in enumerate(as_completed(futs), 1):
+            rec = f.result()
+            log.write(json.dumps(rec) + "\n"); log.flush()
+            if rec["status"] == "ok":
+                n_ok += 1; n_fail += rec["PASS"] is False
+            else:
+                n_err += 1
+            print(f"[{i}/{len(todo)}] {rec['status']} {' '.join(rec['argv'])}  {rec['wall_s']:.2f}s", file=sys.stderr)
+
+    summary = {
+        "entry": a.entry, "out": out_path,
+        "points_planned": len(pts), "points_skipped_done": len(pts) - len(todo),
+        "points_run": len(todo), "ok": n_ok, "errors": n_err, "pass_false": n_fail,
+        "jobs": a.jobs, "wall_s": time.perf_counter() - t0,
+    }
+    print(json.dumps(summary, indent=2))
+    sys.exit(1 if n_err else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# Warm worker service: stays resident with numpy (and torch, if present) imported, the device probed once and the
+# test modules preloaded, and runs entry points on request, so short checks no longer pay interpreter startup.
+# Protocol: one JSON object per line in, one per line out — over stdin/stdout, or per connection on a Unix socket:
+#   {"id": 1, "module": "ca_sr_lightcone", "argv": ["--T", "64"]}   any ca_sr_* entry point
+#   {"id": 2, "test": "lightcone", "fast": true}                   a battery test (extra "argv" is appended)
+#   {"op": "ping"} | {"op": "list"} | {"op": "shutdown"}
+# Replies carry the request id, "ok", and "result" (the script's JSON, unchanged), "PASS" and "wall_s" — or "error".
+# Requests run concurrently on a pool of warm processes, so replies may come back out of order; match them by id.
+# EOF on stdin, {"op": "shutdown"}, SIGINT or SIGTERM stop intake; in-flight requests still finish and are answered.
+
+import argparse, contextlib, glob, importlib, io, json, os, signal, socket, sys, threading, time, traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path: sys.path.insert(0, HERE)
+
+import sr_perf
+from sr_core.entry import run_entry, judge
+from sr_poset_all import BATTERY
+
+TESTS = {t[0]: t for t in BATTERY}
+MODULES = sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(HERE, "ca_sr_*.py")))
+
+def warm(preload, ignore_sigint=True):
+    """Process initialiser: import the backends and preload modules once; ^C is left to the parent, and SIGTERM
+    kills a worker outright (it must not inherit the parent's SIGTERM → KeyboardInterrupt handler)."""
+    if ignore_sigint:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    from sr_core.backend import select_device
+    select_device()  # torch import + cuda/mps probe are cached for the life of the process
+    for m in preload: importlib.import_module(m)
+
+def resolve(req):
+    """(module, argv, pass rule) for a request."""
+    extra = [str(a) for a in req.get("argv", [])]
+    if "test" in req:
+        t = TESTS.get(req["test"])
+        if t is None: raise ValueError(f"unknown test {req['test']!r}")
+        _, module, full, fast, _w, rule = t
+        return module, list(fast if req.get("fast") else full) + extra, rule
+    module = req.get("module")
+    if module not in MODULES: raise ValueError(f"unknown module {module!r} (ca_sr_* entry points only)")
+    return module, extra, None
+
+def execute(req):
+    """Worker body: run one request in this (warm) process."""
+    t0 = time.perf_counter()
+    rep = {"id": req.get("id")}
+    err = io.StringIO()
+    try:
+        module, argv, rule = resolve(req)
+        with contextlib.redirect_stderr(err):
+            res = run_entry(module, argv)
+        rep.update(ok=True, result=res, PASS=judge(res, rule))
+    except BaseException:  # argparse exits and guard ValueErrors become error replies, not a dead worker
+        rep.update(ok=False, error=err.getvalue() + traceback.format_exc(limit=3))
+    finally:
+        sr_perf.shutdown()  # a --profile request must not leave tracemalloc running for the next ones
+    rep["wall_s"] = time.perf_counter() - t0
+    return rep
+
+class Channel:
+    """Reply sink for one client: serialises writes and counts outstanding requests so the reader can drain."""
+    def __init__(self, write):
+        self.write = write
+        self.cv = threading.Condition()
+        self.pending = 0
+
+    def expect(self):
+        with self.cv: self.pending += 1
+
+    def reply(self, rep):
+        with self.cv:
+            try: self.write(json.dumps(rep) + "\n")
+            except (OSError, ValueError): pass  # client went away; nothing to answer
+            self.pending -= 1
+            self.cv.notify_all()
+
+    def drain(self):
+        with self.cv: self.cv.wait_for(lambda: self.pending <= 0)
+
+class Service:
+    """Dispatches requests to a pool of warm worker processes (jobs=0: run them in this process, one at a time)."""
+    def __init__(self, jobs, preload):
+        self.jobs, self.preload = jobs, preload
+        self.stop = threading.Event()
+        self.lock = threading.Lock()  # in-process runs swap cwd/argv/stdout, so they never overlap
+        self.pool_lock = threading.Lock()
+        self.pool = None
+        if jobs > 0: self._start_pool()
+        else: warm(preload, ignore_sigint=False)
+
+    def _start_pool(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=warm, initargs=(self.preload,))
+        for f in [self.pool.submit(os.getpid) for _ in range(self.jobs)]: f.result()  # start (and warm) workers now
+
+    def _pool_submit(self, req):
+        """Queue req on the pool; a pool broken by a dead worker (OOM kill, segfault) is replaced once."""
+        with self.pool_lock:
+            try:
+                return self.pool.submit(execute, req)
+            except BrokenProcessPool:
+                print("sr_worker: a worker process died; restarting the pool", file=sys.stderr, flush=True)
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                self._start_pool()
+                return self.pool.submit(execute, req)
+
+    def submit(self, req, ch):
+        """Answer req on channel ch (ch.expect() already called); returns at once for pooled runs."""
+        op, rid = req.get("op"), req.get("id")
+        if op is not None:
+            if op == "ping": rep = {"pid": os.getpid(), "jobs": self.jobs}
+            elif op == "list": rep = {"tests": sorted(TESTS), "modules": MODULES}
+            elif op == "shutdown": self.stop.set(); rep = {}
+            else: return ch.reply({"id": rid, "ok": False, "error": f"unknown op {op!r}"})
+            return ch.reply({"id": rid, "ok": True, **rep})
+        if self.stop.is_set():
+            return ch.reply({"id": rid, "ok": False, "error": "worker is shutting down"})
+        if self.pool is None:
+            with self.lock: return ch.reply(execute(req))
+        def done(f):
+            e = f.exception()
+            ch.reply(f.result() if e is None else {"id": rid, "ok": False, "error": f"worker failed: {e!r}"})
+        try:
+            fut = self._pool_submit(req)
+        except Exception as e:  # every expect() gets its reply, or drain() would wait forever
+            return ch.reply({"id": rid, "ok": False, "error": f"could not schedule request: {e!r}"})
+        fut.add_done_callback(done)
+
+    def serve(self, lines, ch):
+        """Read requests from an iterable of lines until EOF or shutdown, then wait for this client's replies."""
+        try:
+            for line in lines:
+                if not line.strip(): continue
+                ch.expect()
+                try:
+                    req = json.loads(line)
+                    if not isinstance(req, dict): raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    ch.reply({"id": None, "ok": False, "error": f"bad request: {e}"}); continue
+                self.submit(req, ch)
+                if self.stop.is_set(): break
+        finally:
+            ch.drain()
+
+    def close(self):
+        self.stop.set()
+        if self.pool is not None: self.pool.shutdown(wait=True)  # in-flight requests finish and are answered
+
+def serve_socket(svc, path):
+    """Accept connections on a Unix socket (one reader thread each) until shutdown."""
+    if os.path.exists(path):
+        import stat
+        if not stat.S_ISSOCK(os.stat(path).st_mode): raise ValueError(f"{path} exists and is not a socket")
+        os.unlink(path)
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(path); srv.listen(); srv.settimeout(0.2)
+    def handle(conn):
+        with conn, conn.makefile("r", encoding="utf-8") as rf:
+            svc.serve(rf, Channel(lambda s: conn.sendall(s.encode())))
+    try:
+        while not svc.stop.is_set():
+            try: conn, _ = srv.accept()
+            except socket.timeout: continue
+            conn.settimeout(None)
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+    finally:
+        srv.close()
+        os.unlink(path)
+
+def main():
+    ap = argparse.ArgumentParser(description="Resident SR poset worker: JSON-lines requests over stdin/stdout or a Unix socket.")
+    ap.add_argument("--socket", type=str, default=None, metavar="PATH", help="serve on a Unix socket instead of stdio")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="warm worker processes (0 = run requests in this process, one at a time)")
+    ap.add_argument("--preload", type=str, default=",".join(sorted({t[1] for t in BATTERY})),
+                    help="comma-separated modules to import in every worker up front (default: the battery)")
+    ap.add_argument("--no-cache", action="store_true", help="recompute every request (ignore the result cache)")
+    a = ap.parse_args()
+    if a.no_cache: os.environ["SR_CACHE"] = "0"  # inherited by the pool workers
+    preload = [m for m in a.preload.split(",") if m]
+    unknown = [m for m in preload if m not in MODULES]
+    if unknown: ap.error(f"unknown modules: {unknown}")
+
+    out = sys.stdout  # scripts redirect sys.stdout while they run; replies always go to the real stream
+    def write(s): out.write(s); out.flush()
+    svc = Service(max(0, a.jobs), preload)
+    def term(signum, frame): raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, term)  # after the pool has forked, so workers keep the default action
+    print(f"sr_worker ready: pid {os.getpid()}, {svc.jobs} job(s), " + (f"socket {a.socket}" if a.socket else "stdio"),
+          file=sys.stderr, flush=True)
+    try:
+        if a.socket: serve_socket(svc, a.socket)
+        else: svc.serve(sys.stdin, Channel(write))
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        ap.error(str(e))
+    finally:
+        svc.close()
+
+if __name__ == "__main__":
+    main()